@@ -0,0 +1,568 @@
+"""
+واجهة سطر الأوامر للمهام المجدولة (بدون Tk):
+
+    python cli.py export passports --output passports.xlsx --since 2024-01-01
+    python cli.py import umrah umrah.csv --skip-invalid
+    python cli.py backup --retention 14 --compact
+    python cli.py reports aging
+    python cli.py reports statement --customer A1234567
+    python cli.py archive --before 2023-01-01
+    python cli.py archive --search محمد --year 2022
+    python cli.py benchmark
+    python cli.py benchmark --render --rows 5000
+    python cli.py loadtest --terminals 8 --payments 200 --workdir Z:\\taif_test
+    python cli.py serve --port 8765
+    TAIF_SERVER_SECRET=... python cli.py serve --host 0.0.0.0 --port 8765
+    python cli.py --server 192.168.1.10:8765 reports outstanding
+
+الوحدات تُحمّل داخل كل أمر فقط، حتى لا تتأخر الأوامر الخفيفة بتحميل pandas أو openpyxl.
+"""
+import os
+import sys
+import time
+import logging
+import argparse
+from datetime import date
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# المصدّرات الخاصة بكل جدول: (الوحدة، الصنف، عمود التاريخ)
+EXPORTERS = {
+    "passports": ("reports.passport_exporter", "PassportsExporter", "booking_date"),
+    "umrah": ("reports.umrah_exporter", "UmrahExporter", "exit_date"),
+    "trips": ("reports.ticket_exporter", "TicketExporter", "trip_date"),
+}
+
+
+def print_rows(header, rows):
+    """طباعة الصفوف مفصولة بعلامة Tab (سهلة المعالجة في السكربتات)."""
+    print("\t".join(header))
+    for row in rows:
+        print("\t".join("" if value is None else str(value) for value in row))
+
+
+def default_output(args):
+    """اسم الملف الافتراضي في مجلد التشغيل."""
+    return os.path.join(args.cwd, f"{args.table}_{date.today().isoformat()}.xlsx")
+
+
+def cmd_export(args):
+    output = args.output or default_output(args)
+    if args.table in EXPORTERS:
+        import importlib
+        module_name, class_name, date_column = EXPORTERS[args.table]
+        exporter = getattr(importlib.import_module(module_name), class_name)(None)
+        conditions, params = [], []
+        if args.since:
+            conditions.append(f"{date_column} >= ?")
+            params.append(args.since)
+        if args.until:
+            conditions.append(f"{date_column} <= ?")
+            params.append(args.until)
+        if args.outstanding:
+            conditions.append("remaining_amount > 0")
+        path = exporter.export_rows(output, conditions, tuple(params))
+    elif args.table in ("debts", "aging"):
+        from services.debt_service import DebtService
+        if args.table == "debts":
+            from reports.debt_exporter import DebtExporter as exporter_class
+        else:
+            from reports.aging_exporter import AgingExporter as exporter_class
+        path = exporter_class(None, DebtService(None)).export_rows(output)
+    else:
+        if not args.year:
+            print("يجب تحديد السنة للأرشيف: --year", file=sys.stderr)
+            return 2
+        from reports.archive_exporter import ArchiveExporter
+        path = ArchiveExporter().export(args.year, output)
+
+    if not path:
+        print("لا توجد بيانات للتصدير")
+        return 1
+    print(path)
+    return 0
+
+
+def cmd_import(args):
+    from services.import_service import ImportService
+    success, message, invalid_rows = ImportService().import_file(args.table, args.file, args.skip_invalid)
+    for index, errors in invalid_rows:
+        details = "; ".join(f"{field}: {', '.join(field_errors)}" for field, field_errors in errors.items())
+        print(f"الصف {index}: {details}", file=sys.stderr)
+    print(message)
+    return 0 if success else 1
+
+
+def cmd_backup(args):
+    from services.backup_service import BackupService
+    service = BackupService(retention=args.retention)
+
+    if args.check:
+        report = service.check_integrity(full=args.full)
+        print_rows(report.keys(), [report.values()])
+        return 0 if report["ok"] else 1
+
+    if args.vacuum_into:
+        success, message, _ = service.vacuum_into(args.vacuum_into)
+    else:
+        success, message, _ = service.backup()
+    print(message)
+    if success and args.compact:
+        success, message, _ = service.compact()
+        print(message)
+    return 0 if success else 1
+
+
+def cmd_reports(args):
+    from database.money import format_minor
+    from database.currency import currency_label
+
+    if args.report == "statement":
+        return print_statement(args)
+
+    if args.report == "expiring":
+        from services.umrah_service import UmrahService
+        print_rows(
+            ["id", "name", "passport_number", "entry_date", "exit_date", "sponsor_name",
+             "cost", "paid", "remaining_amount", "days_left", "status"],
+            UmrahService(None).get_expiring_visas(args.days),
+        )
+        return 0
+
+    from services.debt_service import DebtService
+    service = DebtService(None)
+
+    if args.report == "aging":
+        buckets = [label for label, _ in service.AGING_BUCKETS]
+        print_rows(
+            ["type", "currency", "count"] + buckets + ["total"],
+            [
+                [row["type"], currency_label(row["currency"]), row["count"]]
+                + [format_minor(row[label]) for label in buckets]
+                + [format_minor(row["total"])]
+                for row in service.get_aging_report(args.as_of)
+            ],
+        )
+    elif args.report == "outstanding":
+        print_rows(
+            ["currency", "total", "paid", "remaining"],
+            [
+                (currency_label(currency), format_minor(total), format_minor(paid), format_minor(remaining))
+                for currency, total, paid, remaining in service.get_outstanding_totals()
+            ],
+        )
+    elif args.report == "consolidated":
+        totals = service.get_consolidated_totals(rate_date=args.as_of)
+        print_rows(
+            ["currency", "total", "paid", "remaining", "missing_rates"],
+            [(
+                currency_label(totals["currency"]), format_minor(totals["total"]),
+                format_minor(totals["paid"]), format_minor(totals["remaining"]),
+                ",".join(currency_label(code) for code in totals["missing_rates"]),
+            )],
+        )
+    else:
+        print_rows(
+            ["currency", "count", "total"],
+            [
+                (currency_label(currency), count, format_minor(total))
+                for currency, count, total in service.get_payment_totals(args.date_from, args.date_to)
+            ],
+        )
+    return 0
+
+
+def print_statement(args):
+    """كشف حساب عميل واحد: خدماته ومدفوعاته وإجمالياته لكل عملة."""
+    from database.money import format_minor
+    from database.currency import currency_label
+    from services.customer_service import CustomerService
+
+    service = CustomerService()
+    if args.customer_id is not None:
+        customers = [customer for customer in [service.get_by_id(args.customer_id)] if customer]
+    elif args.customer:
+        customers = service.lookup(args.customer)
+    else:
+        print("حدد العميل بـ --customer أو --customer-id", file=sys.stderr)
+        return 2
+
+    if len(customers) != 1:
+        print("لم يتم العثور على العميل" if not customers else "يوجد أكثر من عميل مطابق، استخدم --customer-id:", file=sys.stderr)
+        print_rows(["id", "name", "passport_number", "phone_number"], [
+            (customer[0], customer[2], customer[4], customer[5]) for customer in customers
+        ])
+        return 1
+
+    customer_id = customers[0][0]
+    statement = service.get_statement(customer_id)
+    customer = statement["customer"]
+    print_rows(["id", "name", "passport_number", "phone_number"], [(customer[0], customer[2], customer[4], customer[5])])
+    print()
+    print_rows(
+        ["type", "id", "name", "date", "total", "paid", "remaining", "currency"],
+        [
+            (debt_type, debt_id, name, debt_date, format_minor(total), format_minor(paid),
+             format_minor(remaining), currency_label(currency))
+            for debt_type, debt_id, name, debt_date, total, paid, remaining, currency in statement["ledger"]
+        ],
+    )
+    print()
+    print_rows(
+        ["payment_id", "type", "debt_id", "amount", "date", "method"],
+        [
+            (payment_id, debt_type, debt_id, format_minor(amount), payment_date, method)
+            for payment_id, debt_type, debt_id, amount, payment_date, method in statement["payments"]
+        ],
+    )
+    print()
+    print_rows(
+        ["currency", "total", "paid", "remaining"],
+        [
+            (currency_label(currency), format_minor(total), format_minor(paid), format_minor(remaining))
+            for currency, total, paid, remaining in statement["totals"]
+        ],
+    )
+    return 0
+
+
+def cmd_archive(args):
+    from services.archive_service import ArchiveService
+    if args.search:
+        from database.money import format_minor
+        from database.currency import currency_label
+        print_rows(
+            ["year", "type", "id", "name", "date", "remaining", "currency"],
+            [
+                (year, table_name, record_id, name, record_date, format_minor(remaining), currency_label(currency))
+                for year, table_name, record_id, name, record_date, remaining, currency
+                in ArchiveService().search_archive(args.search, args.years)
+            ],
+        )
+        return 0
+
+    success, message, totals = ArchiveService().archive_settled(args.before)
+    print_rows(totals.keys(), [totals.values()])
+    print(message)
+    return 0 if success else 1
+
+
+def best_ms(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return result, f"{min(timings) * 1000:.2f}"
+
+
+def benchmark_render(args):
+    """
+    قياس زمن تعبئة جدول Treeview لكل 1000 صف (يحتاج شاشة لأنه ينشئ نافذة Tk مخفية):
+    الطريقة القديمة (حذف ثم إضافة كل صف) مقابل TableRenderer عند التعبئة الأولى وعند إعادة الاستخدام.
+    """
+    import tkinter as tk
+    from tkinter import ttk
+    from ui.table_renderer import TableRenderer
+
+    columns = [f"c{i}" for i in range(10)]
+    rows = [
+        (i, f"اسم {i}", "2024-01-01", "1", 1500.5 + i, 700.0, 800.5, 100.0, 1400.5 + i, "ريال يمني")
+        for i in range(args.rows)
+    ]
+    scale = 1000 / max(args.rows, 1)
+
+    root = tk.Tk()
+    root.withdraw()
+    table = ttk.Treeview(root, columns=columns, show="headings")
+    renderer = TableRenderer(table, len(columns))
+
+    def insert_rows():
+        table.delete(*table.get_children())
+        for index, row in enumerate(rows):
+            table.insert("", tk.END, values=list(reversed(row)), tags=("evenrow" if index % 2 == 0 else "oddrow",))
+        root.update_idletasks()
+
+    def render_new():
+        table.delete(*table.get_children())
+        renderer.render(rows)
+        root.update_idletasks()
+
+    def render_reuse():
+        renderer.render(rows)
+        root.update_idletasks()
+
+    results = []
+    for name, func in (("insert_per_row", insert_rows), ("render_new", render_new), ("render_reuse", render_reuse)):
+        _, best = best_ms(func, args.repeat)
+        results.append((name, args.rows, best, f"{float(best) * scale:.2f}"))
+    root.destroy()
+    print_rows(["render", "rows", "best_ms", "ms_per_1000"], results)
+    return 0
+
+
+def cmd_benchmark(args):
+    """قياس زمن الاستعلامات الأساسية (أقل زمن من عدة تكرارات)."""
+    if args.render:
+        return benchmark_render(args)
+
+    from services.passport_service import PassportService
+    from services.umrah_service import UmrahService
+    from services.ticket_service import TicketService
+    from services.debt_service import DebtService
+
+    passports, umrah, trips, debts = PassportService(None), UmrahService(None), TicketService(None), DebtService(None)
+    cases = [
+        ("passports.get_all_data", passports.get_all_data),
+        ("passports.search_data", lambda: passports.search_data(args.term)),
+        ("umrah.get_all_data", umrah.get_all_data),
+        ("umrah.get_expiring_visas", lambda: umrah.get_expiring_visas(30)),
+        ("trips.get_all_data", trips.get_all_data),
+        ("debts.get_all_data", debts.get_all_data),
+        ("debts.search_data", lambda: debts.search_data(args.term)),
+        ("search.fuzzy", lambda: debts.search_manager.fuzzy_search(args.term)),
+        ("debts.get_outstanding_totals", debts.get_outstanding_totals),
+        ("debts.get_consolidated_totals", debts.get_consolidated_totals),
+        ("debts.get_aging_report", debts.get_aging_report),
+    ]
+
+    results = []
+    for name, func in cases:
+        rows, best = best_ms(func, args.repeat)
+        count = len(rows) if hasattr(rows, "__len__") else ""
+        results.append((name, count, best))
+    print_rows(["query", "rows", "best_ms"], results)
+    return 0
+
+
+def cmd_serve(args):
+    """تشغيل خادم البيانات: هذا الجهاز وحده يفتح taif.db والأجهزة الأخرى تتصل به عبر --server أو TAIF_DATA_SERVER."""
+    from database.server import DataServer
+    try:
+        server = DataServer(host=args.host, port=args.port, batch_size=args.batch_size)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+    try:
+        server.run(ready=lambda address: print(f"خادم البيانات يعمل على {address[0]}:{address[1]}", flush=True))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def start_local_server():
+    """تشغيل خادم بيانات في خيط داخل هذه العملية على منفذ عشوائي (لاختبار التحميل)."""
+    import threading
+    from database.server import DataServer
+
+    ready = threading.Event()
+    address = []
+
+    def on_ready(server_address):
+        address.extend(server_address)
+        ready.set()
+
+    server = DataServer(host="127.0.0.1", port=0)
+    threading.Thread(target=server.run, args=(on_ready,), daemon=True).start()
+    ready.wait()
+    return f"{address[0]}:{address[1]}"
+
+
+def loadtest_worker(workdir, debt_ids, payments, start_event, results):
+    """
+    جهاز واحد في اختبار التحميل: عملية مستقلة باتصالها الخاص تسجل دفعات متتالية.
+    """
+    import random
+    os.chdir(workdir)
+    sys.path.insert(0, APP_DIR)
+    from services.debt_service import DebtService
+
+    service = DebtService(None)
+    succeeded, failed, errors = 0, 0, []
+    start_event.wait()
+    start = time.perf_counter()
+    for _ in range(payments):
+        success, message = service.add_payment("Passports", random.choice(debt_ids), 1, date.today().isoformat(), "loadtest")
+        if success:
+            succeeded += 1
+        else:
+            failed += 1
+            errors.append(message)
+    results.put((os.getpid(), succeeded, failed, service.db_manager.busy_retries, time.perf_counter() - start, errors[:3]))
+
+
+def cmd_loadtest(args):
+    """
+    محاكاة عدة أجهزة تسجل الدفعات على نفس الملف في نفس اللحظة، ثم التحقق من تطابق المجاميع.
+    يعمل على قاعدة بيانات اختبارية في workdir (مجلد مؤقت افتراضيًا) وليس على بيانات المكتب.
+    """
+    import tempfile
+    import multiprocessing
+
+    if args.journal_mode:
+        os.environ["TAIF_JOURNAL_MODE"] = args.journal_mode
+    workdir = args.workdir or tempfile.mkdtemp(prefix="taif_loadtest_")
+    os.makedirs(workdir, exist_ok=True)
+    os.chdir(workdir)
+
+    from database.connection import choose_journal_mode
+    from services.passport_service import PassportService
+
+    passports = PassportService(None)
+    price = float(args.terminals * args.payments + 100)
+    try:
+        with passports.db_manager.transaction():
+            for index in range(args.debts):
+                success, message = passports.add_passport_data((
+                    None, f"اختبار التحميل {index}", date.today().isoformat(), "1",
+                    price, 0.0, price, 0.0, price, "1", "", "", "1"
+                ))
+                if not success:
+                    raise ValueError(message)  # التراجع عن الديون المضافة في المعاملة
+    except ValueError as e:
+        print(f"تعذر تجهيز ديون الاختبار: {e}", file=sys.stderr)
+        return 1
+    debt_ids = [row[0] for row in passports.db_manager.execute_read_query(
+        "SELECT id FROM Passports ORDER BY id DESC LIMIT ?", (args.debts,)
+    )]
+    if not debt_ids:
+        print("لا توجد ديون للاختبار، حدد --debts أكبر من صفر", file=sys.stderr)
+        return 2
+
+    backend = "file"
+    if args.via_server:
+        # الأجهزة تكتب عبر خادم البيانات بدل فتح الملف المشترك
+        os.environ["TAIF_DATA_SERVER"] = start_local_server()
+        backend = "server"
+
+    start_event = multiprocessing.Event()
+    results = multiprocessing.Queue()
+    workers = [
+        multiprocessing.Process(target=loadtest_worker, args=(workdir, debt_ids, args.payments, start_event, results))
+        for _ in range(args.terminals)
+    ]
+    for worker in workers:
+        worker.start()
+    start = time.perf_counter()
+    start_event.set()
+    rows = [results.get() for _ in workers]
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+
+    print_rows(["pid", "succeeded", "failed", "retries", "seconds"], [row[:4] + (f"{row[4]:.2f}",) for row in rows])
+    for row in rows:
+        for error in row[5]:
+            print(error, file=sys.stderr)
+
+    # كل دفعة ناجحة يجب أن تظهر مرة واحدة في Payments وفي المبلغ المدفوع للدين
+    placeholders = ", ".join("?" * len(debt_ids))
+    paid_total = passports.db_manager.execute_read_query(
+        f"SELECT COALESCE(SUM(paid_amount), 0) FROM Passports WHERE id IN ({placeholders})", tuple(debt_ids)
+    )[0][0]
+    payments_total = passports.db_manager.execute_read_query(
+        f"SELECT COALESCE(SUM(amount), 0) FROM Payments WHERE debt_type = 'Passports' AND debt_id IN ({placeholders})",
+        tuple(debt_ids)
+    )[0][0]
+    succeeded = sum(row[1] for row in rows)
+    consistent = paid_total == payments_total == succeeded * 100
+    print(
+        f"backend={backend} journal_mode={choose_journal_mode('database/taif.db')} terminals={args.terminals} "
+        f"succeeded={succeeded} failed={sum(row[2] for row in rows)} "
+        f"throughput={succeeded / elapsed:.1f}/s consistent={consistent} workdir={workdir}"
+    )
+    return 0 if consistent else 1
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="cli.py", description="مهام مكتب طائف السالمي بدون واجهة رسومية")
+    parser.add_argument("--busy-timeout", type=int, help="مهلة انتظار أقفال الأجهزة الأخرى بالملي ثانية")
+    parser.add_argument("--server", help="عنوان خادم البيانات (host:port) بدل فتح الملف المحلي")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = subparsers.add_parser("export", help="تصدير البيانات إلى Excel")
+    export_parser.add_argument("table", choices=list(EXPORTERS) + ["debts", "aging", "archive"])
+    export_parser.add_argument("--output", help="مسار ملف Excel")
+    export_parser.add_argument("--since", help="من تاريخ (YYYY-MM-DD)")
+    export_parser.add_argument("--until", help="إلى تاريخ (YYYY-MM-DD)")
+    export_parser.add_argument("--outstanding", action="store_true", help="السجلات غير المسددة فقط")
+    export_parser.add_argument("--year", help="سنة الأرشيف")
+    export_parser.set_defaults(func=cmd_export, paths=["output"])
+
+    import_parser = subparsers.add_parser("import", help="استيراد سجلات من CSV أو Excel")
+    import_parser.add_argument("table", choices=["passports", "umrah", "trips"])
+    import_parser.add_argument("file")
+    import_parser.add_argument("--skip-invalid", action="store_true", help="تجاهل الصفوف غير الصحيحة")
+    import_parser.set_defaults(func=cmd_import, paths=["file"])
+
+    backup_parser = subparsers.add_parser("backup", help="نسخ احتياطي وضغط وفحص قاعدة البيانات")
+    backup_parser.add_argument("--retention", type=int, default=7, help="عدد النسخ المحتفظ بها")
+    backup_parser.add_argument("--compact", action="store_true", help="ضغط قاعدة البيانات بعد النسخ")
+    backup_parser.add_argument("--check", action="store_true", help="فحص السلامة فقط")
+    backup_parser.add_argument("--full", action="store_true", help="فحص كامل (integrity_check)")
+    backup_parser.add_argument("--vacuum-into", help="إنشاء نسخة مضغوطة في المسار المحدد")
+    backup_parser.set_defaults(func=cmd_backup, paths=["vacuum_into"])
+
+    reports_parser = subparsers.add_parser("reports", help="طباعة التقارير")
+    reports_parser.add_argument("report", choices=["aging", "outstanding", "consolidated", "payments", "expiring", "statement"])
+    reports_parser.add_argument("--as-of", help="تاريخ الاحتساب (YYYY-MM-DD)")
+    reports_parser.add_argument("--from", dest="date_from", help="بداية الفترة للمدفوعات")
+    reports_parser.add_argument("--to", dest="date_to", help="نهاية الفترة للمدفوعات")
+    reports_parser.add_argument("--days", type=int, default=30, help="أيام انتهاء التأشيرات")
+    reports_parser.add_argument("--customer", help="العميل لكشف الحساب: رقم الجواز أو الهاتف أو الاسم")
+    reports_parser.add_argument("--customer-id", type=int, help="معرف العميل لكشف الحساب")
+    reports_parser.set_defaults(func=cmd_reports, paths=[])
+
+    archive_parser = subparsers.add_parser("archive", help="أرشفة السجلات المسددة")
+    archive_action = archive_parser.add_mutually_exclusive_group(required=True)
+    archive_action.add_argument("--before", help="أرشفة السجلات المسددة قبل هذا التاريخ (YYYY-MM-DD)")
+    archive_action.add_argument("--search", help="البحث في ملفات الأرشيف بالاسم أو الأعمدة الأخرى")
+    archive_parser.add_argument("--year", dest="years", type=int, action="append", help="سنة الأرشيف للبحث (تتكرر، الافتراضي جميع السنوات)")
+    archive_parser.set_defaults(func=cmd_archive, paths=[])
+
+    benchmark_parser = subparsers.add_parser("benchmark", help="قياس زمن الاستعلامات")
+    benchmark_parser.add_argument("--repeat", type=int, default=5)
+    benchmark_parser.add_argument("--term", default="محمد", help="نص البحث المستخدم في القياس")
+    benchmark_parser.add_argument("--render", action="store_true", help="قياس تعبئة جدول الواجهة بدلًا من الاستعلامات (يحتاج شاشة)")
+    benchmark_parser.add_argument("--rows", type=int, default=1000, help="عدد الصفوف في قياس التعبئة")
+    benchmark_parser.set_defaults(func=cmd_benchmark, paths=[])
+
+    loadtest_parser = subparsers.add_parser("loadtest", help="محاكاة عدة أجهزة تكتب الدفعات في نفس الوقت")
+    loadtest_parser.add_argument("--terminals", type=int, default=4, help="عدد الأجهزة (العمليات)")
+    loadtest_parser.add_argument("--payments", type=int, default=100, help="عدد الدفعات لكل جهاز")
+    loadtest_parser.add_argument("--debts", type=int, default=20, help="عدد الديون المشتركة بين الأجهزة")
+    loadtest_parser.add_argument("--workdir", help="مجلد قاعدة البيانات الاختبارية (مثل مجلد مشترك على الشبكة)")
+    loadtest_parser.add_argument("--journal-mode", choices=["WAL", "DELETE"], help="فرض وضع السجل")
+    loadtest_parser.add_argument("--via-server", action="store_true", help="الكتابة عبر خادم البيانات بدل مشاركة الملف")
+    loadtest_parser.set_defaults(func=cmd_loadtest, paths=["workdir"])
+
+    serve_parser = subparsers.add_parser("serve", help="تشغيل خادم البيانات لبقية الأجهزة")
+    serve_parser.add_argument("--host", default="127.0.0.1", help="عنوان الاستماع (عنوان الشبكة يتطلب TAIF_SERVER_SECRET)")
+    serve_parser.add_argument("--port", type=int, default=8765, help="منفذ الاستماع")
+    serve_parser.add_argument("--batch-size", type=int, default=200, help="أقصى عدد كتابات في معاملة واحدة")
+    serve_parser.set_defaults(func=cmd_serve, paths=[])
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    if args.busy_timeout is not None:
+        # يُقرأ عند تحميل وحدة الاتصال (وفي عمليات اختبار التحميل)
+        os.environ["TAIF_BUSY_TIMEOUT_MS"] = str(args.busy_timeout)
+    if args.server:
+        os.environ["TAIF_DATA_SERVER"] = args.server
+
+    # مسارات المستخدم نسبةً لمجلد التشغيل، وقاعدة البيانات نسبةً لمجلد البرنامج
+    for name in args.paths:
+        if getattr(args, name):
+            setattr(args, name, os.path.abspath(getattr(args, name)))
+    args.cwd = os.getcwd()
+    os.chdir(APP_DIR)
+    sys.path.insert(0, APP_DIR)
+
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
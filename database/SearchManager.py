@@ -1,11 +1,56 @@
-import sqlite3
+import re
+import threading
 from typing import List, Dict, Union
+from database.money import format_minor, from_minor, money_sql
+from database.database_manager import DatabaseManager
+from database.fuzzy import get_name_index, NAME_TABLES, FUZZY_LIMIT
+
+# أنماط البحث
+CONTAINS = "contains"  # جزء من النص (%term%) ولا يستفيد من الفهارس
+PREFIX = "prefix"      # بداية النص (term%) عبر فهرس NOCASE
+EXACT = "exact"        # مطابقة تامة دون اعتبار حالة الأحرف عبر فهرس NOCASE
+FUZZY = "fuzzy"        # أسماء قريبة كتابةً أو نطقًا عبر الفهرس التقريبي (database/fuzzy.py)
+
+# أقل طول للنص حتى يُجرب البحث التقريبي تلقائيًا عند عدم وجود نتائج
+FUZZY_MIN_LENGTH = 3
+
+# أعمدة الأرقام التعريفية المفهرسة بـ COLLATE NOCASE (انظر DatabaseManager.create_indexes)
+IDENTIFIER_COLUMNS = ("passport_number", "phone_number", "sponsor_number")
+
+# رقم جواز (حروف قليلة ثم أرقام) أو رقم هاتف (أرقام مع + أو مسافات أو شرطات)؛
+# الحد الأدنى للطول حتى لا تُعامل المبالغ القصيرة كأرقام تعريفية
+IDENTIFIER_TERM = re.compile(r"^(?:[A-Za-z]{1,3}\d{5,}|\+?\d[\d \-]{6,})$")
+IDENTIFIER_SEPARATORS = re.compile(r"[ \-]")
+
+# مفتاح البحث لكل صف: قيم أعمدة البحث بحروف صغيرة مفصولة بهذا الرمز (انظر search_key)
+KEY_SEPARATOR = "\x1f"
+# lower() في SQLite وLIKE لا يغيران إلا الحروف اللاتينية الأساسية
+ASCII_LOWER = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+LIKE_WILDCARDS = ("%", "_")
+
+
+# أقصى عدد لنتائج البحث الشامل
+SEARCH_LIMIT = 200
+
+# جداول الديون في البحث الموحد: (عمود التاريخ، عمود المبلغ، أعمدة البحث)
+DEBT_SEARCH_TABLES = {
+    "Passports": ("booking_date", "booking_price", ["name", "receiver_name", "status", "type"]),
+    "Umrah": ("entry_date", "cost", ["name", "passport_number", "phone_number", "sponsor_number", "sponsor_name"]),
+    "Trips": ("trip_date", "amount", ["name", "passport_number", "from_place", "to_place", "booking_company", money_sql("amount")]),
+}
+
+
+def looks_like_identifier(search_term):
+    """هل النص رقم جواز أو هاتف (وليس اسمًا)؟"""
+    return bool(IDENTIFIER_TERM.match(search_term.strip()))
+
 
 class SearchManager:
-    def __init__(self, db_name="taif.db"):
-        self.db_path = f"database/{db_name}"
-        self.connection = sqlite3.connect(self.db_path)
-        self.cursor = self.connection.cursor()
+    def __init__(self, db_name="taif.db", db_manager=None):
+        # الخدمات تمرر مدير قاعدة البيانات الخاص بها (محلي أو عبر خادم البيانات)
+        self.owns_db_manager = db_manager is None
+        self.db_manager = db_manager or DatabaseManager(db_name)
+        self.lock = threading.RLock()
 
     def search(self, table_name: str, columns: List[str], search_term: str, exact_match: bool = False) -> List[Dict[str, Union[str, float, int]]]:
         """
@@ -14,113 +59,252 @@ class SearchManager:
         :param table_name: اسم الجدول المراد البحث فيه.
         :param columns: قائمة بالأعمدة المراد البحث فيها.
         :param search_term: النص المراد البحث عنه.
+        :param exact_match: مطابقة تامة بدل البحث الجزئي.
         :return: قائمة بالصفوف التي تطابق البحث.
         """
         if not columns:
             raise ValueError("يجب تحديد عمود واحد على الأقل للبحث.")
 
-        # بناء الاستعلام الديناميكي
-        conditions = " OR ".join([f"{column} LIKE ?" for column in columns])
-        query = f"SELECT * FROM {table_name} WHERE {conditions}"
-        
-        # إضافة علامة % للبحث الجزئي
-        search_term = f"%{search_term}%"
-        params = [search_term] * len(columns)
+        # بناء الاستعلام الديناميكي حسب نمط البحث
+        condition, params = self.search_condition(columns, search_term, EXACT if exact_match else None)
+        query = f"SELECT * FROM {table_name} WHERE {condition}"
 
         # تنفيذ الاستعلام
-        self.cursor.execute(query, params)
-        rows = self.cursor.fetchall()
+        with self.lock:
+            rows = self.db_manager.execute_read_query(query, params)
+            column_names = self.db_manager.get_column_names(table_name)
 
         # تحويل النتائج إلى قائمة من القواميس
-        column_names = [description[0] for description in self.cursor.description]
         results = [dict(zip(column_names, row)) for row in rows]
 
         return results
 
-    def search_multiple_tables(self, tables: List[str], columns: List[str], search_term: str) -> List[Dict[str, Union[str, float, int]]]:
+    def like_condition(self, columns: List[str], search_term: str):
         """
-        بحث في أكثر من جدول باستخدام عمود أو أكثر.
+        بناء شرط WHERE للبحث الجزئي في عدة أعمدة.
 
-        :param tables: قائمة بجداول البحث.
         :param columns: قائمة بالأعمدة المراد البحث فيها.
         :param search_term: النص المراد البحث عنه.
-        :return: قائمة بالصفوف التي تطابق البحث من جميع الجداول.
+        :return: (نص الشرط، قائمة المعاملات).
         """
-        results = []
-        for table in tables:
-            table_results = self.search(table, columns, search_term)
-            results.extend(table_results)
-        return results
+        if not columns:
+            raise ValueError("يجب تحديد عمود واحد على الأقل للبحث.")
+        conditions = " OR ".join([f"{column} LIKE ?" for column in columns])
+        return f"({conditions})", [f"%{search_term}%"] * len(columns)
+
+    def resolve_mode(self, columns: List[str], search_term: str, mode: str = None):
+        """
+        تحديد أعمدة البحث والنص ونمط البحث.
+
+        إذا كان النص رقم جواز أو هاتف يُبحث في أعمدة الأرقام التعريفية فقط وبالبادئة افتراضيًا،
+        فيُنفذ البحث عبر الفهرس (O(log n)) بدل المرور على الجدول كاملًا.
+        الجداول التي لا تحتوي على هذه الأعمدة تبقى على البحث الجزئي.
+
+        :return: (الأعمدة، النص، النمط).
+        """
+        if not columns:
+            raise ValueError("يجب تحديد عمود واحد على الأقل للبحث.")
 
-    def search_debts(self, search_term: str, exact_match: bool = False) -> List[Dict[str, Union[str, float, int]]]:
+        term = search_term.strip()
+        if looks_like_identifier(term):
+            identifiers = [column for column in columns if column in IDENTIFIER_COLUMNS]
+            if identifiers:
+                return identifiers, IDENTIFIER_SEPARATORS.sub("", term), mode or PREFIX
+        return columns, term, mode or CONTAINS
+
+    def search_condition(self, columns: List[str], search_term: str, mode: str = None):
+        """
+        بناء شرط WHERE حسب نمط البحث (انظر resolve_mode).
+
+        :param mode: CONTAINS أو PREFIX أو EXACT؛ None يعني الاختيار التلقائي.
+        :return: (نص الشرط، قائمة المعاملات).
+        """
+        columns, term, mode = self.resolve_mode(columns, search_term, mode)
+        if mode == EXACT:
+            conditions = " OR ".join([f"{column} = ? COLLATE NOCASE" for column in columns])
+            return f"({conditions})", [term] * len(columns)
+        if mode == PREFIX:
+            # LIKE بدون حرف بدل في البداية يستخدم فهرس NOCASE
+            conditions = " OR ".join([f"{column} LIKE ?" for column in columns])
+            return f"({conditions})", [f"{term}%"] * len(columns)
+        return self.like_condition(columns, term)
+
+    def score_expression(self, columns: List[str], search_term: str, mode: str = None):
+        """
+        درجة الصلة لكل صف داخل الاستعلام: 3 للمطابقة التامة، 2 لمطابقة البداية، 1 لغير ذلك.
+        :return: (نص التعبير، قائمة المعاملات).
         """
-        بحث في جداول الديون (Passports, Umrah, Trips) باستخدام مصطلح البحث.
+        columns, term, _ = self.resolve_mode(columns, search_term, mode)
+        exact = " OR ".join([f"{column} = ? COLLATE NOCASE" for column in columns])
+        prefix = " OR ".join([f"{column} LIKE ?" for column in columns])
+        return (
+            f"CASE WHEN {exact} THEN 3 WHEN {prefix} THEN 2 ELSE 1 END",
+            [term] * len(columns) + [f"{term}%"] * len(columns),
+        )
 
+    def search_key(self, columns: List[str], search_term: str, mode: str = None):
+        """
+        تعبير SQL لمفتاح البحث: قيم الأعمدة التي يُبحث فيها فعلًا (حسب resolve_mode) بحروف صغيرة،
+        لتصفية نتائج نص أطول في الذاكرة دون استعلام جديد (SearchSession).
+        """
+        columns, _, _ = self.resolve_mode(columns, search_term, mode)
+        values = " || char(31) || ".join(f"lower(COALESCE({column}, ''))" for column in columns)
+        return f"({values})"
+
+    def key_matches(self, key: str, term: str, mode: str) -> bool:
+        """
+        هل يطابق صف (بمفتاح search_key) النص بنفس معنى شرط search_condition؟
+        :param term: النص بعد resolve_mode.
+        """
+        term = term.translate(ASCII_LOWER)
+        if mode == EXACT:
+            return term in key.split(KEY_SEPARATOR)
+        if mode == PREFIX:
+            return any(value.startswith(term) for value in key.split(KEY_SEPARATOR))
+        return term in key
+
+    def key_score(self, key: str, term: str) -> int:
+        """نفس درجة الصلة في score_expression محسوبة من المفتاح."""
+        term = term.translate(ASCII_LOWER)
+        values = key.split(KEY_SEPARATOR)
+        if term in values:
+            return 3
+        if any(value.startswith(term) for value in values):
+            return 2
+        return 1
+
+    def fuzzy_fallback(self, search_term: str, mode: str = None) -> bool:
+        """
+        هل يُجرب البحث التقريبي في الأسماء عندما لا يجد البحث العادي شيئًا؟
+        فقط في النمط التلقائي ولنص يشبه الاسم (ليس رقم جواز أو هاتف).
+        """
+        term = search_term.strip()
+        return mode is None and len(term) >= FUZZY_MIN_LENGTH and not looks_like_identifier(term)
+
+    def fuzzy_search(self, search_term: str, tables=NAME_TABLES, limit: int = FUZZY_LIMIT) -> List[Dict[str, Union[str, float, int]]]:
+        """
+        أقرب الأسماء إلى النص في جداول الفهرس التقريبي (أخطاء الإملاء والحروف المتقاربة نطقًا).
+        :return: قائمة قواميس (table, id, name, score) مرتبة من الأقرب.
+        """
+        names = ["table", "id", "name", "score"]
+        return [dict(zip(names, match)) for match in get_name_index().search(search_term, tables, limit)]
+
+    def fuzzy_ids(self, table_name: str, search_term: str, limit: int = FUZZY_LIMIT) -> List[int]:
+        """معرفات أقرب السجلات في جدول واحد مرتبة من الأقرب."""
+        return [record_id for _, record_id, _, _ in get_name_index().search(search_term, (table_name,), limit)]
+
+    def ranked_select(self, table_name: str, projection: List[str], columns: List[str], search_term: str, mode: str = None):
+        """
+        جزء SELECT لجدول واحد في البحث الموحد: الأعمدة المعروضة فقط مع درجة الصلة (score).
+        :return: (نص الاستعلام، قائمة المعاملات).
+        """
+        score, score_params = self.score_expression(columns, search_term, mode)
+        condition, params = self.search_condition(columns, search_term, mode)
+        query = f"SELECT {', '.join(projection)}, {score} AS score FROM {table_name} WHERE {condition}"
+        return query, score_params + params
+
+    def union_search(self, selects, order_by: str, limit: int):
+        """
+        تنفيذ أجزاء ranked_select كاستعلام UNION ALL واحد مرتب بالصلة ومحدود بعدد الصفوف،
+        فيبقى زمن البحث الشامل ثابتًا تقريبًا مهما كان عدد السجلات المطابقة.
+        """
+        if not selects:
+            return []
+        query = " UNION ALL ".join(select for select, _ in selects)
+        params = [param for _, select_params in selects for param in select_params]
+        with self.lock:
+            return self.db_manager.execute_read_query(
+                f"{query} ORDER BY score DESC, {order_by} LIMIT ?", (*params, int(limit))
+            )
+
+    def search_multiple_tables(self, tables: List[str], columns: List[str], search_term: str, limit: int = SEARCH_LIMIT) -> List[Dict[str, Union[str, float, int]]]:
+        """
+        بحث في أكثر من جدول باستخدام عمود أو أكثر (موجودة في جميع الجداول).
+
+        :param tables: قائمة بجداول البحث.
+        :param columns: قائمة بالأعمدة المراد البحث فيها (وهي الأعمدة المرجعة أيضًا).
         :param search_term: النص المراد البحث عنه.
-        :return: قائمة بالصفوف التي تطابق البحث بنفس تنسيق get_all_data.
+        :param limit: أقصى عدد للنتائج.
+        :return: أفضل الصفوف المطابقة من جميع الجداول مرتبة بالصلة، مع اسم الجدول والمعرف والدرجة.
         """
-        search_tables = [
-            ("Passports", ["name", "receiver_name", "status", "type"]),
-            ("Umrah", ["name", "passport_number", "phone_number", "sponsor_number", "sponsor_name"]),
-            ("Trips", ["name", "passport_number", "from_place", "to_place", "booking_company", "amount"])
+        selects = [
+            self.ranked_select(table, [f"'{table}' AS source", "id", *columns], columns, search_term)
+            for table in tables
         ]
+        names = ["table", "id", *columns, "score"]
+        return [dict(zip(names, row)) for row in self.union_search(selects, "source, id", limit)]
 
-        results = []
-        for table, columns in search_tables:
-            try:
-                # البحث في الجدول
-                records = self.search(table, columns, search_term, exact_match)
-                for record in records:
-                    # تحويل النتيجة إلى تنسيق متوافق مع get_all_data
-                    formatted_data = self.format_debt_record(table, record)
-                    results.append(formatted_data)
-            except Exception as e:
-                print(f"Error searching in table {table}: {e}")
-                continue
+    def search_debts(self, search_term: str, exact_match: bool = False, limit: int = SEARCH_LIMIT, with_keys: bool = False) -> List[Dict[str, Union[str, float, int]]]:
+        """
+        بحث في جداول الديون (Passports, Umrah, Trips) باستخدام مصطلح البحث في استعلام واحد.
 
-        return results
+        :param search_term: النص المراد البحث عنه.
+        :param exact_match: مطابقة تامة بدل البحث الجزئي.
+        :param limit: أقصى عدد للنتائج.
+        :param with_keys: إرجاع (السجل، مفتاح البحث) لكل صف (انظر search_key).
+        :return: قائمة بالصفوف التي تطابق البحث بنفس تنسيق get_all_data (الأعلى صلة ثم الأحدث).
+        """
+        mode = EXACT if exact_match else None
+        identifier = looks_like_identifier(search_term)
+        selects = []
+        for table, (date_column, price_column, columns) in DEBT_SEARCH_TABLES.items():
+            if identifier and not any(column in IDENTIFIER_COLUMNS for column in columns):
+                continue  # رقم الجواز أو الهاتف لا يوجد في هذا الجدول
+            projection = [
+                f"'{table}' AS type", "id", "name", f"{date_column} AS date",
+                f"{price_column} AS price", "currency", "remaining_amount",
+            ]
+            if with_keys:
+                projection.append(f"{self.search_key(columns, search_term, mode)} AS search_key")
+            selects.append(self.ranked_select(table, projection, columns, search_term, mode))
 
-    def format_debt_record(self, table: str, record: Dict[str, Union[str, float, int]]) -> Dict[str, Union[str, float, int]]:
-        """
-        تنسيق سجل الدين ليصبح متوافقًا مع تنسيق get_all_data.
-
-        :param table: اسم الجدول (Passports, Umrah, Trips).
-        :param record: السجل الذي تم استرجاعه من البحث.
-        :return: سجل منسق.
-        """
-        if table == "Passports":
-            return {
-                "id": record.get("id", ""),
-                "name": record.get("name", ""),
-                "type": "Passports",
-                "date": record.get("booking_date", ""),
-                "ym_paid": f"{record.get('booking_price', 0)} ر.ي" if record.get('currency') == '1' else "0",
-                "sm_paid": f"{record.get('booking_price', 0)} ر.س" if record.get('currency') == '2' else "0",
-                "remaining": record.get("remaining_amount", 0),
-            }
-        elif table == "Umrah":
-            return {
-                "id": record.get("id", ""),
-                "name": record.get("name", ""),
-                "type": "Umrah",
-                "date": record.get("entry_date", ""),
-                "ym_paid": f"{record.get('cost', 0)} ر.ي" if record.get('currency') == '1' else "0",
-                "sm_paid": f"{record.get('cost', 0)} ر.س" if record.get('currency') == '2' else "0",
-                "remaining": record.get("remaining_amount", 0),
-            }
-        elif table == "Trips":
-            return {
-                "id": record.get("id", ""),
-                "name": record.get("name", ""),
-                "type": "Trips",
-                "date": record.get("trip_date", ""),
-                "ym_paid": f"{record.get('amount', 0)} ر.ي" if record.get('currency') == '1' else "0",
-                "sm_paid": f"{record.get('amount', 0)} ر.س" if record.get('currency') == '2' else "0",
-                "remaining": record.get("remaining_amount", 0),
-            }
-        else:
-            raise ValueError(f"جدول غير معروف: {table}")
+        rows = self.union_search(selects, "date DESC, id DESC", limit)
+        if not rows and self.fuzzy_fallback(search_term, mode):
+            # نتائج البحث التقريبي ليس لها مفتاح بحث فلا تُصفّى في الذاكرة
+            rows = self.fuzzy_debt_rows(search_term, min(limit, FUZZY_LIMIT))
+            if with_keys:
+                return [(self.format_debt_row(row), None) for row in rows]
+        if with_keys:
+            return [(self.format_debt_row(row), row[7]) for row in rows]
+        return [self.format_debt_row(row) for row in rows]
+
+    def fuzzy_debt_rows(self, search_term: str, limit: int = FUZZY_LIMIT):
+        """صفوف الديون (بنفس أعمدة search_debts) لأقرب الأسماء إلى النص، بترتيب الفهرس التقريبي."""
+        matches = get_name_index().search(search_term, tuple(DEBT_SEARCH_TABLES), limit)
+        if not matches:
+            return []
+        selects, params = [], []
+        for table, (date_column, price_column, _) in DEBT_SEARCH_TABLES.items():
+            ids = [record_id for match_table, record_id, _, _ in matches if match_table == table]
+            if not ids:
+                continue
+            selects.append(
+                f"SELECT '{table}' AS type, id, name, {date_column} AS date, {price_column} AS price, "
+                f"currency, remaining_amount FROM {table} WHERE id IN ({', '.join('?' * len(ids))})"
+            )
+            params.extend(ids)
+        with self.lock:
+            rows = self.db_manager.execute_read_query(" UNION ALL ".join(selects), params)
+        rank = {(table, record_id): position for position, (table, record_id, _, _) in enumerate(matches)}
+        return sorted(rows, key=lambda row: rank.get((row[0], row[1]), len(rank)))
+
+    def format_debt_row(self, row) -> Dict[str, Union[str, float, int]]:
+        """
+        تنسيق صف البحث الموحد (type, id, name, date, price, currency, remaining_amount, ...)
+        ليصبح متوافقًا مع تنسيق get_all_data.
+        """
+        table, record_id, name, debt_date, price, currency, remaining = row[:7]
+        return {
+            "id": record_id,
+            "name": name or "",
+            "type": table,
+            "date": debt_date or "",
+            "ym_paid": f"{format_minor(price or 0)} ر.ي" if currency == '1' else "0",
+            "sm_paid": f"{format_minor(price or 0)} ر.س" if currency == '2' else "0",
+            "remaining": from_minor(remaining or 0),
+        }
             
     def close(self):
         """إغلاق الاتصال بقاعدة البيانات."""
-        self.connection.close()
\ No newline at end of file
+        if self.owns_db_manager:
+            self.db_manager.close()
\ No newline at end of file
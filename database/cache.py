@@ -0,0 +1,89 @@
+import threading
+import weakref
+from collections import OrderedDict
+from database.events import get_event_bus
+
+
+class RecordCache:
+    """
+    ذاكرة مؤقتة محدودة (LRU) للسجلات ونتائج الصفحات أمام DatabaseManager.
+
+    الإبطال يتم بطريقتين:
+    - أحداث التغيير من ناقل الأحداث (كتابات البرنامج نفسه): تُحذف سجلات الجدول المعدلة فقط.
+    - data_version لمدير قاعدة البيانات (PRAGMA data_version محليًا): يتغير عند حفظ اتصال آخر
+      (شاشة أخرى أو جهاز آخر على نفس الملف)، فتُفرغ الذاكرة بالكامل قبل القراءة التالية.
+    """
+
+    DEFAULT_SIZE = 512
+
+    def __init__(self, db_manager, max_size=DEFAULT_SIZE):
+        self.db_manager = db_manager
+        self.max_size = max_size
+        self.entries = OrderedDict()  # المفتاح -> (الجداول، معرف السجل، القيمة)
+        self.lock = threading.Lock()
+        self.data_version = None
+        self.generation = 0  # يزيد مع كل إبطال حتى لا تُخزن نتيجة قُرئت قبله
+        self.hits = 0
+        self.misses = 0
+
+        # الاشتراك بمرجع ضعيف حتى لا يبقي الناقل الذاكرة حية بعد انتهاء الخدمة
+        cache_ref = weakref.ref(self)
+
+        def on_change(event):
+            cache = cache_ref()
+            if cache is not None:
+                cache.invalidate(event.table, event.ids)
+
+        bus = get_event_bus()
+        weakref.finalize(self, bus.unsubscribe, bus.subscribe(on_change))
+
+    def check_data_version(self):
+        version = self.db_manager.data_version()
+        if version != self.data_version:
+            if self.data_version is not None:
+                self.clear()
+            self.data_version = version
+
+    def get(self, key, tables, loader, record_id=None):
+        """
+        إرجاع القيمة من الذاكرة أو تحميلها بـ loader وتخزينها.
+
+        :param key: مفتاح فريد (يتضمن اسم الجدول).
+        :param tables: الجداول التي تعتمد عليها القيمة.
+        :param record_id: معرف السجل إذا كانت القيمة سجلًا واحدًا (للإبطال الدقيق).
+        """
+        self.check_data_version()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry[2]
+            self.misses += 1
+            generation = self.generation
+
+        value = loader()
+
+        with self.lock:
+            if generation == self.generation:
+                self.entries[key] = (frozenset(tables), None if record_id is None else int(record_id), value)
+                self.entries.move_to_end(key)
+                while len(self.entries) > self.max_size:
+                    self.entries.popitem(last=False)
+        return value
+
+    def invalidate(self, table, ids=None):
+        """حذف القيم المعتمدة على الجدول؛ السجلات المفردة تُحذف فقط إذا كانت ضمن ids."""
+        with self.lock:
+            self.generation += 1
+            for key, (tables, record_id, _) in list(self.entries.items()):
+                if table in tables and (ids is None or record_id is None or record_id in ids):
+                    del self.entries[key]
+
+    def clear(self):
+        with self.lock:
+            self.generation += 1
+            self.entries.clear()
+
+    def stats(self):
+        return {"size": len(self.entries), "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,118 @@
+import os
+import time
+import random
+import sqlite3
+import threading
+
+# الإعدادات قابلة للتغيير لكل جهاز عبر متغيرات البيئة دون تعديل البرنامج
+BUSY_TIMEOUT_MS = int(os.environ.get("TAIF_BUSY_TIMEOUT_MS", 5000))
+WRITE_RETRIES = int(os.environ.get("TAIF_WRITE_RETRIES", 5))
+RETRY_BASE_DELAY = 0.05
+RETRY_MAX_DELAY = 2.0
+# WAL أو DELETE لفرض وضع السجل؛ القيمة الفارغة تعني الاختيار التلقائي حسب نوع القرص
+JOURNAL_MODE = os.environ.get("TAIF_JOURNAL_MODE", "").upper()
+
+# أنظمة الملفات الشبكية التي لا يعمل عليها WAL (يحتاج ذاكرة مشتركة على نفس الجهاز)
+NETWORK_FILESYSTEMS = {"nfs", "nfs4", "cifs", "smbfs", "smb3", "afs", "9p", "fuse.sshfs", "davfs", "ncpfs"}
+DRIVE_REMOTE = 4
+
+_journal_modes = {}
+_journal_modes_lock = threading.Lock()
+
+
+class DatabaseBusyError(sqlite3.OperationalError):
+    """قاعدة البيانات مشغولة من جهاز آخر حتى بعد إعادة المحاولة."""
+
+    def __init__(self, error):
+        super().__init__(f"قاعدة البيانات مشغولة من جهاز آخر، حاول مرة أخرى ({error})")
+
+
+def is_busy_error(error):
+    message = str(error).lower()
+    return isinstance(error, sqlite3.OperationalError) and ("locked" in message or "busy" in message)
+
+
+def is_network_path(path):
+    """هل ملف قاعدة البيانات على قرص شبكي (مجلد مشترك)؟"""
+    path = os.path.abspath(path)
+    if os.name == "nt":
+        if path.startswith("\\\\"):
+            return True
+        try:
+            import ctypes
+            drive = os.path.splitdrive(path)[0] + "\\"
+            return ctypes.windll.kernel32.GetDriveTypeW(drive) == DRIVE_REMOTE
+        except Exception:
+            return False
+
+    # نقطة التركيب الأطول المطابقة للمسار تحدد نوع نظام الملفات
+    try:
+        with open("/proc/mounts", encoding="utf-8") as mounts:
+            entries = [line.split() for line in mounts]
+    except OSError:
+        return False
+    best_mount, best_type = "", ""
+    for entry in entries:
+        if len(entry) < 3:
+            continue
+        mount_point = entry[1].replace("\\040", " ")
+        prefix = mount_point.rstrip("/") + "/"
+        if (path == mount_point or path.startswith(prefix)) and len(mount_point) > len(best_mount):
+            best_mount, best_type = mount_point, entry[2]
+    return best_type in NETWORK_FILESYSTEMS
+
+
+def choose_journal_mode(path):
+    """WAL على الأقراص المحلية، وسجل التراجع (DELETE) على المجلدات المشتركة."""
+    if JOURNAL_MODE:
+        return JOURNAL_MODE
+    key = os.path.abspath(path)
+    with _journal_modes_lock:
+        if key not in _journal_modes:
+            _journal_modes[key] = "DELETE" if is_network_path(key) else "WAL"
+        return _journal_modes[key]
+
+
+def connect(path, busy_timeout=None):
+    """
+    فتح اتصال مهيأ للعمل من عدة أجهزة على نفس الملف:
+    مهلة انتظار الأقفال (busy_timeout) ووضع السجل المناسب لنوع القرص.
+
+    ملاحظة: الجهاز الذي يشارك المجلد يفتح الملف كقرص محلي، لذلك يجب ضبط
+    TAIF_JOURNAL_MODE=DELETE عليه حتى لا يتحول الملف إلى WAL بينما تفتحه الأجهزة الأخرى عبر الشبكة.
+    """
+    busy_timeout = BUSY_TIMEOUT_MS if busy_timeout is None else busy_timeout
+    # timeout يضبط busy_timeout في SQLite: الانتظار حتى تحرير القفل بدلًا من الفشل فورًا
+    connection = sqlite3.connect(path, timeout=busy_timeout / 1000, check_same_thread=False)
+
+    journal_mode = choose_journal_mode(path)
+    try:
+        current = connection.execute(f"PRAGMA journal_mode = {journal_mode}").fetchone()[0].upper()
+    except sqlite3.OperationalError:
+        # تغيير الوضع يحتاج انفرادًا بالملف؛ يبقى الوضع الحالي إذا كانت أجهزة أخرى متصلة
+        current = connection.execute("PRAGMA journal_mode").fetchone()[0].upper()
+    if current == "WAL":
+        connection.execute("PRAGMA synchronous = NORMAL")
+    return connection
+
+
+def retry_on_busy(func, retries=None, on_retry=None):
+    """
+    تنفيذ func مع إعادة المحاولة عند انشغال قاعدة البيانات بتأخير أُسّي محدود مع عشوائية،
+    حتى لا تعيد الأجهزة المتنافسة المحاولة في نفس اللحظة.
+    """
+    retries = WRITE_RETRIES if retries is None else retries
+    attempt = 0
+    while True:
+        try:
+            return func()
+        except sqlite3.OperationalError as e:
+            if not is_busy_error(e) or isinstance(e, DatabaseBusyError):
+                raise
+            if attempt >= retries:
+                raise DatabaseBusyError(e) from e
+            delay = min(RETRY_BASE_DELAY * (2 ** attempt), RETRY_MAX_DELAY)
+            time.sleep(delay * random.uniform(0.5, 1.0))
+            attempt += 1
+            if on_retry:
+                on_retry()
@@ -0,0 +1,25 @@
+# رموز العملات المخزنة في قاعدة البيانات ومقابلها الدولي
+CURRENCY_CODES = {"1": "YER", "2": "SAR", "3": "USD"}
+
+# نصوص العرض لكل رمز عملة
+CURRENCY_LABELS = {"1": "ر.ي", "2": "ر.س", "3": "دولار"}
+
+# الرمز المستخدم عند عدم تحديد العملة
+DEFAULT_CURRENCY = "1"
+DEFAULT_CURRENCY_LABEL = CURRENCY_LABELS[DEFAULT_CURRENCY]
+
+# العملة الأساسية التي تُسجل أسعار الصرف مقابلها (سعر الوحدة الواحدة بالريال اليمني)
+BASE_CURRENCY = "1"
+
+# تحويل نص العرض (كما في قوائم الاختيار) إلى الرمز المخزن
+CURRENCY_BY_LABEL = {label: code for code, label in CURRENCY_LABELS.items()}
+
+
+def currency_label(currency_code):
+    """تحويل رمز العملة المخزن إلى نص العرض."""
+    return CURRENCY_LABELS.get(str(currency_code), DEFAULT_CURRENCY_LABEL)
+
+
+def currency_code(label):
+    """تحويل نص العملة المختار في الواجهة إلى الرمز المخزن."""
+    return CURRENCY_BY_LABEL.get(label, DEFAULT_CURRENCY)
@@ -0,0 +1,63 @@
+from database.normalization import normalize_name, normalize_passport, normalize_phone
+
+
+def customer_key(name, passport_number=None, phone_number=None):
+    """
+    بناء المفتاح الموحد للعميل: رقم الجواز أولًا، ثم رقم الهاتف، ثم الاسم.
+    """
+    passport = normalize_passport(passport_number)
+    if passport:
+        return f"P:{passport}"
+    phone = normalize_phone(phone_number)
+    if phone:
+        return f"T:{phone}"
+    name_key = normalize_name(name)
+    if name_key:
+        return f"N:{name_key}"
+    return None
+
+
+def resolve_customer_id(cursor, name, passport_number=None, phone_number=None):
+    """
+    إرجاع معرف العميل المطابق أو إنشاء عميل جديد.
+
+    السجلات التي لا تحتوي على رقم جواز أو هاتف (مثل جدول الجوازات) تُربط
+    بالعميل الوحيد الذي يحمل نفس الاسم بعد التوحيد إن وجد.
+
+    :param cursor: مؤشر قاعدة البيانات (يجب أن يتم الحفظ من قبل المستدعي).
+    :return: معرف العميل أو None إذا لم تتوفر أي بيانات تعريفية.
+    """
+    key = customer_key(name, passport_number, phone_number)
+    if key is None:
+        return None
+
+    name_key = normalize_name(name)
+    if key.startswith("N:"):
+        cursor.execute("SELECT id FROM Customers WHERE name_key = ? LIMIT 2", (name_key,))
+        matches = cursor.fetchall()
+        if len(matches) == 1:
+            return matches[0][0]
+
+    cursor.execute("SELECT id FROM Customers WHERE customer_key = ?", (key,))
+    row = cursor.fetchone()
+    if row:
+        return row[0]
+
+    cursor.execute(
+        "INSERT INTO Customers (customer_key, name, name_key, passport_number, phone_number) VALUES (?, ?, ?, ?, ?)",
+        (key, name, name_key, normalize_passport(passport_number) or None, normalize_phone(phone_number) or None)
+    )
+    return cursor.lastrowid
+
+
+def link_customers(cursor, table_name, passport_column=None, phone_column=None):
+    """ربط صفوف جدول موجود بجدول العملاء (يُستخدم في الترحيل)."""
+    columns = ["id", "name", passport_column or "NULL", phone_column or "NULL"]
+    cursor.execute(f"SELECT {', '.join(columns)} FROM {table_name} WHERE customer_id IS NULL")
+    rows = cursor.fetchall()
+    updates = []
+    for row_id, name, passport_number, phone_number in rows:
+        customer_id = resolve_customer_id(cursor, name, passport_number, phone_number)
+        if customer_id is not None:
+            updates.append((customer_id, row_id))
+    cursor.executemany(f"UPDATE {table_name} SET customer_id = ? WHERE id = ?", updates)
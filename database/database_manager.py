@@ -1,13 +1,49 @@
-import sqlite3
 import os
+import threading
+from contextlib import contextmanager
+from database.migrations import run_migrations
+from database.connection import connect, retry_on_busy
+from database.events import get_event_bus, merge_events, ChangeEvent, UPDATE
+from database.cache import RecordCache
+from database.records import record_factory
+
+def data_server_address():
+    """عنوان خادم البيانات (host:port) من TAIF_DATA_SERVER، أو نص فارغ للعمل على الملف المحلي."""
+    return os.environ.get("TAIF_DATA_SERVER", "").strip()
+
+
+def create_database_manager(db_name="taif.db"):
+    """
+    إنشاء مدير قاعدة البيانات المناسب: RemoteDatabaseManager إذا كان خادم البيانات مضبوطًا،
+    وإلا DatabaseManager على الملف المحلي. الواجهتان متطابقتان فلا تتغير الخدمات.
+    """
+    address = data_server_address()
+    if address:
+        from database.remote import RemoteDatabaseManager
+        return RemoteDatabaseManager(address)
+    return DatabaseManager(db_name)
+
 
 class DatabaseManager:
-    def __init__(self, db_name="taif.db"):
+    def __init__(self, db_name="taif.db", busy_timeout=None):
         self.db_path = os.path.join("database", db_name)
         self.ensure_database_directory_exists()
-        self.connection = sqlite3.connect(self.db_path)
+        # يسمح باستخدام الاتصال من خيط قاعدة البيانات في الخلفية، والقفل يمنع التداخل
+        # الاتصال ينتظر أقفال الأجهزة الأخرى (busy_timeout) ويستخدم WAL إذا سمح القرص
+        self.connection = connect(self.db_path, busy_timeout)
         self.cursor = self.connection.cursor()
+        self.lock = threading.RLock()
+        self.transaction_depth = 0
+        self.busy_retries = 0  # عدد مرات إعادة المحاولة بسبب انشغال قاعدة البيانات
+        self.pending_events = []  # أحداث التغيير المؤجلة حتى حفظ المعاملة
+        self.column_names = {}
+        self.cache = RecordCache(self)  # ذاكرة مؤقتة للسجلات والصفحات
+        fresh = not self.table_exists("Passports")
         self.create_tables()
+        # الفهارس والعروض بعد الترحيل لأنها قد تعتمد على أعمدة يضيفها الترحيل
+        run_migrations(self.connection, fresh=fresh)
+        self.create_indexes()
+        self.create_views()
 
     def ensure_database_directory_exists(self):
         if not os.path.exists("database"):
@@ -15,6 +51,14 @@ class DatabaseManager:
 
     def create_tables(self):
         tables = {
+            "Customers": """
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                customer_key TEXT UNIQUE NOT NULL,  -- مفتاح موحد (رقم الجواز أو الهاتف أو الاسم)
+                name TEXT,
+                name_key TEXT,                      -- الاسم بعد التوحيد
+                passport_number TEXT,
+                phone_number TEXT
+            """,
             "Users": """
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 username TEXT UNIQUE NOT NULL,
@@ -25,15 +69,16 @@ class DatabaseManager:
                 name TEXT,
                 booking_date TEXT,
                 type TEXT,
-                booking_price REAL,
-                purchase_price REAL,
-                net_amount REAL,
-                paid_amount REAL,
-                remaining_amount REAL,
+                booking_price INTEGER,
+                purchase_price INTEGER,
+                net_amount INTEGER,
+                paid_amount INTEGER,
+                remaining_amount INTEGER,
                 status TEXT,
                 receipt_date TEXT,
                 receiver_name TEXT,
-                currency TEXT                  -- نوع العمله 
+                currency TEXT,                 -- نوع العمله 
+                customer_id INTEGER REFERENCES Customers(id)
             """,
             "Umrah": """
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -42,13 +87,14 @@ class DatabaseManager:
                 phone_number TEXT,
                 sponsor_name TEXT,
                 sponsor_number TEXT,
-                cost REAL,
-                paid REAL,
-                remaining_amount REAL,
+                cost INTEGER,
+                paid INTEGER,
+                remaining_amount INTEGER,
                 entry_date TEXT,
                 exit_date TEXT,
                 status TEXT,
-                currency TEXT                    -- نوع العمله 
+                currency TEXT,                   -- نوع العمله 
+                customer_id INTEGER REFERENCES Customers(id)
             """,
             "Trips": """
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -57,25 +103,34 @@ class DatabaseManager:
                 from_place TEXT,                  -- مكان المغادرة
                 to_place TEXT,                    -- مكان الوجهة
                 booking_company TEXT,             -- اسم شركة النقل
-                amount REAL,                      -- المبلغ الكلي
+                amount INTEGER,                   -- المبلغ الكلي
                 currency TEXT,                    -- نوع العمله 
-                agent TEXT,                       -- المبلغ للوكيل
-                net_amount REAL,                  -- المبلغ الصافي (يُحسب تلقائيًا)
+                agent INTEGER,                    -- المبلغ للوكيل
+                net_amount INTEGER,               -- المبلغ الصافي (يُحسب تلقائيًا)
                 trip_date TEXT,                   -- تاريخ الرحلة
                 office_name TEXT,                 -- اسم المكتب (مكتبنا، الوادي، الطايف)
-                paid REAL,                        -- المبلغ المدفوع
-                remaining_amount REAL             -- المبلغ المتبقي
+                paid INTEGER,                     -- المبلغ المدفوع
+                remaining_amount INTEGER,         -- المبلغ المتبقي
+                customer_id INTEGER REFERENCES Customers(id)
             """,
             "Payments": """
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 debt_type TEXT NOT NULL,  -- نوع الدين (Passports, Umrah, Trips)
                 debt_id INTEGER NOT NULL,  -- معرف الدين في الجدول الأصلي
-                amount REAL NOT NULL,  -- مبلغ الدفعة
+                amount INTEGER NOT NULL,  -- مبلغ الدفعة
                 payment_date TEXT NOT NULL,  -- تاريخ السداد
                 payment_method TEXT,  -- طريقة الدفع (نقدي، حوالة، إلخ)
+                currency TEXT,  -- عملة الدفعة (نفس عملة الدين)
                 FOREIGN KEY (debt_id) REFERENCES Passports(id),
                 FOREIGN KEY (debt_id) REFERENCES Umrah(id),
                 FOREIGN KEY (debt_id) REFERENCES Trips(id)
+            """,
+            "ExchangeRates": """
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                currency TEXT NOT NULL,   -- رمز العملة (1، 2، 3)
+                rate_date TEXT NOT NULL,  -- تاريخ بدء العمل بالسعر
+                rate REAL NOT NULL,       -- قيمة الوحدة الواحدة بالعملة الأساسية
+                UNIQUE (currency, rate_date)
             """
 
 
@@ -83,19 +138,151 @@ class DatabaseManager:
         for table_name, columns in tables.items():
             self.create_table(table_name, columns)
 
+    def create_indexes(self):
+        indexes = {
+            "idx_umrah_exit_date": "Umrah(exit_date)",
+            "idx_customers_name_key": "Customers(name_key)",
+            "idx_passports_customer": "Passports(customer_id)",
+            "idx_umrah_customer": "Umrah(customer_id)",
+            "idx_trips_customer": "Trips(customer_id)",
+            # سجل مدفوعات الدين مرتبًا بالتاريخ (صفحات ShowDebt) وإجمالياته
+            "idx_payments_debt_date": "Payments(debt_type, debt_id, payment_date)",
+            # البحث برقم الجواز أو الهاتف (مطابقة تامة أو بادئة) دون اعتبار حالة الأحرف
+            "idx_umrah_passport_number": "Umrah(passport_number COLLATE NOCASE)",
+            "idx_umrah_phone_number": "Umrah(phone_number COLLATE NOCASE)",
+            "idx_umrah_sponsor_number": "Umrah(sponsor_number COLLATE NOCASE)",
+            "idx_trips_passport_number": "Trips(passport_number COLLATE NOCASE)",
+            # فهارس جزئية للديون غير المسددة مرتبة بالتاريخ (قائمة الديون وتقرير الأعمار)
+            "idx_passports_outstanding": "Passports(booking_date, currency, remaining_amount) WHERE remaining_amount > 0",
+            "idx_umrah_outstanding": "Umrah(entry_date, currency, remaining_amount) WHERE remaining_amount > 0",
+            "idx_trips_outstanding": "Trips(trip_date, currency, remaining_amount) WHERE remaining_amount > 0",
+        }
+        for index_name, target in indexes.items():
+            self.execute_query(f"CREATE INDEX IF NOT EXISTS {index_name} ON {target}")
+        # فهارس استُبدلت بفهارس أشمل منها
+        for index_name in ("idx_payments_debt",):
+            self.execute_query(f"DROP INDEX IF EXISTS {index_name}")
+
+    def create_views(self):
+        views = {
+            # عرض موحد لجميع الخدمات التي قد يكون عليها دين
+            "Debts": """
+                SELECT 'Passports' AS debt_type, id AS debt_id, customer_id, name, booking_date AS debt_date,
+                       booking_price AS total_amount, paid_amount, remaining_amount, currency
+                FROM Passports
+                UNION ALL
+                SELECT 'Umrah', id, customer_id, name, entry_date, cost, paid, remaining_amount, currency
+                FROM Umrah
+                UNION ALL
+                SELECT 'Trips', id, customer_id, name, trip_date, amount, paid, remaining_amount, currency
+                FROM Trips
+            """,
+        }
+        for view_name, query in views.items():
+            self.execute_query(f"CREATE VIEW IF NOT EXISTS {view_name} AS {query}")
+
+    def table_exists(self, table_name):
+        result = self.execute_read_query(
+            "SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name = ?", (table_name,)
+        )
+        return result[0][0] > 0
+
     def create_table(self, table_name, columns):
         query = f"CREATE TABLE IF NOT EXISTS {table_name} ({columns})"
         self.execute_query(query)
 
+    def count_retry(self):
+        self.busy_retries += 1
+
     def execute_query(self, query, params=()):
-        self.cursor.execute(query, params)
-        self.connection.commit()
+        with self.lock:
+            if self.transaction_depth:
+                # داخل المعاملة القفل محجوز مسبقًا بـ BEGIN IMMEDIATE
+                self.cursor.execute(query, params)
+                return
+            try:
+                # إعادة تنفيذ العبارة آمنة لأن العبارة التي فشلت بسبب القفل لم تغير شيئًا،
+                # والحفظ يُعاد وحده حتى لا تُنفذ العبارة مرتين
+                retry_on_busy(lambda: self.cursor.execute(query, params), on_retry=self.count_retry)
+                retry_on_busy(self.connection.commit, on_retry=self.count_retry)
+            except Exception:
+                if self.connection.in_transaction:
+                    self.connection.rollback()
+                raise
+
+    @contextmanager
+    def transaction(self):
+        """
+        تنفيذ عدة عمليات كتابة كوحدة واحدة: يتم الحفظ في النهاية أو التراجع عند حدوث خطأ.
+        """
+        with self.lock:
+            if self.transaction_depth:
+                self.transaction_depth += 1
+                try:
+                    yield self
+                finally:
+                    self.transaction_depth -= 1
+                return
+
+            self.begin_transaction()
+            self.transaction_depth = 1
+            try:
+                yield self
+                self.commit_transaction()
+            except Exception:
+                self.rollback_transaction()
+                self.pending_events = []
+                raise
+            finally:
+                self.transaction_depth = 0
+            events, self.pending_events = merge_events(self.pending_events), []
+
+        # الأحداث تُنشر بعد الحفظ فقط (وخارج القفل)، مدمجة حسب الجدول ونوع العملية
+        self.dispatch_events(events)
+
+    def begin_transaction(self):
+        # حجز قفل الكتابة من البداية: المعاملة إما تبدأ كاتبة أو تنتظر، فلا تفشل في منتصفها
+        retry_on_busy(lambda: self.cursor.execute("BEGIN IMMEDIATE"), on_retry=self.count_retry)
+
+    def commit_transaction(self):
+        retry_on_busy(self.connection.commit, on_retry=self.count_retry)
+
+    def rollback_transaction(self):
+        self.connection.rollback()
+
+    def publish(self, table, ids=None, operation=UPDATE):
+        """
+        نشر تغيير على ناقل الأحداث؛ داخل المعاملة يؤجل النشر حتى الحفظ (ويُلغى عند التراجع).
+        """
+        event = ChangeEvent(table, None if ids is None else frozenset(int(i) for i in ids), operation)
+        if not self.transaction_depth:
+            self.dispatch_events([event])
+            return
+        self.pending_events.append(event)
+
+    def dispatch_events(self, events):
+        bus = get_event_bus()
+        for event in events:
+            bus.dispatch(event)
+
+    def data_version(self):
+        """رقم يتغير عندما يحفظ اتصال آخر تغييرات على الملف (يستخدمه RecordCache)."""
+        return self.execute_read_query("PRAGMA data_version")[0][0]
+
+    def get_column_names(self, table_name):
+        """أسماء أعمدة الجدول بالترتيب (مع تخزين مؤقت)."""
+        if table_name not in self.column_names:
+            columns_info = self.execute_read_query(f"PRAGMA table_info({table_name})")
+            self.column_names[table_name] = [column[1] for column in columns_info]
+        return self.column_names[table_name]
 
     def insert(self, table_name, **kwargs):
         columns = ', '.join(kwargs.keys())
         placeholders = ', '.join(['?'] * len(kwargs))
         query = f"INSERT INTO {table_name} ({columns}) VALUES ({placeholders})"
-        self.execute_query(query, tuple(kwargs.values()))
+        with self.lock:
+            self.execute_query(query, tuple(kwargs.values()))
+            return self.cursor.lastrowid
 
     def select(self, table_name, **filters):
         query = f"SELECT * FROM {table_name}"
@@ -128,8 +315,34 @@ class DatabaseManager:
         return result[0][0] > 0
 
     def execute_read_query(self, query, params=()):
-        self.cursor.execute(query, params)
-        return self.cursor.fetchall()
+        with self.lock:
+            def read():
+                self.cursor.execute(query, params)
+                return self.cursor.fetchall()
+            return retry_on_busy(read, on_retry=self.count_retry)
+
+    def select_records(self, record_class, where="", params=(), order_by="", money=True, limit=None):
+        """
+        سجلات من جدول record_class (database/records.py) بأعمدته المسماة فقط بدل SELECT *،
+        فلا يتغير ترتيب الحقول إذا أضيف عمود إلى الجدول.
+        """
+        query = f"SELECT {', '.join(record_class._fields)} FROM {record_class.TABLE_NAME}"
+        if where:
+            query += f" WHERE {where}"
+        if order_by:
+            query += f" ORDER BY {order_by}"
+        if limit is not None:
+            query += f" LIMIT {int(limit)}"
+        return self.query_records(query, params, record_factory(record_class, money))
+
+    def query_records(self, query, params, factory):
+        """تنفيذ استعلام قراءة بمؤشر منفصل يبني كل صف مباشرة بـ factory (row_factory)."""
+        with self.lock:
+            def read():
+                cursor = self.connection.cursor()
+                cursor.row_factory = factory
+                return cursor.execute(query, params).fetchall()
+            return retry_on_busy(read, on_retry=self.count_retry)
 
     def close(self):
         self.connection.close()
@@ -145,8 +358,7 @@ class DatabaseManager:
         """
         try:
             # الحصول على أسماء الأعمدة من الفهرس
-            self.cursor.execute(f"PRAGMA table_info({table_name})")
-            columns_info = self.cursor.fetchall()
+            columns_info = self.execute_read_query(f"PRAGMA table_info({table_name})")
             column_names = [col[1] for col in columns_info]  # اسم العمود في الفهرس 1
 
             # بناء set_clause
@@ -0,0 +1,126 @@
+import time
+import logging
+import weakref
+import threading
+from collections import namedtuple
+
+# أنواع التغيير
+INSERT = "insert"
+UPDATE = "update"
+DELETE = "delete"
+
+# حدث تغيير: الجدول، معرفات السجلات (None تعني سجلات غير محددة)، ونوع العملية
+ChangeEvent = namedtuple("ChangeEvent", ["table", "ids", "operation"])
+
+logger = logging.getLogger(__name__)
+
+
+def merge_events(events):
+    """
+    دمج الأحداث المتتالية لنفس الجدول ونوع العملية في حدث واحد (مع الحفاظ على الترتيب).
+    يفيد عند إدخال مئات السجلات في معاملة واحدة أو عند وصول عدة أحداث بين دورتي تحديث للشاشة.
+    """
+    merged = {}
+    for event in events:
+        key = (event.table, event.operation)
+        if key not in merged:
+            merged[key] = event
+            continue
+        previous = merged[key]
+        ids = None if previous.ids is None or event.ids is None else previous.ids | event.ids
+        merged[key] = ChangeEvent(event.table, ids, event.operation)
+    return list(merged.values())
+
+
+class EventBus:
+    """
+    ناقل أحداث داخل البرنامج: الخدمات تنشر التغييرات (الجدول، المعرفات، العملية)،
+    والشاشات والذاكرات المؤقتة تشترك فيها بدلًا من سلاسل return_callback وإعادة التحميل الكامل.
+
+    المشتركون يُستدعون في خيط الناشر؛ شاشات Tk تستخدم ui.events.listen لنقل الأحداث إلى خيط Tk.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.subscribers = ()
+
+    def subscribe(self, callback, tables=None):
+        """
+        الاشتراك في أحداث جداول محددة (أو جميع الجداول إذا كانت tables فارغة).
+        :return: كائن الاشتراك (يُمرر إلى unsubscribe).
+        """
+        subscription = (callback, frozenset(tables) if tables else None)
+        with self.lock:
+            self.subscribers = self.subscribers + (subscription,)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            self.subscribers = tuple(item for item in self.subscribers if item is not subscription)
+
+    def publish(self, table, ids=None, operation=UPDATE):
+        """نشر تغيير على جدول؛ ids قائمة معرفات أو None إذا تغيرت سجلات غير محددة."""
+        self.dispatch(ChangeEvent(table, None if ids is None else frozenset(int(i) for i in ids), operation))
+
+    def dispatch(self, event):
+        # نسخة ثابتة من المشتركين، فلا يلزم القفل أثناء الاستدعاء
+        for callback, tables in self.subscribers:
+            if tables is None or event.table in tables:
+                try:
+                    callback(event)
+                except Exception:
+                    logger.exception("Event handler failed for %s", event.table)
+
+
+_event_bus = None
+_event_bus_lock = threading.Lock()
+
+
+def get_event_bus():
+    """إرجاع ناقل الأحداث المشترك للتطبيق (يُنشأ عند أول استخدام)."""
+    global _event_bus
+    with _event_bus_lock:
+        if _event_bus is None:
+            _event_bus = EventBus()
+        return _event_bus
+
+
+# أقصى مدة يُعتمد فيها على الأحداث لتفسير تغير data_version قبل مطابقة كاملة
+RESYNC_INTERVAL = 60
+
+
+class VersionWatch:
+    """
+    التمييز بين تغير data_version بسبب كتابات هذا البرنامج وكتابات برنامج آخر.
+
+    كل خدمة تكتب باتصالها الخاص، فيتغير data_version لاتصال الفهرس أو الذاكرة مع كل كتابة محلية
+    رغم أن أحداثها وصلت وطُبقت. إذا وصل أي حدث (من أي جدول) منذ الفحص السابق يُعتبر التغير مفسرًا به،
+    إلا إذا مضى RESYNC_INTERVAL على آخر مطابقة كاملة (قد يكون برنامج آخر كتب في نفس الفترة).
+    """
+
+    def __init__(self, max_age=RESYNC_INTERVAL):
+        self.max_age = max_age
+        self.version = None
+        self.events = False
+        self.synced_at = 0.0
+
+        watch_ref = weakref.ref(self)
+
+        def on_change(event):
+            watch = watch_ref()
+            if watch is not None:
+                watch.events = True
+
+        bus = get_event_bus()
+        weakref.finalize(self, bus.unsubscribe, bus.subscribe(on_change))
+
+    def needs_resync(self, version):
+        """هل يلزم مطابقة كاملة مع قاعدة البيانات؟ (يُستدعى مرة واحدة لكل فحص)."""
+        now = time.monotonic()
+        unexplained = version != self.version and (not self.events or now - self.synced_at > self.max_age)
+        resync = self.version is None or unexplained
+        self.version = version
+        self.events = False
+        if resync:
+            self.synced_at = now
+        return resync
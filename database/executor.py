@@ -0,0 +1,42 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class DataExecutor:
+    """
+    منفذ عمليات قاعدة البيانات في الخلفية.
+    يستخدم خيطًا مخصصًا (أو مجموعة صغيرة من الخيوط) حتى لا تتوقف واجهة Tk
+    أثناء انتظار الاستعلامات أو أقفال قاعدة البيانات.
+    """
+
+    def __init__(self, max_workers=1, thread_name_prefix="taif-db"):
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=thread_name_prefix)
+
+    def submit(self, func, *args, **kwargs):
+        """تنفيذ الدالة في خيط قاعدة البيانات وإرجاع Future بالنتيجة."""
+        return self.pool.submit(func, *args, **kwargs)
+
+    def shutdown(self, wait=True):
+        self.pool.shutdown(wait=wait)
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """إرجاع المنفذ المشترك للتطبيق (يُنشأ عند أول استخدام)."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = DataExecutor()
+        return _executor
+
+
+def shutdown_executor(wait=True):
+    """إيقاف المنفذ المشترك عند إغلاق التطبيق."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=wait)
+            _executor = None
@@ -0,0 +1,275 @@
+import re
+import threading
+import weakref
+from database.events import get_event_bus, VersionWatch
+from database.normalization import normalize_name
+
+# الجداول التي يُبحث في أسمائها تقريبيًا
+NAME_TABLES = ("Passports", "Umrah", "Trips")
+
+FUZZY_LIMIT = 50
+MIN_TOKEN_LENGTH = 2
+
+# حروف متقاربة النطق تُكتب بدل بعضها كثيرًا (بعد normalize_name)
+ARABIC_PHONETIC_MAP = str.maketrans({
+    "ث": "س", "ص": "س",
+    "ذ": "ز", "ظ": "ز",
+    "ض": "د",
+    "ط": "ت",
+    "ق": "ك",
+    "ح": "ه",
+    "ع": "ا", "ء": "ا",
+    "غ": "خ",
+})
+# حروف المد العربية والحروف الصوتية اللاتينية تُحذف بعد الحرف الأول (محمد/محامد، mohammed/muhammad)
+VOWELS = re.compile(r"(?<=.)[اويaeiouy]")
+REPEATED = re.compile(r"(.)\1+")
+# أداة التعريف (السقاف/سقاف، Alamoudi/Amoudi) إذا بقي بعدها ثلاثة حروف على الأقل
+ARTICLE = re.compile(r"^(?:ال|al-?|el-?)(?=...)")
+LATIN_PHONETIC = (("ph", "f"), ("kh", "k"), ("q", "k"), ("c", "k"), ("z", "s"))
+
+
+def phonetic_key(token):
+    """مفتاح صوتي للكلمة: بدون أداة التعريف، مع توحيد الحروف المتقاربة وحذف حروف المد والحروف المكررة."""
+    key = ARTICLE.sub("", token).translate(ARABIC_PHONETIC_MAP)
+    for source, target in LATIN_PHONETIC:
+        key = key.replace(source, target)
+    return REPEATED.sub(r"\1", VOWELS.sub("", key))
+
+
+def name_tokens(name):
+    """كلمات الاسم بعد التوحيد (الكلمات القصيرة جدًا لا تفيد في البحث التقريبي)."""
+    return [token for token in normalize_name(name).split() if len(token) >= MIN_TOKEN_LENGTH]
+
+
+def bigrams(key):
+    padded = f"^{key}$"
+    return {padded[i:i + 2] for i in range(len(padded) - 1)}
+
+
+def max_distance(key):
+    """أقصى عدد أخطاء مقبول حسب طول الكلمة."""
+    return max(1, len(key) // 3)
+
+
+def edit_distance(a, b, limit):
+    """مسافة Levenshtein مع التوقف المبكر؛ تُرجع limit + 1 إذا تجاوزت الحد."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char_a != char_b),
+            ))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+class FuzzyNameIndex:
+    """
+    فهرس تقريبي لأسماء العملاء في Passports وUmrah وTrips داخل الذاكرة.
+
+    كل اسم يُقسم إلى كلمات موحدة (normalize_name) ولكل كلمة مفتاح صوتي (phonetic_key).
+    البحث يجمع الكلمات المرشحة من فهرس الثنائيات (bigrams) للمفاتيح الصوتية ثم يحسب
+    مسافة التحرير للمرشحين فقط، فلا يمر على جميع الأسماء.
+
+    يُبنى الفهرس عند أول بحث، ثم يُحدّث تدريجيًا من أحداث التغيير (السجلات المعدلة فقط)،
+    وإذا تغير data_version دون أحداث تفسره (كتابة من برنامج آخر، VersionWatch) أو وصل حدث بلا معرفات
+    تُقارن الأسماء المخزنة بأسماء قاعدة البيانات وتُعاد فهرسة المتغير منها فقط (synchronize).
+    """
+
+    def __init__(self, db_manager, tables=NAME_TABLES):
+        self.db_manager = db_manager
+        self.tables = tables
+        self.lock = threading.RLock()
+        self.records = {}   # (الجدول، المعرف) -> (الاسم، الكلمات)
+        self.postings = {}  # الكلمة -> مجموعة (الجدول، المعرف)
+        self.keys = {}      # الكلمة -> المفتاح الصوتي
+        self.grams = {}     # الثنائي -> مجموعة الكلمات
+        self.built = False
+        self.versions = VersionWatch()
+        self.dirty = {}     # الجدول -> معرفات تغيرت ولم تُحدّث بعد (None = الجدول كاملًا)
+
+        index_ref = weakref.ref(self)
+
+        def on_change(event):
+            index = index_ref()
+            if index is not None:
+                index.mark_dirty(event.table, event.ids)
+
+        bus = get_event_bus()
+        weakref.finalize(self, bus.unsubscribe, bus.subscribe(on_change, tables))
+
+    # ----- الصيانة -----
+
+    def mark_dirty(self, table, ids):
+        with self.lock:
+            if ids is None or self.dirty.get(table, set()) is None:
+                self.dirty[table] = None
+            else:
+                self.dirty.setdefault(table, set()).update(ids)
+
+    def add_record(self, record, name):
+        tokens = name_tokens(name)
+        self.records[record] = (name, tokens)
+        for token in tokens:
+            holders = self.postings.get(token)
+            if holders is None:
+                holders = self.postings[token] = set()
+                key = self.keys[token] = phonetic_key(token)
+                for gram in bigrams(key):
+                    self.grams.setdefault(gram, set()).add(token)
+            holders.add(record)
+
+    def remove_record(self, record):
+        entry = self.records.pop(record, None)
+        if entry is None:
+            return
+        for token in entry[1]:
+            holders = self.postings.get(token)
+            if holders is None:
+                continue
+            holders.discard(record)
+            if not holders:
+                # الكلمة لم تعد مستخدمة في أي اسم
+                del self.postings[token]
+                for gram in bigrams(self.keys.pop(token)):
+                    self.grams[gram].discard(token)
+
+    def synchronize(self):
+        """
+        مطابقة الفهرس مع جميع الأسماء في قاعدة البيانات؛ تُعاد فهرسة الأسماء المتغيرة فقط.
+        قراءة (id, name) سريعة مقارنة بتقسيم الأسماء وفهرستها، فلا يُعاد بناء الفهرس كاملًا
+        عند كل تغيير من اتصال آخر.
+        """
+        self.dirty = {}
+        seen = set()
+        for table in self.tables:
+            for record_id, name in self.db_manager.execute_read_query(f"SELECT id, name FROM {table}"):
+                record = (table, record_id)
+                seen.add(record)
+                entry = self.records.get(record)
+                if entry is None or entry[0] != name:
+                    self.remove_record(record)
+                    self.add_record(record, name)
+        for record in [record for record in self.records if record not in seen]:
+            self.remove_record(record)
+        self.built = True
+
+    def refresh(self, table, ids):
+        """إعادة فهرسة سجلات محددة (المحذوفة تُزال من الفهرس)."""
+        ids = list(ids)
+        if not ids:
+            return
+        names = dict(self.db_manager.execute_read_query(
+            f"SELECT id, name FROM {table} WHERE id IN ({', '.join('?' * len(ids))})", tuple(ids)
+        ))
+        for record_id in ids:
+            self.remove_record((table, record_id))
+            if record_id in names:
+                self.add_record((table, record_id), names[record_id])
+
+    def ensure_current(self):
+        version = self.db_manager.data_version()
+        with self.lock:
+            dirty, self.dirty = self.dirty, {}
+            if self.versions.needs_resync(version) or not self.built or None in dirty.values():
+                self.synchronize()
+            else:
+                for table, ids in dirty.items():
+                    self.refresh(table, ids)
+
+    # ----- البحث -----
+
+    def similar_tokens(self, token):
+        """الكلمات المفهرسة القريبة من الكلمة مع درجة التشابه (0 إلى 1)."""
+        key = phonetic_key(token)
+        limit = max_distance(key)
+        query_grams = bigrams(key)
+        shared = {}
+        for gram in query_grams:
+            for candidate in self.grams.get(gram, ()):
+                shared[candidate] = shared.get(candidate, 0) + 1
+
+        # الكلمتان على مسافة d تشتركان في len(ثنائيات) - 2d ثنائيًا على الأقل
+        required = len(query_grams) - 2 * limit
+        matches = {}
+        for candidate, count in shared.items():
+            if count < required:
+                continue
+            candidate_key = self.keys[candidate]
+            distance = edit_distance(key, candidate_key, limit)
+            if distance > limit:
+                continue
+            similarity = 1 - distance / max(len(key), len(candidate_key), 1)
+            if candidate == token:
+                similarity += 0.01  # المطابقة الحرفية قبل المطابقة الصوتية
+            matches[candidate] = similarity
+        return matches
+
+    def search(self, search_term, tables=None, limit=FUZZY_LIMIT):
+        """
+        أفضل السجلات التي تطابق جميع كلمات النص تقريبيًا.
+
+        :param tables: حصر البحث في جداول محددة (الافتراضي جميع جداول الفهرس).
+        :return: قائمة (الجدول، المعرف، الاسم، الدرجة) مرتبة من الأقرب.
+        """
+        query_tokens = name_tokens(search_term)
+        if not query_tokens:
+            return []
+        self.ensure_current()
+
+        with self.lock:
+            # الكلمة ذات السجلات الأقل أولًا، ثم تُفحص بقية الكلمات على السجلات المتبقية فقط
+            candidates = sorted(
+                (self.similar_tokens(token) for token in query_tokens),
+                key=lambda matches: sum(len(self.postings[candidate]) for candidate in matches)
+            )
+            scores = None
+            for matches in candidates:
+                best = {}
+                for candidate, similarity in matches.items():
+                    holders = self.postings[candidate]
+                    if scores is not None:
+                        holders = holders.intersection(scores)
+                    for record in holders:
+                        if (tables is None or record[0] in tables) and similarity > best.get(record, 0):
+                            best[record] = similarity
+                if scores is not None:
+                    best = {record: scores[record] + similarity for record, similarity in best.items()}
+                scores = best
+                if not scores:
+                    return []
+
+            # الأعلى تشابهًا، ثم الأسماء الأقصر (كلمات زائدة أقل)، ثم الأحدث
+            ranked = sorted(
+                scores.items(),
+                key=lambda item: (-item[1], len(self.records[item[0]][1]), -item[0][1])
+            )[:limit]
+            return [
+                (table, record_id, self.records[(table, record_id)][0], round(min(score / len(query_tokens), 1.0), 3))
+                for (table, record_id), score in ranked
+            ]
+
+    def stats(self):
+        return {"records": len(self.records), "tokens": len(self.postings), "grams": len(self.grams)}
+
+
+_name_index = None
+_name_index_lock = threading.Lock()
+
+
+def get_name_index():
+    """الفهرس التقريبي المشترك للبرنامج (يُنشأ عند أول استخدام باتصال خاص به)."""
+    global _name_index
+    with _name_index_lock:
+        if _name_index is None:
+            from database.database_manager import create_database_manager
+            _name_index = FuzzyNameIndex(create_database_manager())
+        return _name_index
@@ -0,0 +1,166 @@
+import re
+from datetime import datetime
+from database.customers import link_customers
+from database.money import MONEY_COLUMNS, MINOR_UNITS
+
+# صيغ التواريخ التي قد تكون مخزنة في قواعد البيانات القديمة
+LEGACY_DATE_FORMATS = ("%Y-%m-%d", "%Y/%m/%d", "%d-%m-%Y", "%d/%m/%Y", "%Y-%m-%d %H:%M:%S")
+
+# نمط GLOB للتاريخ بصيغة ISO (YYYY-MM-DD)
+ISO_DATE_GLOB = "[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]"
+
+
+def normalize_date(value):
+    """
+    تحويل التاريخ إلى صيغة ISO (YYYY-MM-DD).
+    يتم إرجاع القيمة كما هي إذا تعذر تحليلها.
+    """
+    if value is None:
+        return None
+    text = str(value).strip()
+    for date_format in LEGACY_DATE_FORMATS:
+        try:
+            return datetime.strptime(text, date_format).strftime("%Y-%m-%d")
+        except ValueError:
+            continue
+    return value
+
+
+def normalize_date_columns(cursor, table_name, columns):
+    """توحيد صيغة أعمدة التاريخ في جدول معين."""
+    for column in columns:
+        cursor.execute(
+            f"SELECT id, {column} FROM {table_name} "
+            f"WHERE {column} IS NOT NULL AND {column} NOT GLOB '{ISO_DATE_GLOB}'"
+        )
+        updates = []
+        for row_id, value in cursor.fetchall():
+            normalized = normalize_date(value)
+            if normalized != value:
+                updates.append((normalized, row_id))
+        cursor.executemany(f"UPDATE {table_name} SET {column} = ? WHERE id = ?", updates)
+
+
+def migrate_normalize_umrah_dates(cursor):
+    """توحيد تواريخ الدخول والخروج في جدول العمرة لاستخدامها في julianday والفهارس."""
+    normalize_date_columns(cursor, "Umrah", ["entry_date", "exit_date"])
+
+
+def migrate_normalize_record_dates(cursor):
+    """توحيد تواريخ الجوازات والرحلات (للفرز وjulianday في تقرير أعمار الديون وسنوات الأرشفة)."""
+    normalize_date_columns(cursor, "Passports", ["booking_date", "receipt_date"])
+    normalize_date_columns(cursor, "Trips", ["trip_date"])
+
+
+def add_column_if_missing(cursor, table_name, column_name, definition):
+    """إضافة عمود إلى جدول موجود إذا لم يكن موجودًا."""
+    cursor.execute(f"PRAGMA table_info({table_name})")
+    if column_name not in [column[1] for column in cursor.fetchall()]:
+        cursor.execute(f"ALTER TABLE {table_name} ADD COLUMN {column_name} {definition}")
+
+
+def migrate_link_customers(cursor):
+    """إضافة عمود customer_id للخدمات وربط السجلات الحالية بجدول العملاء."""
+    for table_name in ("Passports", "Umrah", "Trips"):
+        add_column_if_missing(cursor, table_name, "customer_id", "INTEGER REFERENCES Customers(id)")
+
+    # الجداول التي تحتوي على رقم جواز أو هاتف أولًا، ثم الجوازات التي تُربط بالاسم
+    link_customers(cursor, "Umrah", passport_column="passport_number", phone_column="phone_number")
+    link_customers(cursor, "Trips", passport_column="passport_number")
+    link_customers(cursor, "Passports")
+
+
+def rebuild_money_columns(cursor, table_name, money_columns):
+    """
+    إعادة بناء الجدول بحيث تصبح الأعمدة المالية INTEGER، مع تحويل القيم إلى الوحدات الصغرى.
+    يتم الحفاظ على باقي تعريف الجدول (المفتاح الأساسي والمفاتيح الخارجية) كما هو.
+    """
+    cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table_name,))
+    create_sql = cursor.fetchone()[0]
+    for column in money_columns:
+        create_sql = re.sub(rf"\b{column}\s+(REAL|TEXT)\b", f"{column} INTEGER", create_sql)
+    new_table = f"{table_name}_new"
+    create_sql = re.sub(rf"^CREATE TABLE\s+{table_name}\b", f"CREATE TABLE {new_table}", create_sql)
+
+    cursor.execute(f"PRAGMA table_info({table_name})")
+    columns = [column[1] for column in cursor.fetchall()]
+    select_list = ", ".join(
+        f"CAST(ROUND({column} * {MINOR_UNITS}) AS INTEGER)" if column in money_columns else column
+        for column in columns
+    )
+
+    cursor.execute(f"DROP TABLE IF EXISTS {new_table}")
+    cursor.execute(create_sql)
+    cursor.execute(f"INSERT INTO {new_table} ({', '.join(columns)}) SELECT {select_list} FROM {table_name}")
+    cursor.execute(f"DROP TABLE {table_name}")
+    cursor.execute(f"ALTER TABLE {new_table} RENAME TO {table_name}")
+
+
+def migrate_money_to_minor_units(cursor):
+    """تخزين المبالغ كأعداد صحيحة بالوحدات الصغرى، وإضافة عملة الدفعة لجدول المدفوعات."""
+    # العرض يعتمد على الجداول التي سيُعاد بناؤها، ويُنشأ من جديد بعد الترحيل
+    cursor.execute("DROP VIEW IF EXISTS Debts")
+    add_column_if_missing(cursor, "Payments", "currency", "TEXT")
+    for table_name, money_columns in MONEY_COLUMNS.items():
+        rebuild_money_columns(cursor, table_name, money_columns)
+
+    # عملة الدفعة هي عملة الدين المرتبط بها
+    cursor.execute("""
+        UPDATE Payments SET currency = CASE debt_type
+            WHEN 'Passports' THEN (SELECT currency FROM Passports WHERE id = Payments.debt_id)
+            WHEN 'Umrah' THEN (SELECT currency FROM Umrah WHERE id = Payments.debt_id)
+            WHEN 'Trips' THEN (SELECT currency FROM Trips WHERE id = Payments.debt_id)
+        END
+        WHERE currency IS NULL
+    """)
+
+
+# قائمة الترحيلات بالترتيب: (رقم الإصدار، دالة الترحيل)
+MIGRATIONS = [
+    (1, migrate_normalize_umrah_dates),
+    (2, migrate_link_customers),
+    (3, migrate_money_to_minor_units),
+    (4, migrate_normalize_record_dates),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version(cursor):
+    cursor.execute("PRAGMA user_version")
+    return cursor.fetchone()[0]
+
+
+def set_schema_version(cursor, version):
+    cursor.execute(f"PRAGMA user_version = {int(version)}")
+
+
+def run_migrations(connection, fresh=False):
+    """
+    تنفيذ الترحيلات التي لم تُطبق بعد على قاعدة البيانات.
+
+    :param connection: اتصال قاعدة البيانات.
+    :param fresh: True إذا تم إنشاء الجداول للتو (لا حاجة لترحيل البيانات).
+    """
+    cursor = connection.cursor()
+    if fresh:
+        set_schema_version(cursor, LATEST_VERSION)
+        connection.commit()
+        return
+
+    current_version = get_schema_version(cursor)
+    for version, migration in MIGRATIONS:
+        if version <= current_version:
+            continue
+        try:
+            cursor.execute("BEGIN IMMEDIATE")
+            # جهاز آخر قد يكون طبّق الترحيل أثناء انتظار القفل
+            if get_schema_version(cursor) >= version:
+                connection.rollback()
+                continue
+            migration(cursor)
+            set_schema_version(cursor, version)
+            connection.commit()
+        except Exception:
+            connection.rollback()
+            raise
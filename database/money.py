@@ -0,0 +1,66 @@
+from decimal import Decimal, ROUND_HALF_UP
+
+# عدد الوحدات الصغرى في الوحدة (فلس/هللة/سنت)
+MINOR_UNITS = 100
+
+# الأعمدة المالية في كل جدول (تُخزن كأعداد صحيحة بالوحدات الصغرى)
+MONEY_COLUMNS = {
+    "Passports": ["booking_price", "purchase_price", "net_amount", "paid_amount", "remaining_amount"],
+    "Umrah": ["cost", "paid", "remaining_amount"],
+    "Trips": ["amount", "agent", "net_amount", "paid", "remaining_amount"],
+    "Payments": ["amount"],
+}
+
+
+def to_minor(value):
+    """
+    تحويل مبلغ (نص أو رقم) إلى عدد صحيح بالوحدات الصغرى بدون أخطاء الفاصلة العائمة.
+    """
+    if value is None or value == "":
+        return None
+    try:
+        amount = Decimal(str(value).strip())
+        # NaN واللانهاية ليست مبالغ
+        return int((amount * MINOR_UNITS).quantize(Decimal("1"), rounding=ROUND_HALF_UP))
+    except (ArithmeticError, ValueError):
+        raise ValueError(f"قيمة مالية غير صحيحة: {value}")
+
+
+def from_minor(minor):
+    """تحويل عدد صحيح بالوحدات الصغرى إلى مبلغ عشري (float) للعرض والتعديل."""
+    if minor is None or minor == "":
+        return minor
+    return float(Decimal(int(minor)) / MINOR_UNITS)
+
+
+def format_minor(minor):
+    """تنسيق مبلغ بالوحدات الصغرى كنص بمنزلتين عشريتين."""
+    if minor is None or minor == "":
+        return ""
+    return f"{Decimal(int(minor)) / MINOR_UNITS:.2f}"
+
+
+def money_sql(column):
+    """تعبير SQL لعرض عمود مالي بمنزلتين عشريتين."""
+    return f"printf('%.2f', {column} / {MINOR_UNITS}.0)"
+
+
+def convert_fields_to_minor(data, table_name):
+    """تحويل الحقول المالية في قاموس البيانات إلى الوحدات الصغرى قبل الحفظ."""
+    for column in MONEY_COLUMNS[table_name]:
+        if column in data:
+            data[column] = to_minor(data[column])
+    return data
+
+
+def row_from_minor(row, table_name, column_names):
+    """
+    تحويل الأعمدة المالية في صف (tuple) إلى مبالغ عشرية.
+
+    :param column_names: أسماء أعمدة الصف بالترتيب.
+    """
+    money_columns = MONEY_COLUMNS[table_name]
+    return tuple(
+        from_minor(value) if column in money_columns else value
+        for column, value in zip(column_names, row)
+    )
@@ -0,0 +1,48 @@
+import re
+
+# التشكيل والتطويل في النص العربي
+ARABIC_DIACRITICS = re.compile(r"[\u0610-\u061A\u064B-\u065F\u0670\u06D6-\u06ED\u0640]")
+
+# توحيد الحروف التي تُكتب بأكثر من شكل
+ARABIC_LETTER_MAP = str.maketrans({
+    "أ": "ا",
+    "إ": "ا",
+    "آ": "ا",
+    "ٱ": "ا",
+    "ة": "ه",
+    "ى": "ي",
+    "ؤ": "و",
+    "ئ": "ي",
+})
+
+WHITESPACE = re.compile(r"\s+")
+NON_ALNUM = re.compile(r"[^0-9A-Za-z]")
+NON_DIGITS = re.compile(r"\D")
+
+PHONE_LENGTH = 9
+
+
+def normalize_name(name):
+    """توحيد كتابة الاسم (إزالة التشكيل وتوحيد الألف والتاء المربوطة والمسافات)."""
+    if not name:
+        return ""
+    text = ARABIC_DIACRITICS.sub("", str(name))
+    text = text.translate(ARABIC_LETTER_MAP)
+    return WHITESPACE.sub(" ", text).strip().lower()
+
+
+def normalize_passport(passport_number):
+    """توحيد رقم الجواز: حروف كبيرة بدون مسافات أو رموز."""
+    if not passport_number:
+        return ""
+    return NON_ALNUM.sub("", str(passport_number)).upper()
+
+
+def normalize_phone(phone_number):
+    """توحيد رقم الهاتف: الأرقام فقط مع إزالة رمز الدولة (آخر 9 أرقام)."""
+    if not phone_number:
+        return ""
+    digits = NON_DIGITS.sub("", str(phone_number))
+    if len(digits) > PHONE_LENGTH:
+        digits = digits[-PHONE_LENGTH:]
+    return digits
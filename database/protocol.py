@@ -0,0 +1,84 @@
+import os
+import hmac
+import json
+import sqlite3
+import hashlib
+import ipaddress
+
+# بروتوكول خادم البيانات: رسالة JSON واحدة في كل سطر عبر TCP
+# الاستماع على هذا الجهاز فقط ما لم يُحدد عنوان الشبكة صراحة (مع كلمة سر مشتركة)
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_LINE = 16 * 1024 * 1024  # أقصى حجم للرسالة (نتائج الاستعلامات الكبيرة)
+
+# كلمة السر المشتركة بين الخادم والأجهزة (لا تُرسل عبر الشبكة، فقط إثبات HMAC لرقم عشوائي)
+SECRET_ENV = "TAIF_SERVER_SECRET"
+
+# أنواع الأخطاء المنقولة من الخادم وما يقابلها في العميل
+ERROR_TYPES = {
+    "auth": PermissionError,
+    "integrity": sqlite3.IntegrityError,
+    "operational": sqlite3.OperationalError,
+    "programming": sqlite3.ProgrammingError,
+    "database": sqlite3.DatabaseError,
+}
+
+
+class DataServerError(sqlite3.OperationalError):
+    """تعذر الاتصال بخادم البيانات أو انقطع الاتصال أثناء الطلب."""
+
+    def __init__(self, error):
+        super().__init__(f"تعذر الاتصال بخادم البيانات ({error})")
+
+
+def encode(message):
+    return (json.dumps(message, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def decode(line):
+    return json.loads(line.decode("utf-8"))
+
+
+def error_kind(error):
+    """تصنيف الخطأ لإعادة إنشائه بنفس النوع في العميل (الأنواع الأخص أولًا)."""
+    for kind, error_type in ERROR_TYPES.items():
+        if isinstance(error, error_type):
+            return kind
+    return "error"
+
+
+def raise_error(response):
+    error_type = ERROR_TYPES.get(response.get("kind"), RuntimeError)
+    raise error_type(response["error"])
+
+
+def server_secret():
+    """كلمة السر المشتركة من TAIF_SERVER_SECRET، أو None إذا لم تُحدد."""
+    return os.environ.get(SECRET_ENV, "").strip() or None
+
+
+def auth_proof(secret, nonce):
+    """إثبات معرفة كلمة السر للرقم العشوائي الذي أرسله الخادم لهذا الاتصال."""
+    return hmac.new(secret.encode("utf-8"), nonce.encode("utf-8"), hashlib.sha256).hexdigest()
+
+
+def check_proof(secret, nonce, proof):
+    return hmac.compare_digest(auth_proof(secret, nonce), str(proof or ""))
+
+
+def is_loopback(host):
+    """هل العنوان على هذا الجهاز فقط (لا يصل إليه أحد من الشبكة)؟"""
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(str(host)).is_loopback
+    except ValueError:
+        return False
+
+
+def parse_address(address, default_host="127.0.0.1"):
+    """تحويل "host:port" أو "host" إلى (host, port)."""
+    host, _, port = str(address).strip().rpartition(":")
+    if not host:
+        host, port = port, ""
+    return host or default_host, int(port) if port else DEFAULT_PORT
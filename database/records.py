@@ -0,0 +1,80 @@
+from collections import namedtuple
+from functools import lru_cache
+from database.money import MONEY_COLUMNS, from_minor
+
+
+class DebtRecord:
+    """
+    خصائص مشتركة لسجلات الخدمات التي عليها دين، بأسماء موحدة بدل فهرس العمود في كل جدول.
+    DATE_FIELD وPRICE_FIELD وPAID_FIELD تحدد أعمدة كل جدول.
+    """
+
+    __slots__ = ()
+
+    @property
+    def debt_date(self):
+        return getattr(self, self.DATE_FIELD)
+
+    @property
+    def total_amount(self):
+        return getattr(self, self.PRICE_FIELD)
+
+    @property
+    def paid_total(self):
+        return getattr(self, self.PAID_FIELD)
+
+
+# السجلات صفوف tuple بأسماء حقول (namedtuple بدون __dict__)، فتُنشأ مرة واحدة لكل صف
+# مباشرة من row_factory ويبقى الوصول بالفهرس ممكنًا
+class Passport(DebtRecord, namedtuple("Passport", [
+    "id", "name", "booking_date", "type", "booking_price", "purchase_price", "net_amount",
+    "paid_amount", "remaining_amount", "status", "receipt_date", "receiver_name", "currency", "customer_id",
+])):
+    __slots__ = ()
+    TABLE_NAME = "Passports"
+    DATE_FIELD, PRICE_FIELD, PAID_FIELD = "booking_date", "booking_price", "paid_amount"
+
+
+class Umrah(DebtRecord, namedtuple("Umrah", [
+    "id", "name", "passport_number", "phone_number", "sponsor_name", "sponsor_number", "cost", "paid",
+    "remaining_amount", "entry_date", "exit_date", "status", "currency", "customer_id",
+])):
+    __slots__ = ()
+    TABLE_NAME = "Umrah"
+    DATE_FIELD, PRICE_FIELD, PAID_FIELD = "entry_date", "cost", "paid"
+
+
+class Trip(DebtRecord, namedtuple("Trip", [
+    "id", "name", "passport_number", "from_place", "to_place", "booking_company", "amount", "currency",
+    "agent", "net_amount", "trip_date", "office_name", "paid", "remaining_amount", "customer_id",
+])):
+    __slots__ = ()
+    TABLE_NAME = "Trips"
+    DATE_FIELD, PRICE_FIELD, PAID_FIELD = "trip_date", "amount", "paid"
+
+
+class Payment(namedtuple("Payment", [
+    "id", "debt_type", "debt_id", "amount", "payment_date", "payment_method", "currency",
+])):
+    __slots__ = ()
+    TABLE_NAME = "Payments"
+
+
+RECORD_CLASSES = {record_class.TABLE_NAME: record_class for record_class in (Passport, Umrah, Trip, Payment)}
+
+
+@lru_cache(maxsize=None)
+def record_factory(record_class, money=True):
+    """
+    row_factory لـ sqlite3 يُنشئ السجل مباشرة من صف الاستعلام (بأعمدة record_class._fields بالترتيب).
+    :param money: تحويل الأعمدة المالية من الوحدات الصغرى إلى مبالغ عشرية.
+    """
+    make = record_class._make
+    money_columns = MONEY_COLUMNS.get(record_class.TABLE_NAME, ()) if money else ()
+    converters = [from_minor if field in money_columns else None for field in record_class._fields]
+    if not any(converters):
+        return lambda cursor, row: make(row)
+
+    def factory(cursor, row):
+        return make(value if convert is None else convert(value) for convert, value in zip(converters, row))
+    return factory
@@ -0,0 +1,328 @@
+import time
+import uuid
+import logging
+import socket
+import sqlite3
+import threading
+from database.database_manager import DatabaseManager
+from database.cache import RecordCache
+from database.events import get_event_bus, ChangeEvent, UPDATE
+from database.protocol import (
+    SECRET_ENV, encode, decode, raise_error, parse_address, server_secret, auth_proof, DataServerError,
+)
+
+POOL_SIZE = 4
+CONNECT_TIMEOUT = 5
+REQUEST_TIMEOUT = 60  # المعاملة قد تنتظر دورها خلف معاملات الأجهزة الأخرى
+RECONNECT_DELAY = 2
+
+# الجداول التي يُعاد تحميلها بعد انقطاع قناة الأحداث (قد تكون فاتتنا تغييرات)
+SYNC_TABLES = ("Customers", "Passports", "Umrah", "Trips", "Payments", "ExchangeRates")
+
+READ_STATEMENTS = ("SELECT", "PRAGMA", "WITH", "EXPLAIN", "VALUES")
+
+# معرف هذه العملية لدى الخادم حتى لا تُعاد إليها أحداثها
+CLIENT_ID = uuid.uuid4().hex
+
+logger = logging.getLogger(__name__)
+
+
+def event_to_message(event):
+    return {"table": event.table, "ids": None if event.ids is None else sorted(event.ids), "operation": event.operation}
+
+
+def event_from_message(message):
+    ids = message.get("ids")
+    return ChangeEvent(message["table"], None if ids is None else frozenset(ids), message.get("operation", UPDATE))
+
+
+class ServerConnection:
+    """اتصال TCP واحد بخادم البيانات (طلب ثم رد)."""
+
+    def __init__(self, address):
+        try:
+            self.socket = socket.create_connection(address, timeout=CONNECT_TIMEOUT)
+        except OSError as e:
+            raise DataServerError(e) from e
+        self.socket.settimeout(REQUEST_TIMEOUT)
+        self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.stream = self.socket.makefile("rwb")
+        self.broken = False
+        try:
+            self.handshake()
+        except Exception:
+            self.close()
+            raise
+
+    def handshake(self):
+        """إثبات معرفة كلمة السر المشتركة إذا طلبها الخادم (قبل أي طلب آخر على الاتصال)."""
+        hello = self.request({"op": "hello"})
+        if not hello.get("auth"):
+            return
+        secret = server_secret()
+        if not secret:
+            raise PermissionError(f"خادم البيانات يتطلب كلمة السر المشتركة في {SECRET_ENV}")
+        self.request({"op": "auth", "proof": auth_proof(secret, hello["nonce"])})
+
+    def send(self, message):
+        self.stream.write(encode(message))
+        self.stream.flush()
+
+    def receive(self):
+        line = self.stream.readline()
+        if not line:
+            raise ConnectionError("الخادم أغلق الاتصال")
+        return decode(line)
+
+    def request(self, message):
+        try:
+            self.send(message)
+            response = self.receive()
+        except (OSError, ValueError) as e:
+            self.broken = True
+            raise DataServerError(e) from e
+        if "error" in response:
+            raise_error(response)
+        return response.get("result")
+
+    def close(self):
+        try:
+            self.stream.close()
+            self.socket.close()
+        except OSError:
+            pass
+
+
+class ConnectionPool:
+    """مجموعة اتصالات مشتركة بين خيوط البرنامج؛ عدد الاتصالات المفتوحة لا يتجاوز size."""
+
+    def __init__(self, address, size=POOL_SIZE):
+        self.address = address
+        self.idle = []
+        self.lock = threading.Lock()
+        self.slots = threading.BoundedSemaphore(size)
+
+    def acquire(self):
+        self.slots.acquire()
+        with self.lock:
+            if self.idle:
+                return self.idle.pop()
+        try:
+            return ServerConnection(self.address)
+        except Exception:
+            self.slots.release()
+            raise
+
+    def release(self, connection):
+        if connection.broken:
+            connection.close()
+        else:
+            with self.lock:
+                self.idle.append(connection)
+        self.slots.release()
+
+    def request(self, message, retry=False):
+        """
+        تنفيذ طلب على أي اتصال متاح.
+        :param retry: إعادة الطلب مرة على اتصال جديد إذا انقطع الاتصال الخامل (آمن للقراءات فقط).
+        """
+        for attempt in range(2 if retry else 1):
+            connection = self.acquire()
+            try:
+                return connection.request(message)
+            except DataServerError:
+                if attempt or not retry:
+                    raise
+            finally:
+                self.release(connection)
+
+    def close(self):
+        with self.lock:
+            idle, self.idle = self.idle, []
+        for connection in idle:
+            connection.close()
+
+
+class EventListener(threading.Thread):
+    """
+    قناة دائمة تستقبل أحداث التغيير من الأجهزة الأخرى عبر الخادم وتنشرها على ناقل الأحداث المحلي،
+    فتتحدث الشاشات والذاكرات المؤقتة كما لو كان التغيير من نفس الجهاز.
+    """
+
+    def __init__(self, address):
+        super().__init__(name="taif-events", daemon=True)
+        self.address = address
+        self.connected = False
+        self.version = 0
+
+    def data_version(self):
+        # أثناء الانقطاع لا تصل الأحداث، فتتغير القيمة في كل مرة ولا يُعتمد على الذاكرة المؤقتة
+        if not self.connected:
+            self.version += 1
+        return self.version
+
+    def run(self):
+        bus = get_event_bus()
+        reconnect = False
+        while True:
+            connection = None
+            try:
+                connection = ServerConnection(self.address)
+                connection.send({"op": "subscribe", "client": CLIENT_ID})
+                connection.socket.settimeout(None)
+                self.version += 1
+                self.connected = True
+                if reconnect:
+                    for table in SYNC_TABLES:
+                        bus.dispatch(ChangeEvent(table, None, UPDATE))
+                while True:
+                    for message in connection.receive().get("events", ()):
+                        bus.dispatch(event_from_message(message))
+            except (OSError, ValueError, sqlite3.Error) as e:
+                if self.connected:
+                    logger.warning("Data server events disconnected: %s", e)
+            finally:
+                self.connected = False
+                if connection is not None:
+                    connection.close()
+            reconnect = True
+            time.sleep(RECONNECT_DELAY)
+
+
+_pools = {}
+_listeners = {}
+_shared_lock = threading.Lock()
+
+
+def get_pool(address):
+    """مجموعة الاتصالات المشتركة لعنوان الخادم (تُنشأ عند أول استخدام)."""
+    with _shared_lock:
+        if address not in _pools:
+            _pools[address] = ConnectionPool(address)
+        return _pools[address]
+
+
+def get_listener(address):
+    """قناة الأحداث المشتركة لعنوان الخادم (تبدأ عند أول استخدام)."""
+    with _shared_lock:
+        if address not in _listeners:
+            _listeners[address] = EventListener(address)
+            _listeners[address].start()
+        return _listeners[address]
+
+
+class RemoteCursor:
+    """بديل sqlite3.Cursor بما تستخدمه الخدمات: execute وfetchone وfetchall وrowcount وlastrowid."""
+
+    def __init__(self, db_manager):
+        self.db_manager = db_manager
+        self.rows = []
+        self.rowcount = -1
+        self.lastrowid = None
+
+    def execute(self, query, params=()):
+        with self.db_manager.lock:
+            if query.lstrip().split(None, 1)[0].upper() in READ_STATEMENTS:
+                self.rows = self.db_manager.execute_read_query(query, params)
+                self.rowcount = -1
+            else:
+                result = self.db_manager.request({"op": "execute", "query": query, "params": list(params)})
+                self.rows = []
+                self.rowcount = result["rowcount"]
+                self.lastrowid = result["lastrowid"]
+        return self
+
+    def fetchone(self):
+        return self.rows.pop(0) if self.rows else None
+
+    def fetchall(self):
+        rows, self.rows = self.rows, []
+        return rows
+
+
+class RemoteDatabaseManager(DatabaseManager):
+    """
+    نفس واجهة DatabaseManager عبر خادم البيانات (database/server.py) بدل فتح ملف SQLite،
+    فتعمل الخدمات دون تعديل على أي من الطرفين.
+
+    الجداول والترحيل يتولاها الخادم. المعاملة تحجز اتصالًا من المجموعة حتى الحفظ أو التراجع،
+    وخارجها تُرسل كل كتابة منفردة ويجمعها الخادم مع كتابات الأجهزة الأخرى.
+    """
+
+    def __init__(self, address):
+        self.address = parse_address(address)
+        self.db_path = None
+        self.connection = None
+        self.pool = get_pool(self.address)
+        self.events = get_listener(self.address)
+        self.session = None  # اتصال الخادم المحجوز للمعاملة الحالية
+        self.cursor = RemoteCursor(self)
+        self.lock = threading.RLock()
+        self.transaction_depth = 0
+        self.busy_retries = 0
+        self.pending_events = []
+        self.column_names = {}
+        self.cache = RecordCache(self)
+
+    def request(self, message, retry=False):
+        with self.lock:
+            if self.session is not None:
+                return self.session.request(message)
+        return self.pool.request(message, retry)
+
+    def execute_query(self, query, params=()):
+        self.cursor.execute(query, params)
+
+    def execute_read_query(self, query, params=()):
+        with self.lock:
+            rows = self.request({"op": "query", "query": query, "params": list(params)}, retry=True)
+        return [tuple(row) for row in rows]
+
+    def query_records(self, query, params, factory):
+        # الصفوف تصل من الخادم كقوائم، فيُبنى السجل من كل صف بنفس الدالة
+        return [factory(None, row) for row in self.execute_read_query(query, params)]
+
+    def begin_transaction(self):
+        connection = self.pool.acquire()
+        try:
+            connection.request({"op": "begin"})
+        except Exception:
+            self.pool.release(connection)
+            raise
+        self.session = connection
+
+    def commit_transaction(self):
+        self.session.request({"op": "commit"})
+        self.end_session()
+
+    def rollback_transaction(self):
+        try:
+            self.session.request({"op": "rollback"})
+        except Exception:
+            pass  # الخادم يتراجع تلقائيًا إذا فشل الحفظ أو انقطع الاتصال
+        finally:
+            self.end_session()
+
+    def end_session(self):
+        connection, self.session = self.session, None
+        self.pool.release(connection)
+
+    def dispatch_events(self, events):
+        super().dispatch_events(events)
+        if not events:
+            return
+        try:
+            self.pool.request({"op": "publish", "client": CLIENT_ID, "events": [event_to_message(e) for e in events]})
+        except Exception:
+            logger.exception("Failed to send change events to data server")
+
+    def data_version(self):
+        return self.events.data_version()
+
+    def ping(self):
+        """إحصائيات الخادم (للتحقق من الاتصال)."""
+        return self.pool.request({"op": "ping"}, retry=True)
+
+    def close(self):
+        # الاتصالات مشتركة بين جميع الخدمات في البرنامج
+        pass
@@ -0,0 +1,101 @@
+import threading
+import weakref
+from database.events import get_event_bus
+from database.SearchManager import EXACT, LIKE_WILDCARDS
+
+
+class SearchSession:
+    """
+    ذاكرة البحث أثناء الكتابة لشاشة واحدة.
+
+    عندما يطيل المستخدم نص البحث ("محم" ثم "محمد") تكون النتيجة جزءًا من النتيجة السابقة،
+    فتُصفّى الصفوف المحفوظة في الذاكرة بمفتاح البحث لكل صف بدل استعلام جديد.
+    يُعاد الاستعلام عند تقصير النص أو تغير نمط البحث، أو عند تغير البيانات
+    (أحداث الكتابة على جداول الشاشة أو data_version من الأجهزة الأخرى).
+    """
+
+    def __init__(self, search, search_manager, columns, tables, limit=None, order=None):
+        """
+        :param search: دالة (النص) -> قائمة (الصف، مفتاح البحث)، مثل search_with_keys في الخدمات.
+        :param search_manager: SearchManager الخاص بالخدمة (لنفس قواعد اختيار النمط).
+        :param columns: أعمدة البحث في الشاشة.
+        :param tables: الجداول التي تُبطل الذاكرة عند تغيرها.
+        :param limit: الحد الأقصى لنتائج search إن وجد؛ النتيجة المقطوعة لا تُصفّى.
+        :param order: دالة (الصف، درجة الصلة) -> مفتاح ترتيب تنازلي للنتائج المرتبة بالصلة.
+        """
+        self.search_func = search
+        self.search_manager = search_manager
+        self.db_manager = search_manager.db_manager
+        self.columns = columns
+        self.limit = limit
+        self.order = order
+        self.lock = threading.Lock()
+        self.base = None  # (النص، النمط، data_version، [(الصف، المفتاح)]، كاملة؟)
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+
+        session_ref = weakref.ref(self)
+
+        def on_change(event):
+            session = session_ref()
+            if session is not None:
+                session.clear()
+
+        bus = get_event_bus()
+        weakref.finalize(self, bus.unsubscribe, bus.subscribe(on_change, tables))
+
+    def refine(self, search_term):
+        """
+        نتيجة البحث من الذاكرة إذا كان النص امتدادًا لنص سابق، وإلا None (يجب استدعاء search).
+        """
+        _, term, mode = self.search_manager.resolve_mode(self.columns, search_term)
+        with self.lock:
+            base = self.base
+        if base is None:
+            return None
+        base_term, base_mode, version, entries, complete = base
+
+        if mode != base_mode or version != self.db_manager.data_version():
+            return None
+        if term != base_term:
+            # المطابقة التامة لنص أطول ليست جزءًا من نتيجة النص الأقصر، ورموز LIKE لها معنى مختلف
+            if not complete or mode == EXACT or not term.startswith(base_term):
+                return None
+            if any(wildcard in term for wildcard in LIKE_WILDCARDS):
+                return None
+            entries = [(row, key) for row, key in entries if self.search_manager.key_matches(key, term, mode)]
+            if self.order is not None:
+                entries.sort(key=lambda entry: self.order(entry[0], self.search_manager.key_score(entry[1], term)), reverse=True)
+
+        with self.lock:
+            if self.base is base:
+                # النص التالي يُصفّى من هذه النتيجة الأصغر
+                self.base = (term, mode, version, entries, complete)
+            self.hits += 1
+        return [row for row, _ in entries]
+
+    def search(self, search_term):
+        """تنفيذ البحث في قاعدة البيانات وحفظ النتيجة لتصفية النصوص التالية."""
+        _, term, mode = self.search_manager.resolve_mode(self.columns, search_term)
+        with self.lock:
+            generation = self.generation
+            self.misses += 1
+        version = self.db_manager.data_version()
+        entries = self.search_func(search_term)
+        complete = self.limit is None or len(entries) < self.limit
+        # نتائج البحث التقريبي (بلا مفتاح) ليست جزءًا ثابتًا من نتيجة النص الأطول
+        complete = complete and all(key is not None for _, key in entries)
+        with self.lock:
+            # نتيجة قُرئت قبل تغيير البيانات لا تُحفظ
+            if generation == self.generation:
+                self.base = (term, mode, version, entries, complete)
+        return [row for row, _ in entries]
+
+    def clear(self):
+        with self.lock:
+            self.generation += 1
+            self.base = None
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses}
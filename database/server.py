@@ -0,0 +1,334 @@
+import asyncio
+import logging
+import secrets
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from database.database_manager import DatabaseManager
+from database.connection import connect, retry_on_busy
+from database.protocol import (
+    DEFAULT_HOST, DEFAULT_PORT, MAX_LINE, SECRET_ENV, encode, decode, error_kind,
+    server_secret, check_proof, is_loopback,
+)
+
+BATCH_SIZE = 200      # أقصى عدد عبارات كتابة في معاملة واحدة
+READER_THREADS = 4    # اتصالات القراءة المتزامنة (WAL يسمح بالقراءة أثناء الكتابة)
+SESSION_TIMEOUT = 30  # ثوانٍ؛ معاملة عميل متوقف يُتراجع عنها حتى لا يبقى قفل الكتابة محجوزًا
+
+logger = logging.getLogger(__name__)
+
+# العملاء يقرؤون البيانات ويكتبونها فقط: لا تغيير للبنية ولا ربط ملفات (ATTACH) ولا تغيير للإعدادات.
+# الترحيل والأرشفة والنسخ الاحتياطي تُنفذ على جهاز الخادم نفسه.
+CLIENT_ACTIONS = {
+    sqlite3.SQLITE_SELECT, sqlite3.SQLITE_READ, sqlite3.SQLITE_INSERT, sqlite3.SQLITE_UPDATE,
+    sqlite3.SQLITE_DELETE, sqlite3.SQLITE_FUNCTION, sqlite3.SQLITE_TRANSACTION,
+    sqlite3.SQLITE_SAVEPOINT, sqlite3.SQLITE_RECURSIVE,
+}
+WRITE_ACTIONS = {sqlite3.SQLITE_INSERT, sqlite3.SQLITE_UPDATE, sqlite3.SQLITE_DELETE}
+# أوامر PRAGMA للقراءة فقط، والتي تأخذ اسم جدول أو فهرس كوسيط
+READ_PRAGMAS = {"data_version", "user_version"}
+TABLE_PRAGMAS = {"table_info", "table_xinfo", "index_list", "index_info"}
+
+
+def client_authorizer(action, arg1, arg2, db_name, trigger):
+    """set_authorizer لاتصالات الخادم: تُرفض أي عبارة من العميل خارج قراءة البيانات وكتابتها."""
+    if action == sqlite3.SQLITE_PRAGMA:
+        if arg1 in TABLE_PRAGMAS or (arg1 in READ_PRAGMAS and arg2 is None):
+            return sqlite3.SQLITE_OK
+        return sqlite3.SQLITE_DENY
+    if action in WRITE_ACTIONS and str(arg1).lower().startswith("sqlite_"):
+        return sqlite3.SQLITE_DENY  # جداول النظام
+    return sqlite3.SQLITE_OK if action in CLIENT_ACTIONS else sqlite3.SQLITE_DENY
+
+
+class Session:
+    """معاملة مفتوحة من عميل واحد: الكاتب ينفذ طلباتها وحدها حتى الحفظ أو التراجع."""
+
+    def __init__(self):
+        self.requests = asyncio.Queue()
+        self.started = asyncio.get_running_loop().create_future()
+        self.closed = False
+
+
+class DataServer:
+    """
+    خادم البيانات المحلي: الجهاز الوحيد الذي يفتح taif.db، والأجهزة الأخرى تتصل به عبر الشبكة
+    (database/remote.py) بدل مشاركة الملف.
+
+    - القراءات تُنفذ بالتوازي على اتصالات قراءة فقط.
+    - الكتابات تمر عبر كاتب واحد يجمع ما تراكم منها في معاملة واحدة (حفظ جماعي)،
+      وكل عبارة داخل نقطة حفظ (SAVEPOINT) فلا يُلغي فشلها بقية الدفعة.
+    - معاملات العملاء (transaction) تُنفذ على الكاتب بالترتيب مع الدفعات.
+    - أحداث التغيير من كل عميل تُرسل إلى بقية العملاء المشتركين.
+    - كل اتصال يثبت معرفة كلمة السر المشتركة (TAIF_SERVER_SECRET) قبل أي طلب، وهي
+      إلزامية إذا كان الاستماع على عنوان في الشبكة.
+    """
+
+    def __init__(self, db_name="taif.db", host=DEFAULT_HOST, port=DEFAULT_PORT,
+                 batch_size=BATCH_SIZE, readers=READER_THREADS, secret=None):
+        self.secret = secret or server_secret()
+        if not self.secret and not is_loopback(host):
+            raise ValueError(f"الاستماع على {host} يتطلب كلمة سر مشتركة في {SECRET_ENV}")
+        # إنشاء الجداول والترحيل عند التشغيل؛ اتصال هذا المدير يستخدمه الكاتب فقط
+        self.db_manager = DatabaseManager(db_name)
+        self.connection = self.db_manager.connection
+        self.connection.set_authorizer(client_authorizer)
+        self.host = host
+        self.port = port
+        self.batch_size = batch_size
+        self.writer_thread = ThreadPoolExecutor(1, thread_name_prefix="taif-writer")
+        self.reader_threads = ThreadPoolExecutor(readers, thread_name_prefix="taif-reader")
+        self.readers = threading.local()
+        self.writes = None  # طابور الكاتب (يُنشأ داخل حلقة asyncio)
+        self.subscribers = {}  # قناة العميل -> معرف العميل
+        self.stats = {"reads": 0, "writes": 0, "batches": 0, "sessions": 0}
+
+    # ----- التنفيذ على قاعدة البيانات (في خيوط منفصلة) -----
+
+    def reader_connection(self):
+        connection = getattr(self.readers, "connection", None)
+        if connection is None:
+            connection = connect(self.db_manager.db_path)
+            # الكتابة عبر الكاتب الوحيد فقط
+            connection.execute("PRAGMA query_only = ON")
+            connection.set_authorizer(client_authorizer)
+            self.readers.connection = connection
+        return connection
+
+    def read(self, query, params):
+        return retry_on_busy(lambda: self.reader_connection().execute(query, params).fetchall())
+
+    def write_batch(self, batch):
+        """
+        تنفيذ دفعة عبارات كتابة في معاملة واحدة.
+        :return: لكل عبارة إما {"rowcount", "lastrowid"} أو الخطأ الذي حدث فيها.
+        """
+        results = []
+        retry_on_busy(lambda: self.connection.execute("BEGIN IMMEDIATE"))
+        try:
+            for query, params in batch:
+                self.connection.execute("SAVEPOINT request")
+                try:
+                    cursor = self.connection.execute(query, params)
+                    results.append({"rowcount": cursor.rowcount, "lastrowid": cursor.lastrowid})
+                except sqlite3.Error as e:
+                    self.connection.execute("ROLLBACK TO request")
+                    results.append(e)
+                self.connection.execute("RELEASE request")
+            retry_on_busy(self.connection.commit)
+        except Exception:
+            self.connection.rollback()
+            raise
+        return results
+
+    def begin_session(self):
+        retry_on_busy(lambda: self.connection.execute("BEGIN IMMEDIATE"))
+
+    def session_step(self, op, query, params):
+        if op == "query":
+            return self.connection.execute(query, params).fetchall()
+        if op == "execute":
+            cursor = self.connection.execute(query, params)
+            return {"rowcount": cursor.rowcount, "lastrowid": cursor.lastrowid}
+        if op == "commit":
+            try:
+                retry_on_busy(self.connection.commit)
+            except Exception:
+                self.connection.rollback()
+                raise
+            return None
+        self.connection.rollback()
+        return None
+
+    # ----- الكاتب الوحيد -----
+
+    async def run_writer(self):
+        loop = asyncio.get_running_loop()
+        pending = None
+        while True:
+            item = pending or await self.writes.get()
+            pending = None
+            if isinstance(item, Session):
+                await self.run_session(item)
+                continue
+
+            # كل ما تراكم أثناء تنفيذ الدفعة السابقة يُحفظ معًا، حتى أول معاملة عميل
+            batch = [item]
+            while len(batch) < self.batch_size and not self.writes.empty():
+                item = self.writes.get_nowait()
+                if isinstance(item, Session):
+                    pending = item
+                    break
+                batch.append(item)
+
+            try:
+                results = await loop.run_in_executor(
+                    self.writer_thread, self.write_batch, [(query, params) for query, params, _ in batch]
+                )
+            except Exception as e:
+                results = [e] * len(batch)
+            self.stats["batches"] += 1
+            self.stats["writes"] += len(batch)
+            for (_, _, future), result in zip(batch, results):
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+    async def run_session(self, session):
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(self.writer_thread, self.begin_session)
+        except Exception as e:
+            session.closed = True
+            session.started.set_exception(e)
+            return
+        session.started.set_result(None)
+        self.stats["sessions"] += 1
+
+        while True:
+            try:
+                op, query, params, future = await asyncio.wait_for(session.requests.get(), SESSION_TIMEOUT)
+            except asyncio.TimeoutError:
+                session.closed = True
+                await loop.run_in_executor(self.writer_thread, self.connection.rollback)
+                return
+            try:
+                result = await loop.run_in_executor(self.writer_thread, self.session_step, op, query, params)
+                if not future.done():
+                    future.set_result(result)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            if op in ("commit", "rollback"):
+                session.closed = True
+                return
+
+    # ----- الطلبات -----
+
+    async def handle_request(self, request, session):
+        """
+        تنفيذ طلب واحد.
+        :return: (النتيجة، المعاملة المفتوحة لهذا العميل بعد الطلب).
+        """
+        loop = asyncio.get_running_loop()
+        op = request.get("op")
+        query = request.get("query", "")
+        params = request.get("params") or ()
+
+        if op == "begin":
+            if session is not None:
+                raise sqlite3.ProgrammingError("توجد معاملة مفتوحة بالفعل")
+            session = Session()
+            self.writes.put_nowait(session)
+            await session.started
+            return None, session
+
+        if op in ("query", "execute", "commit", "rollback") and session is not None:
+            if session.closed:
+                raise sqlite3.OperationalError("انتهت مهلة المعاملة وتم التراجع عنها")
+            future = loop.create_future()
+            session.requests.put_nowait((op, query, params, future))
+            result = await future
+            return result, None if op in ("commit", "rollback") else session
+
+        if op in ("commit", "rollback"):
+            raise sqlite3.ProgrammingError("لا توجد معاملة مفتوحة")
+        if op == "query":
+            self.stats["reads"] += 1
+            return await loop.run_in_executor(self.reader_threads, self.read, query, params), None
+        if op == "execute":
+            future = loop.create_future()
+            self.writes.put_nowait((query, params, future))
+            return await future, None
+        if op == "publish":
+            self.broadcast(request.get("client"), request.get("events", []))
+            return None, None
+        if op == "ping":
+            return dict(self.stats, clients=len(self.subscribers)), None
+        raise sqlite3.ProgrammingError(f"عملية غير معروفة: {op}")
+
+    def broadcast(self, origin, events):
+        """إرسال أحداث التغيير إلى جميع العملاء المشتركين عدا العميل الذي أحدثها."""
+        message = encode({"events": events})
+        for writer, client in list(self.subscribers.items()):
+            if client == origin:
+                continue
+            if writer.is_closing():
+                self.subscribers.pop(writer, None)
+                continue
+            writer.write(message)
+
+    def authenticate(self, request, nonce):
+        """
+        رد طلبات المصافحة: hello يعطي رقمًا عشوائيًا جديدًا لهذا الاتصال، وauth يتحقق من إثبات HMAC له.
+        :return: (الرد، الرقم العشوائي، هل تم التحقق).
+        """
+        if request.get("op") == "hello":
+            nonce = secrets.token_hex(16)
+            return {"result": {"nonce": nonce, "auth": self.secret is not None}}, nonce, self.secret is None
+        if request.get("op") == "auth" and nonce is not None and check_proof(self.secret, nonce, request.get("proof")):
+            return {"result": None}, None, True
+        return {"error": "كلمة سر خادم البيانات غير صحيحة أو لم تُرسل", "kind": "auth"}, None, False
+
+    async def handle_client(self, reader, writer):
+        session = None
+        nonce = None
+        authenticated = self.secret is None
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                request = decode(line)
+                if request.get("op") in ("hello", "auth") or not authenticated:
+                    response, nonce, authenticated = self.authenticate(request, nonce)
+                    writer.write(encode(response))
+                    await writer.drain()
+                    if "error" in response:
+                        break  # لا فرصة ثانية على نفس الاتصال
+                    continue
+                if request.get("op") == "subscribe":
+                    # قناة الأحداث لا ترسل طلبات أخرى؛ تبقى مفتوحة حتى يغلقها العميل
+                    self.subscribers[writer] = request.get("client")
+                    continue
+                try:
+                    result, session = await self.handle_request(request, session)
+                    response = {"result": result}
+                except Exception as e:
+                    if session is not None and session.closed:
+                        session = None
+                    response = {"error": str(e), "kind": error_kind(e)}
+                writer.write(encode(response))
+                await writer.drain()
+        except ConnectionError:
+            pass  # أُغلق البرنامج على الجهاز الآخر
+        except (ValueError, asyncio.LimitOverrunError) as e:
+            logger.warning("Data server client error: %s", e)
+        finally:
+            self.subscribers.pop(writer, None)
+            if session is not None and not session.closed:
+                # انقطع العميل في منتصف المعاملة
+                session.requests.put_nowait(("rollback", "", (), asyncio.get_running_loop().create_future()))
+            writer.close()
+
+    async def serve(self, ready=None):
+        """
+        تشغيل الخادم حتى الإيقاف.
+        :param ready: دالة تُستدعى بالعنوان الفعلي (host, port) بعد بدء الاستماع.
+        """
+        self.writes = asyncio.Queue()
+        server = await asyncio.start_server(self.handle_client, self.host, self.port, limit=MAX_LINE)
+        writer_task = asyncio.create_task(self.run_writer())
+        if ready:
+            ready(server.sockets[0].getsockname()[:2])
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            writer_task.cancel()
+
+    def run(self, ready=None):
+        asyncio.run(self.serve(ready))
@@ -0,0 +1,176 @@
+import bisect
+import logging
+import threading
+import weakref
+from database.events import get_event_bus, VersionWatch, INSERT
+from database.executor import get_executor
+from database.normalization import normalize_name
+
+# الأعمدة النصية الحرة التي تُقترح قيمها أثناء الكتابة في النماذج
+SUGGESTION_COLUMNS = {
+    "Trips": ("from_place", "to_place", "booking_company", "office_name"),
+    "Umrah": ("sponsor_name",),
+}
+
+SUGGESTION_LIMIT = 10
+
+logger = logging.getLogger(__name__)
+
+
+class ColumnValues:
+    """القيم المختلفة لعمود واحد مع عدد مرات استخدامها، مرتبة بالنص الموحد للبحث بالبادئة."""
+
+    def __init__(self, counts):
+        self.counts = {}
+        self.keys = []     # (النص الموحد، القيمة) مرتبة
+        for value, count in counts:
+            self.add(value, count)
+
+    def add(self, value, count=1):
+        if value is None or not str(value).strip():
+            return
+        value = str(value)
+        if value not in self.counts:
+            bisect.insort(self.keys, (normalize_name(value), value))
+            self.counts[value] = 0
+        self.counts[value] += count
+
+    def suggest(self, prefix, limit):
+        """القيم التي تبدأ بالنص (بعد التوحيد)، الأكثر استخدامًا أولًا."""
+        prefix = normalize_name(prefix)
+        start = bisect.bisect_left(self.keys, (prefix,))
+        matches = []
+        for key, value in self.keys[start:]:
+            if not key.startswith(prefix):
+                break
+            matches.append(value)
+        matches.sort(key=lambda value: (-self.counts[value], value))
+        return matches[:limit]
+
+
+class ValueSuggestions:
+    """
+    اقتراحات القيم النصية الحرة (المدن، شركات الطيران، المكاتب، الكفلاء) من القيم المستخدمة سابقًا،
+    حتى تُكتب القيمة نفسها بنفس الإملاء في كل مرة ولا تتفرق التقارير.
+
+    تُحمّل قيم كل جدول (SELECT col, COUNT(*) ... GROUP BY col) في خيط قاعدة البيانات،
+    والاقتراح أثناء الكتابة من الذاكرة فقط دون أي استعلام ولا انتظار للتحميل.
+    أحداث التغيير تُجدول التحديث في الخلفية: الإضافات تُحدّث العدد من السجلات الجديدة فقط،
+    والتعديل والحذف (لا تُعرف القيم القديمة) يعيدان تحميل الجدول، وتُعرض القيم السابقة حتى ينتهي.
+    تغير data_version دون أحداث تفسره (كتابة من برنامج آخر) يُفحص عند فتح النموذج (preload).
+    """
+
+    def __init__(self, db_manager, columns=SUGGESTION_COLUMNS):
+        self.db_manager = db_manager
+        self.columns = columns
+        self.lock = threading.RLock()  # لا يُحجز أثناء الاستعلامات
+        self.tables = {}      # الجدول -> {العمود: ColumnValues}
+        self.pending = {}     # الجدول -> معرفات سجلات أضيفت ولم تُحسب بعد (None = إعادة التحميل)
+        self.scheduled = set()  # جداول لها تحديث مجدول في خيط قاعدة البيانات
+        self.versions = VersionWatch()
+
+        suggestions_ref = weakref.ref(self)
+
+        def on_change(event):
+            suggestions = suggestions_ref()
+            if suggestions is not None:
+                suggestions.on_change(event)
+
+        bus = get_event_bus()
+        weakref.finalize(self, bus.unsubscribe, bus.subscribe(on_change, list(columns)))
+
+    def on_change(self, event):
+        with self.lock:
+            if event.table not in self.tables:
+                return
+            inserted = self.pending.get(event.table, set())
+            if event.operation == INSERT and event.ids is not None and inserted is not None:
+                self.pending[event.table] = inserted | event.ids
+            else:
+                self.pending[event.table] = None
+            self.schedule(event.table)
+
+    def schedule(self, table):
+        """تحديث الجدول في خيط قاعدة البيانات (مرة واحدة مهما تكررت الأحداث قبل تنفيذه)."""
+        with self.lock:
+            if table not in self.scheduled:
+                self.scheduled.add(table)
+                get_executor().submit(self.update_table, table)
+
+    def load(self, table):
+        values = {}
+        for column in self.columns[table]:
+            values[column] = ColumnValues(self.db_manager.execute_read_query(
+                f"SELECT {column}, COUNT(*) FROM {table} WHERE {column} IS NOT NULL AND {column} != '' GROUP BY {column}"
+            ))
+        return values
+
+    def inserted_rows(self, table, ids):
+        ids = list(ids)
+        return self.db_manager.execute_read_query(
+            f"SELECT {', '.join(self.columns[table])} FROM {table} WHERE id IN ({', '.join('?' * len(ids))})", tuple(ids)
+        )
+
+    def update_table(self, table):
+        """تطبيق التغييرات المعلقة للجدول؛ الاستعلام خارج القفل، والقيم الجديدة تُستبدل بعده."""
+        try:
+            with self.lock:
+                self.scheduled.discard(table)
+                ids = self.pending.pop(table, None) if table in self.tables else None
+            if ids:
+                rows = self.inserted_rows(table, ids)
+                with self.lock:
+                    for row in rows:
+                        for column, value in zip(self.columns[table], row):
+                            self.tables[table][column].add(value)
+            elif ids is None:
+                values = self.load(table)
+                with self.lock:
+                    self.tables[table] = values
+        except Exception:
+            logger.exception("Failed to load suggestions for %s", table)
+
+    def column_values(self, table, column):
+        """قيم العمود من الذاكرة؛ إذا لم يُحمّل الجدول بعد يُجدول تحميله وتُرجع قائمة فارغة."""
+        with self.lock:
+            values = self.tables.get(table)
+            if values is None:
+                self.schedule(table)
+                return ColumnValues(())
+            return values[column]
+
+    def suggest(self, table, column, prefix, limit=SUGGESTION_LIMIT):
+        """
+        اقتراحات للعمود تبدأ بالنص المكتوب، الأكثر استخدامًا أولًا.
+        :param prefix: النص المكتوب (فارغ = أكثر القيم استخدامًا).
+        """
+        if column not in self.columns.get(table, ()):
+            raise ValueError(f"لا توجد اقتراحات للعمود {table}.{column}")
+        return self.column_values(table, column).suggest(prefix or "", limit)
+
+    def preload(self):
+        """
+        تحميل جميع الجداول وتطبيق التغييرات المعلقة (في الخلفية عند فتح النموذج)، مع إعادة التحميل
+        إذا كتب برنامج آخر دون أحداث (data_version)؛ لا يُفحص ذلك أثناء الكتابة حتى لا يكون لكل حرف استعلام.
+        """
+        version = self.db_manager.data_version()
+        with self.lock:
+            if self.versions.needs_resync(version):
+                self.pending = {table: None for table in self.tables}
+            tables = [table for table in self.columns if table not in self.tables or table in self.pending]
+        for table in tables:
+            self.update_table(table)
+
+
+_suggestions = None
+_suggestions_lock = threading.Lock()
+
+
+def get_value_suggestions():
+    """فهرس الاقتراحات المشترك للبرنامج (يُنشأ عند أول استخدام باتصال خاص به)."""
+    global _suggestions
+    with _suggestions_lock:
+        if _suggestions is None:
+            from database.database_manager import create_database_manager
+            _suggestions = ValueSuggestions(create_database_manager())
+        return _suggestions
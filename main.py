@@ -1,3 +1,4 @@
+import logging
 import tkinter as tk
 from ui.home_screen import HomeScreen
 from ui.passport_screen import PassportScreen
@@ -5,11 +6,14 @@ from ui.UmrahScreen import UmrahScreen
 from ui.debt_screen import DebtScreen
 from ui.TicketScreen import TicketScreen
 from ui.User.login_screen import LoginScreen
+from ui.backup_scheduler import BackupScheduler
 
 
 # database
-from database.database_manager import DatabaseManager
+from database.database_manager import create_database_manager, data_server_address
 
+# أخطاء الخلفية وأحداث التغيير تُكتب في ملف، فالبرنامج يعمل عادة بدون نافذة أوامر
+LOG_FILE = "taif.log"
 
 
 class MainApp(tk.Tk):
@@ -50,10 +54,16 @@ class MainApp(tk.Tk):
 
         # database check
         self.connect_database()
+
+        # النسخ الاحتياطي والضغط في أوقات الخمول (على جهاز خادم البيانات عند استخدامه)
+        self.backup_scheduler = None
+        if not data_server_address():
+            self.backup_scheduler = BackupScheduler(self)
+            self.backup_scheduler.start()
     
     def connect_database(self):
         # database check
-        db_manager = DatabaseManager()
+        db_manager = create_database_manager()
         # Tables are created upon initialization
         # Additional setup code can be added here
         db_manager.close()
@@ -141,5 +151,6 @@ class MainApp(tk.Tk):
         self.current_child_frames.append(frame)
 
 if __name__ == "__main__":
+    logging.basicConfig(filename=LOG_FILE, level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
     app = MainApp()
     app.mainloop()
\ No newline at end of file
@@ -0,0 +1,48 @@
+import pandas as pd
+from reports.debt_exporter import DebtExporter
+from database.currency import currency_label
+from database.money import from_minor
+from services.columns import DEBT_TYPE_LABELS
+
+class AgingExporter(DebtExporter):
+    """تصدير تقرير أعمار الديون إلى Excel (صف لكل خدمة وعملة)."""
+
+    def __init__(self, master, debt_service):
+        super().__init__(master, debt_service)
+        if master is None:
+            return
+        self.export_window.title("تصدير أعمار الديون")
+        self.filename.set("أعمار_الديون")
+
+    def build_dataframe(self):
+        """جدول أعمار الديون (None إذا لم توجد ديون غير مسددة)."""
+        report = self.debt_service.get_aging_report()
+        if not report:
+            return None
+
+        buckets = [label for label, _ in self.debt_service.AGING_BUCKETS]
+        rows = []
+        for row in report:
+            data = {
+                "نوع الخدمة": DEBT_TYPE_LABELS.get(row["type"], row["type"]),
+                "العملة": currency_label(row["currency"]),
+                "عدد الديون": row["count"],
+            }
+            data.update({f"{label} يوم": from_minor(row[label]) for label in buckets})
+            data["الإجمالي"] = from_minor(row["total"])
+            rows.append(data)
+        return pd.DataFrame(rows)
+
+    def save_excel(self, df, file_path):
+        df.to_excel(file_path, index=False)
+
+        # تطبيق التنسيقات
+        self.apply_rtl_to_excel(file_path)
+        return file_path
+
+    def export_rows(self, file_path):
+        """تصدير أعمار الديون بدون واجهة؛ يعيد None إذا لم توجد ديون."""
+        df = self.build_dataframe()
+        if df is None:
+            return None
+        return self.save_excel(df, file_path)
@@ -0,0 +1,26 @@
+import os
+import pandas as pd
+from database.money import MONEY_COLUMNS, from_minor
+from services.archive_service import ArchiveService
+
+class ArchiveExporter:
+    """تصدير أرشيف سنة معينة إلى ملف Excel (ورقة لكل جدول)."""
+
+    def __init__(self, archive_service=None):
+        self.archive_service = archive_service or ArchiveService()
+
+    def export(self, year, file_path=None):
+        records = self.archive_service.get_archived_records(year)
+        if file_path is None:
+            downloads_path = os.path.join(os.path.expanduser("~"), "Downloads")
+            file_path = os.path.join(downloads_path, f"أرشيف_{year}.xlsx")
+
+        with pd.ExcelWriter(file_path) as writer:
+            for table_name, (columns, rows) in records.items():
+                df = pd.DataFrame(rows, columns=columns)
+                df = df.drop(columns=["customer_id"], errors="ignore")
+                for column in MONEY_COLUMNS.get(table_name, []):
+                    if column in df.columns:
+                        df[column] = df[column].apply(from_minor)
+                df.to_excel(writer, sheet_name=table_name, index=False)
+        return file_path
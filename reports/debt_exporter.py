@@ -4,13 +4,21 @@ import pandas as pd
 import os
 from openpyxl import load_workbook
 from openpyxl.styles import Alignment, PatternFill
-from database.database_manager import DatabaseManager
+from database.database_manager import create_database_manager
+from database.currency import currency_label
 
 class DebtExporter:
+    # الرسالة عند عدم وجود بيانات (build_dataframe يعيد None)
+    EMPTY_MESSAGE = "لا توجد ديون غير مسددة للتصدير."
+
     def __init__(self, master, debt_service):
         self.master = master
         self.debt_service = debt_service
-        self.db_manager = DatabaseManager()
+        self.db_manager = create_database_manager()
+
+        # بدون نافذة رئيسية يُستخدم المصدّر من سطر الأوامر عبر export_rows فقط
+        if master is None:
+            return
 
         # إنشاء نافذة التصدير
         self.export_window = tk.Toplevel(self.master)
@@ -52,12 +60,7 @@ class DebtExporter:
 
     def format_currency(self, value, currency_code):
         """تنسيق العملة بناءً على نوع الخدمة"""
-        currency_map = {
-            "1": "ر.ي",
-            "2": "ر.س",
-            "3": "دولار"
-        }
-        return f"{value} {currency_map.get(currency_code, 'ر.ي')}"
+        return f"{value} {currency_label(currency_code)}"
 
     def apply_rtl_to_excel(self, file_path):
         wb = load_workbook(file_path)
@@ -114,54 +117,73 @@ class DebtExporter:
 
         wb.save(file_path)
 
+    def build_dataframe(self):
+        """
+        جدول الديون غير المسددة مع مدفوعات كل دين (بدون أي واجهة).
+        """
+        # جلب بيانات الديون
+        debts = self.debt_service.get_all_data()
+
+        # تحويل إلى DataFrame
+        df = pd.DataFrame(debts)
+
+        # إعادة تسمية الأعمدة
+        df.rename(columns={
+            "id": "الرقم",
+            "name": "الاسم",
+            "type": "نوع الخدمة",
+            "date": "التاريخ",
+            "ym_paid": "المبلغ المدفوع (يمني)",
+            "sm_paid": "المبلغ المدفوع (سعودي)",
+            "remaining": "المتبقي"
+        }, inplace=True)
+
+        # جلب بيانات المدفوعات لكل دين
+        payments_data = []
+        for debt in debts:
+            payments = self.debt_service.get_payments(debt["type"], debt["id"])
+            if payments:
+                for payment in payments:
+                    payments_data.append({
+                        "الرقم": debt["id"],
+                        "الدفعة": f"{payment.amount} ",
+                        "تاريخ الدفعة": payment.payment_date,
+                        "طريقة الدفع": payment.payment_method
+                    })
+
+        # تحويل بيانات المدفوعات إلى DataFrame
+        if payments_data:
+            payments_df = pd.DataFrame(payments_data)
+            # دمج بيانات الديون والمدفوعات
+            df = pd.merge(df, payments_df, on="الرقم", how="left")
+        return df
+
+    def save_excel(self, df, file_path):
+        """كتابة الجدول إلى ملف Excel مع التنسيقات."""
+        df.to_excel(file_path, index=False)
+
+        # تطبيق التنسيقات
+        self.apply_rtl_to_excel(file_path)
+        self.apply_colors_to_excel(file_path)
+        return file_path
+
+    def export_rows(self, file_path):
+        """تصدير الديون إلى ملف Excel بدون واجهة (للمهام المجدولة)."""
+        return self.save_excel(self.build_dataframe(), file_path)
+
     def export_to_excel(self):
         try:
-            # جلب بيانات الديون
-            debts = self.debt_service.get_all_data()
-            
-            # تحويل إلى DataFrame
-            df = pd.DataFrame(debts)
-            
-            # إعادة تسمية الأعمدة
-            df.rename(columns={
-                "id": "الرقم",
-                "name": "الاسم",
-                "type": "نوع الخدمة",
-                "date": "التاريخ",
-                "ym_paid": "المبلغ المدفوع (يمني)",
-                "sm_paid": "المبلغ المدفوع (سعودي)",
-                "remaining": "المتبقي"
-            }, inplace=True)
-
-            # جلب بيانات المدفوعات لكل دين
-            payments_data = []
-            for debt in debts:
-                payments = self.debt_service.get_payments(debt["type"], debt["id"])
-                if payments:
-                    for payment in payments:
-                        payments_data.append({
-                            "الرقم": debt["id"],
-                            "الدفعة": f"{payment['amount']} ",
-                            "تاريخ الدفعة": payment["payment_date"],
-                            "طريقة الدفع": payment["payment_method"]
-                        })
-
-            # تحويل بيانات المدفوعات إلى DataFrame
-            if payments_data:
-                payments_df = pd.DataFrame(payments_data)
-                # دمج بيانات الديون والمدفوعات
-                df = pd.merge(df, payments_df, on="الرقم", how="left")
+            df = self.build_dataframe()
+            if df is None:
+                messagebox.showinfo("معلومات", self.EMPTY_MESSAGE)
+                return
 
             # حفظ الملف
             downloads_path = os.path.join(os.path.expanduser("~"), "Downloads")
             base_filename = f"{self.filename.get()}.xlsx"
             unique_filename = self.get_unique_filename(base_filename, downloads_path)
             file_path = os.path.join(downloads_path, unique_filename)
-            df.to_excel(file_path, index=False)
-
-            # تطبيق التنسيقات
-            self.apply_rtl_to_excel(file_path)
-            self.apply_colors_to_excel(file_path)
+            self.save_excel(df, file_path)
 
             messagebox.showinfo("نجاح", f"تم التصدير بنجاح إلى:\n{file_path}")
             self.export_window.destroy()
@@ -3,16 +3,22 @@ from tkinter import ttk, messagebox
 from tkcalendar import DateEntry
 import pandas as pd
 import os
-from database.database_manager import DatabaseManager
+from database.database_manager import create_database_manager
+from database.currency import currency_label
+from database.money import MONEY_COLUMNS, from_minor, to_minor
 from openpyxl import load_workbook
 from openpyxl.styles import Alignment
 from openpyxl.styles import PatternFill
 
 class TicketExporter:
-    def __init__(self, master):
+    def __init__(self, master=None):
         self.master = master
         self.table_name = "Trips"  # اسم الجدول
-        self.db_manager = DatabaseManager()
+        self.db_manager = create_database_manager()
+
+        # بدون نافذة رئيسية يُستخدم المصدّر من سطر الأوامر عبر export_rows فقط
+        if master is None:
+            return
 
         # إنشاء نافذة التصدير
         self.export_window = tk.Toplevel(master)
@@ -119,7 +125,7 @@ class TicketExporter:
             conditions.append(f"trip_date BETWEEN '{self.start_date.get()}' AND '{self.end_date.get()}'")
 
         elif self.export_option.get() == "بيانات بها مبالغ متبقية":
-            conditions.append(f"amount <= {self.amount_threshold.get()}")  # استخدام العمود `amount`
+            conditions.append(f"amount <= {to_minor(self.amount_threshold.get())}")  # استخدام العمود `amount`
 
         elif self.export_option.get() == "آخر 30 يوم":
             conditions.append("trip_date >= date('now', '-30 days')")
@@ -143,8 +149,7 @@ class TicketExporter:
         """
         تحويل رمز العملة المخزن في قاعدة البيانات إلى نص.
         """
-        currency_map = {"1": "ر.ي", "2": "ر.س", "3": "دولار"}
-        return currency_map.get(currency_code, "ر.ي")  # افتراضيًا ر.ي إذا لم يتم العثور على الرمز
+        return currency_label(currency_code)
 
     def merge_and_remove_currency(self, df):
         """
@@ -237,17 +242,14 @@ class TicketExporter:
         # حفظ التغييرات
         workbook.save(file_path)
 
-    def export_to_excel(self):
+    def build_dataframe(self, data, columns):
         """
-        تصدير البيانات إلى ملف Excel.
+        تحويل صفوف قاعدة البيانات إلى جدول جاهز للتصدير (بدون أي واجهة).
         """
-        data = self.get_filtered_data()
-        if not data:
-            return
-
-        # تحويل البيانات إلى DataFrame
-        columns = [description[0] for description in self.db_manager.cursor.description]
         df = pd.DataFrame(data, columns=columns)
+        df.drop(columns=["customer_id"], errors="ignore", inplace=True)  # عمود داخلي لا يظهر في التقرير
+        for column in MONEY_COLUMNS[self.table_name]:
+            df[column] = df[column].apply(from_minor)  # المبالغ مخزنة بالوحدات الصغرى
 
         # تحويل أسماء الأعمدة إلى العربية
         arabic_columns = {
@@ -267,13 +269,10 @@ class TicketExporter:
         df.rename(columns=arabic_columns, inplace=True)
 
         # دمج العملة مع الأعمدة المالية وحذف عمود العملة
-        df = self.merge_and_remove_currency(df)
+        return self.merge_and_remove_currency(df)
 
-        # تحديد مسار حفظ الملف
-        downloads_path = os.path.join(os.path.expanduser("~"), "Downloads")
-        file_path = os.path.join(downloads_path, f"{self.filename.get()}.xlsx")
-
-        # تصدير البيانات إلى Excel
+    def save_excel(self, df, file_path):
+        """كتابة الجدول إلى ملف Excel مع التنسيقات."""
         df.to_excel(file_path, index=False)
 
         # تطبيق توجيه النص RTL على ملف Excel
@@ -281,8 +280,41 @@ class TicketExporter:
 
         # تطبيق الألوان على ملف Excel
         self.apply_colors_to_excel(file_path)
+        return file_path
+
+    def export_rows(self, file_path, conditions=(), params=()):
+        """
+        تصدير السجلات المطابقة للشروط إلى ملف Excel بدون واجهة (للمهام المجدولة).
+        :return: مسار الملف أو None إذا لم توجد بيانات.
+        """
+        query = f"SELECT * FROM {self.table_name}"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        data = self.db_manager.execute_read_query(query, params)
+        if not data:
+            return None
+        df = self.build_dataframe(data, self.db_manager.get_column_names(self.table_name))
+        return self.save_excel(df, file_path)
+
+    def export_to_excel(self):
+        """
+        تصدير البيانات إلى ملف Excel.
+        """
+        data = self.get_filtered_data()
+        if not data:
+            return
+
+        # تحويل البيانات إلى DataFrame
+        df = self.build_dataframe(data, self.db_manager.get_column_names(self.table_name))
+
+        # تحديد مسار حفظ الملف
+        downloads_path = os.path.join(os.path.expanduser("~"), "Downloads")
+        file_path = os.path.join(downloads_path, f"{self.filename.get()}.xlsx")
+
+        # تصدير البيانات إلى Excel
+        self.save_excel(df, file_path)
 
         messagebox.showinfo("نجاح", f"تم تصدير البيانات بنجاح إلى: {file_path}")
 
         # إغلاق النافذة بعد التصدير
-        self.export_window.destroy()
\ No newline at end of file
+        self.export_window.destroy()
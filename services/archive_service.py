@@ -0,0 +1,209 @@
+import os
+import re
+import glob
+from database.database_manager import DatabaseManager
+from database.migrations import normalize_date
+from database.events import DELETE
+
+
+class ArchiveService:
+    """
+    نقل السجلات المسددة والقديمة إلى ملفات أرشيف سنوية (archive_<السنة>.db) مع مدفوعاتها،
+    وإرفاق الأرشيف عند الطلب للبحث والتصدير.
+    """
+
+    # الجداول المؤرشفة وعمود التاريخ الذي تُحدد به السنة وتاريخ الإغلاق
+    ARCHIVE_TABLES = {
+        "Passports": "booking_date",
+        "Umrah": "exit_date",
+        "Trips": "trip_date",
+    }
+
+    SEARCH_COLUMNS = {
+        "Passports": ["name", "receiver_name"],
+        "Umrah": ["name", "passport_number", "phone_number", "sponsor_name"],
+        "Trips": ["name", "passport_number", "from_place", "to_place", "booking_company"],
+    }
+
+    BATCH_SIZE = 500
+    ARCHIVE_ALIAS = "archive"
+
+    def __init__(self, master=None):
+        self.db_manager = DatabaseManager()
+        self.master = master
+        self.archive_dir = os.path.dirname(self.db_manager.db_path)
+
+    def archive_path(self, year):
+        return os.path.join(self.archive_dir, f"archive_{year}.db")
+
+    def get_archive_years(self):
+        """السنوات التي يوجد لها ملف أرشيف."""
+        years = []
+        for path in glob.glob(os.path.join(self.archive_dir, "archive_*.db")):
+            match = re.search(r"archive_(\d{4})\.db$", path)
+            if match:
+                years.append(match.group(1))
+        return sorted(years)
+
+    def attach(self, year):
+        """إرفاق ملف أرشيف السنة بالاتصال الحالي (لا يمكن الإرفاق داخل معاملة)."""
+        self.db_manager.execute_query(f"ATTACH DATABASE ? AS {self.ARCHIVE_ALIAS}", (self.archive_path(year),))
+
+    def detach(self):
+        self.db_manager.execute_query(f"DETACH DATABASE {self.ARCHIVE_ALIAS}")
+
+    def ensure_archive_tables(self):
+        """إنشاء جداول الأرشيف بنفس تعريف الجداول الرئيسية إذا لم تكن موجودة."""
+        for table_name in list(self.ARCHIVE_TABLES) + ["Payments"]:
+            create_sql = self.db_manager.execute_read_query(
+                "SELECT sql FROM main.sqlite_master WHERE type = 'table' AND name = ?", (table_name,)
+            )[0][0]
+            create_sql = re.sub(
+                r'^CREATE TABLE\s+"?\w+"?',
+                f"CREATE TABLE IF NOT EXISTS {self.ARCHIVE_ALIAS}.{table_name}",
+                create_sql,
+            )
+            self.db_manager.execute_query(create_sql)
+
+    def settled_condition(self, table_name):
+        date_column = self.ARCHIVE_TABLES[table_name]
+        return f"COALESCE(remaining_amount, 0) <= 0 AND {date_column} < ? AND substr({date_column}, 1, 4) = ?"
+
+    def get_pending_years(self, cutoff_date):
+        """السنوات التي تحتوي على سجلات مسددة قبل تاريخ القطع."""
+        queries = [
+            f"SELECT DISTINCT substr({date_column}, 1, 4) FROM {table_name} "
+            f"WHERE COALESCE(remaining_amount, 0) <= 0 AND {date_column} < ?"
+            for table_name, date_column in self.ARCHIVE_TABLES.items()
+        ]
+        rows = self.db_manager.execute_read_query(" UNION ".join(queries), (cutoff_date,) * len(queries))
+        return sorted(year for (year,) in rows if year and year.isdigit())
+
+    def archive_batch(self, table_name, cutoff_date, year):
+        """
+        نقل دفعة واحدة من السجلات المسددة مع مدفوعاتها داخل معاملة واحدة.
+        النسخ يتم بـ INSERT OR IGNORE والحذف يقتصر على ما وصل للأرشيف، لذلك يمكن
+        إعادة التشغيل بأمان بعد أي انقطاع.
+
+        :return: عدد السجلات المنقولة في هذه الدفعة.
+        """
+        columns = ", ".join(self.db_manager.get_column_names(table_name))
+        payment_columns = ", ".join(self.db_manager.get_column_names("Payments"))
+        archive = self.ARCHIVE_ALIAS
+
+        with self.db_manager.transaction():
+            self.db_manager.execute_query("DELETE FROM temp.archive_batch")
+            self.db_manager.execute_query(
+                f"INSERT INTO temp.archive_batch (id) SELECT id FROM main.{table_name} "
+                f"WHERE {self.settled_condition(table_name)} ORDER BY id LIMIT ?",
+                (cutoff_date, year, self.BATCH_SIZE),
+            )
+            moved = self.db_manager.cursor.rowcount
+            if moved <= 0:
+                return 0
+
+            self.db_manager.execute_query(
+                f"INSERT OR IGNORE INTO {archive}.{table_name} ({columns}) "
+                f"SELECT {columns} FROM main.{table_name} WHERE id IN (SELECT id FROM temp.archive_batch)"
+            )
+            self.db_manager.execute_query(
+                f"INSERT OR IGNORE INTO {archive}.Payments ({payment_columns}) "
+                f"SELECT {payment_columns} FROM main.Payments "
+                f"WHERE debt_type = ? AND debt_id IN (SELECT id FROM temp.archive_batch)",
+                (table_name,),
+            )
+            # الحذف من الجداول الرئيسية فقط لما تم نسخه فعلًا إلى الأرشيف
+            self.db_manager.execute_query(
+                f"DELETE FROM main.Payments WHERE debt_type = ? "
+                f"AND id IN (SELECT id FROM {archive}.Payments WHERE debt_type = ?) "
+                f"AND debt_id IN (SELECT id FROM temp.archive_batch)",
+                (table_name, table_name),
+            )
+            self.db_manager.execute_query(
+                f"DELETE FROM main.{table_name} WHERE id IN (SELECT id FROM temp.archive_batch) "
+                f"AND id IN (SELECT id FROM {archive}.{table_name})"
+            )
+        return moved
+
+    def archive_settled(self, cutoff_date):
+        """
+        أرشفة السجلات المسددة التي يسبق تاريخها تاريخ القطع، كل سنة في ملف مستقل.
+
+        :param cutoff_date: تاريخ القطع (YYYY-MM-DD)؛ تُؤرشف السجلات الأقدم منه فقط.
+        :return: (نجاح العملية، رسالة، عدد السجلات المنقولة لكل جدول).
+        """
+        cutoff_date = normalize_date(cutoff_date)
+        totals = {table_name: 0 for table_name in self.ARCHIVE_TABLES}
+        try:
+            with self.db_manager.lock:
+                self.db_manager.execute_query("CREATE TEMP TABLE IF NOT EXISTS archive_batch (id INTEGER PRIMARY KEY)")
+                for year in self.get_pending_years(cutoff_date):
+                    self.attach(year)
+                    try:
+                        self.ensure_archive_tables()
+                        for table_name in self.ARCHIVE_TABLES:
+                            while True:
+                                moved = self.archive_batch(table_name, cutoff_date, year)
+                                if not moved:
+                                    break
+                                totals[table_name] += moved
+                    finally:
+                        self.detach()
+            # السجلات المنقولة لم تعد في الجداول الرئيسية
+            for table_name, moved in totals.items():
+                if moved:
+                    self.db_manager.publish(table_name, None, DELETE)
+            return True, f"تمت أرشفة {sum(totals.values())} سجل", totals
+        except Exception as e:
+            return False, f"فشلت الأرشفة: {str(e)}", totals
+
+    def search_archive(self, search_term, years=None, limit=200):
+        """
+        البحث في ملفات الأرشيف (جميع السنوات أو سنوات محددة).
+        :return: قائمة من (السنة، نوع الخدمة، المعرف، الاسم، التاريخ، المبلغ المتبقي، العملة).
+        """
+        results = []
+        pattern = f"%{search_term}%"
+        available = self.get_archive_years()
+        if years:
+            # ATTACH ينشئ ملفًا فارغًا لسنة ليس لها أرشيف
+            available = [year for year in available if int(year) in {int(y) for y in years}]
+        with self.db_manager.lock:
+            for year in available:
+                self.attach(year)
+                try:
+                    queries, params = [], []
+                    for table_name, date_column in self.ARCHIVE_TABLES.items():
+                        columns = self.SEARCH_COLUMNS[table_name]
+                        queries.append(
+                            f"SELECT '{table_name}', id, name, {date_column}, remaining_amount, currency "
+                            f"FROM {self.ARCHIVE_ALIAS}.{table_name} "
+                            f"WHERE {' OR '.join(f'{column} LIKE ?' for column in columns)}"
+                        )
+                        params.extend([pattern] * len(columns))
+                    query = " UNION ALL ".join(queries) + " ORDER BY 4 DESC LIMIT ?"
+                    rows = self.db_manager.execute_read_query(query, tuple(params) + (limit,))
+                    results.extend((year,) + row for row in rows)
+                finally:
+                    self.detach()
+        return results
+
+    def get_archived_records(self, year):
+        """
+        جميع سجلات أرشيف سنة معينة (للتصدير).
+        :return: قاموس {اسم الجدول: (أسماء الأعمدة، الصفوف)}.
+        """
+        records = {}
+        with self.db_manager.lock:
+            self.attach(year)
+            try:
+                for table_name in list(self.ARCHIVE_TABLES) + ["Payments"]:
+                    columns = [
+                        column[1] for column in
+                        self.db_manager.execute_read_query(f"PRAGMA {self.ARCHIVE_ALIAS}.table_info({table_name})")
+                    ]
+                    rows = self.db_manager.execute_read_query(f"SELECT * FROM {self.ARCHIVE_ALIAS}.{table_name}")
+                    records[table_name] = (columns, rows)
+            finally:
+                self.detach()
+        return records
@@ -0,0 +1,188 @@
+import os
+import glob
+import sqlite3
+from datetime import datetime
+from database.database_manager import DatabaseManager
+from database.connection import BUSY_TIMEOUT_MS
+
+
+class BackupService:
+    """
+    نسخ احتياطي أثناء تشغيل البرنامج باستخدام Connection.backup، مع الاحتفاظ بعدد محدد من النسخ،
+    وضغط قاعدة البيانات والتحقق من سلامتها.
+    """
+
+    BACKUP_PREFIX = "taif_"
+    DEFAULT_RETENTION = 7
+    # عدد الصفحات المنسوخة في كل خطوة، والانتظار بين الخطوات حتى لا يتوقف الكتّاب
+    PAGES_PER_STEP = 64
+    STEP_SLEEP = 0.01
+    INCREMENTAL_VACUUM_PAGES = 1000
+    # نسبة الصفحات الفارغة التي يستحق عندها تنفيذ VACUUM كامل
+    VACUUM_FREE_RATIO = 0.1
+
+    def __init__(self, master=None, backup_dir=None, retention=DEFAULT_RETENTION):
+        self.db_manager = DatabaseManager()
+        self.master = master
+        self.db_path = self.db_manager.db_path
+        self.backup_dir = backup_dir or os.path.join(os.path.dirname(self.db_path), "backups")
+        self.retention = retention
+        self.report_path = os.path.join(self.backup_dir, "backup_report.log")
+
+    def ensure_backup_directory_exists(self):
+        if not os.path.exists(self.backup_dir):
+            os.makedirs(self.backup_dir)
+
+    def new_backup_path(self):
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        return os.path.join(self.backup_dir, f"{self.BACKUP_PREFIX}{timestamp}.db")
+
+    def list_backups(self):
+        """ملفات النسخ الاحتياطية من الأقدم إلى الأحدث."""
+        return sorted(glob.glob(os.path.join(self.backup_dir, f"{self.BACKUP_PREFIX}*.db")))
+
+    def backup(self, progress=None):
+        """
+        إنشاء نسخة احتياطية أثناء عمل البرنامج.
+        يتم النسخ على خطوات صغيرة من اتصال مستقل، فلا يُحجز قفل قاعدة البيانات طوال مدة النسخ.
+
+        :param progress: دالة اختيارية (المتبقي، الإجمالي) تُستدعى بعد كل خطوة.
+        :return: (نجاح العملية، رسالة، تقرير التحقق).
+        """
+        self.ensure_backup_directory_exists()
+        backup_path = self.new_backup_path()
+        temp_path = backup_path + ".part"
+        try:
+            source = sqlite3.connect(self.db_path, timeout=BUSY_TIMEOUT_MS / 1000)
+            target = sqlite3.connect(temp_path)
+            try:
+                source.backup(
+                    target,
+                    pages=self.PAGES_PER_STEP,
+                    progress=(lambda status, remaining, total: progress(remaining, total)) if progress else None,
+                    sleep=self.STEP_SLEEP,
+                )
+            finally:
+                target.close()
+                source.close()
+
+            # النسخة لا تُعتمد إلا بعد اكتمالها والتحقق منها
+            report = self.check_integrity(temp_path)
+            if not report["ok"]:
+                os.remove(temp_path)
+                return False, "فشل التحقق من سلامة النسخة الاحتياطية", report
+            os.replace(temp_path, backup_path)
+            report["path"] = backup_path
+            self.apply_retention()
+            self.write_report("backup", report)
+            return True, f"تم إنشاء النسخة الاحتياطية: {backup_path}", report
+        except Exception as e:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return False, f"فشل النسخ الاحتياطي: {str(e)}", None
+
+    def apply_retention(self):
+        """حذف النسخ الأقدم والاحتفاظ بآخر (retention) نسخة فقط."""
+        backups = self.list_backups()
+        removed = []
+        if self.retention and len(backups) > self.retention:
+            for path in backups[:-self.retention]:
+                os.remove(path)
+                removed.append(path)
+        return removed
+
+    def check_integrity(self, path=None, full=False):
+        """
+        التحقق من سلامة قاعدة البيانات (أو ملف نسخة احتياطية) باستخدام quick_check أو integrity_check.
+
+        :return: تقرير: المسار، السلامة، الأخطاء، عدد الصفحات والصفحات الفارغة، وقت الفحص.
+        """
+        path = path or self.db_path
+        pragma = "integrity_check" if full else "quick_check"
+        connection = sqlite3.connect(path, timeout=BUSY_TIMEOUT_MS / 1000)
+        try:
+            messages = [row[0] for row in connection.execute(f"PRAGMA {pragma}").fetchall()]
+            page_count = connection.execute("PRAGMA page_count").fetchone()[0]
+            freelist_count = connection.execute("PRAGMA freelist_count").fetchone()[0]
+            page_size = connection.execute("PRAGMA page_size").fetchone()[0]
+        finally:
+            connection.close()
+        return {
+            "path": path,
+            "ok": messages == ["ok"],
+            "errors": [] if messages == ["ok"] else messages,
+            "page_count": page_count,
+            "freelist_count": freelist_count,
+            "size": page_count * page_size,
+            "checked_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        }
+
+    def get_auto_vacuum_mode(self):
+        return self.db_manager.execute_read_query("PRAGMA auto_vacuum")[0][0]
+
+    def enable_incremental_vacuum(self):
+        """
+        تفعيل وضع auto_vacuum=INCREMENTAL (يتطلب VACUUM كامل مرة واحدة).
+        بعدها يمكن إعادة المساحة المحذوفة تدريجيًا دون إعادة بناء الملف.
+        """
+        with self.db_manager.lock:
+            self.db_manager.execute_query("PRAGMA auto_vacuum = INCREMENTAL")
+            self.db_manager.execute_query("VACUUM")
+        return True, "تم تفعيل الضغط التدريجي"
+
+    def compact(self, pages=INCREMENTAL_VACUUM_PAGES):
+        """
+        إعادة المساحة الناتجة عن الحذف.
+        في وضع INCREMENTAL يتم تحرير عدد محدود من الصفحات في كل مرة؛ وإلا يُنفذ VACUUM كامل
+        فقط عندما تتجاوز الصفحات الفارغة النسبة المحددة.
+
+        :return: (نجاح العملية، رسالة، تقرير قبل/بعد).
+        """
+        try:
+            before = self.check_integrity()
+            with self.db_manager.lock:
+                if self.get_auto_vacuum_mode() == 2:
+                    # executescript ينفذ الأمر حتى النهاية (execute يحرر صفحة واحدة فقط)
+                    self.db_manager.connection.executescript(f"PRAGMA incremental_vacuum({int(pages)});")
+                elif before["freelist_count"] > before["page_count"] * self.VACUUM_FREE_RATIO:
+                    self.db_manager.execute_query("VACUUM")
+            after = self.check_integrity()
+            report = {
+                "before_size": before["size"],
+                "after_size": after["size"],
+                "freed_pages": before["page_count"] - after["page_count"],
+                "freelist_count": after["freelist_count"],
+                "ok": after["ok"],
+            }
+            self.write_report("compact", report)
+            return True, "تم ضغط قاعدة البيانات", report
+        except Exception as e:
+            return False, f"فشل ضغط قاعدة البيانات: {str(e)}", None
+
+    def vacuum_into(self, path=None):
+        """إنشاء نسخة مضغوطة من قاعدة البيانات في ملف جديد (VACUUM INTO)."""
+        self.ensure_backup_directory_exists()
+        path = path or self.new_backup_path()
+        try:
+            with self.db_manager.lock:
+                self.db_manager.execute_query("VACUUM INTO ?", (path,))
+            report = self.check_integrity(path)
+            self.apply_retention()
+            self.write_report("vacuum_into", report)
+            return True, f"تم إنشاء نسخة مضغوطة: {path}", report
+        except Exception as e:
+            return False, f"فشل إنشاء النسخة المضغوطة: {str(e)}", None
+
+    def write_report(self, operation, report):
+        """إضافة نتيجة العملية إلى سجل النسخ الاحتياطي."""
+        self.ensure_backup_directory_exists()
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        details = ", ".join(f"{key}={value}" for key, value in report.items())
+        with open(self.report_path, "a", encoding="utf-8") as report_file:
+            report_file.write(f"[{timestamp}] {operation}: {details}\n")
+
+    def last_backup_time(self):
+        backups = self.list_backups()
+        if not backups:
+            return None
+        return datetime.fromtimestamp(os.path.getmtime(backups[-1]))
@@ -0,0 +1,145 @@
+from database.money import money_sql
+from database.currency import CURRENCY_LABELS, DEFAULT_CURRENCY_LABEL
+
+PASSPORT_TYPE_LABELS = {"1": "عادي", "2": "مستعجل عدن", "3": "مستعجل بيومه", "4": "غير ذلك"}
+PASSPORT_STATUS_LABELS = {"1": "في الطابعة", "2": "في المكتب", "3": "تم الاستلام", "4": "مرفوض"}
+DEBT_TYPE_LABELS = {"Passports": "جوازات", "Umrah": "عمرة", "Trips": "رحلات"}
+UNKNOWN_LABEL = "غير معروف"
+
+
+def sql_literal(value):
+    """تحويل نص إلى قيمة نصية آمنة داخل استعلام SQL."""
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def case_expression(source, labels, default):
+    """بناء تعبير CASE يحول الرموز المخزنة إلى نصوص العرض."""
+    branches = " ".join(f"WHEN {sql_literal(code)} THEN {sql_literal(label)}" for code, label in labels.items())
+    return f"CASE {source} {branches} ELSE {sql_literal(default)} END"
+
+
+class Column:
+    """
+    وصف عمود معروض في الجدول.
+
+    :param source: اسم العمود في قاعدة البيانات أو تعبير SQL.
+    :param labels: قاموس لتحويل الرموز المخزنة إلى نصوص (اختياري).
+    :param default: النص الافتراضي عند عدم وجود الرمز في القاموس.
+    :param currency: True لإضافة نص العملة بعد القيمة (العمود مالي).
+    :param money: True لعرض مبلغ مخزن بالوحدات الصغرى بمنزلتين عشريتين.
+    """
+
+    def __init__(self, source, labels=None, default=UNKNOWN_LABEL, currency=False, money=False):
+        self.source = source
+        self.labels = labels
+        self.default = default
+        self.currency = currency
+        self.money = money or currency
+
+    def to_sql(self, currency_sql):
+        if self.labels is not None:
+            return case_expression(self.source, self.labels, self.default)
+        source = money_sql(self.source) if self.money else self.source
+        if self.currency:
+            return f"{source} || ' ' || {currency_sql}"
+        return source
+
+
+class DisplaySpec:
+    """
+    وصف تصريحي لطريقة عرض جدول: الأعمدة وترتيبها وتحويل الرموز ودمج العملة.
+    يُترجم الوصف مرة واحدة إلى استعلام SELECT يُرجع الصفوف جاهزة للعرض،
+    فلا يحتاج عرض القائمة إلى أي تنسيق في بايثون لكل صف.
+    """
+
+    def __init__(self, table_name, columns, currency_column="currency"):
+        self.table_name = table_name
+        self.columns = columns
+        currency_sql = case_expression(currency_column, CURRENCY_LABELS, DEFAULT_CURRENCY_LABEL)
+        self.select_list = ", ".join(column.to_sql(currency_sql) for column in columns)
+        self.select_sql = f"SELECT {self.select_list} FROM {table_name}"
+
+    def query(self, where="", order_by="", extra_columns=()):
+        """بناء الاستعلام الكامل مع شرط وترتيب اختياريين وأعمدة إضافية بعد أعمدة العرض."""
+        query = self.select_sql
+        if extra_columns:
+            query = f"SELECT {', '.join([self.select_list, *extra_columns])} FROM {self.table_name}"
+        if where:
+            query += f" WHERE {where}"
+        if order_by:
+            query += f" ORDER BY {order_by}"
+        return query
+
+    def fetch(self, db_manager, where="", params=(), order_by="", extra_columns=()):
+        """تنفيذ الاستعلام وإرجاع الصفوف جاهزة للعرض."""
+        return db_manager.execute_read_query(self.query(where, order_by, extra_columns), params)
+
+    def fetch_page(self, db_manager, page, per_page):
+        """
+        صفحة واحدة من صفوف العرض (LIMIT/OFFSET) مع العدد الكلي للسجلات.
+        :return: (الصفوف، العدد الكلي).
+        """
+        total = db_manager.execute_read_query(f"SELECT COUNT(*) FROM {self.table_name}")[0][0]
+        rows = db_manager.execute_read_query(
+            self.query(order_by="id") + " LIMIT ? OFFSET ?",
+            (per_page, (max(page, 1) - 1) * per_page)
+        )
+        return rows, total
+
+    def fetch_ids(self, db_manager, ids):
+        """صفوف العرض لمعرفات محددة فقط (لتحديث صفوف الجدول المعروض بعد تعديلها)."""
+        ids = list(ids)
+        if not ids:
+            return []
+        return self.fetch(db_manager, f"id IN ({', '.join('?' * len(ids))})", tuple(ids))
+
+
+PASSPORT_DISPLAY = DisplaySpec("Passports", [
+    Column("id"),
+    Column("name"),
+    Column("booking_date"),
+    Column("type", labels=PASSPORT_TYPE_LABELS),
+    Column("booking_price", currency=True),
+    Column("purchase_price", currency=True),
+    Column("net_amount", currency=True),
+    Column("paid_amount", currency=True),
+    Column("remaining_amount", currency=True),
+    Column("status", labels=PASSPORT_STATUS_LABELS),
+    Column("receipt_date"),
+    Column("receiver_name"),
+])
+
+# عدد الأيام المتبقية يُحسب داخل الاستعلام بدلًا من تحليل التواريخ لكل صف
+UMRAH_DAYS_LEFT_SQL = (
+    "MAX(COALESCE(CAST(julianday(exit_date) - julianday('now', 'localtime', 'start of day') AS INTEGER), 0), 0)"
+)
+
+UMRAH_DISPLAY = DisplaySpec("Umrah", [
+    Column("id"),
+    Column("name"),
+    Column("passport_number"),
+    Column("entry_date"),
+    Column("exit_date"),
+    Column("sponsor_name"),
+    Column("cost", currency=True),
+    Column("paid", currency=True),
+    Column("remaining_amount", currency=True),
+    Column(UMRAH_DAYS_LEFT_SQL),
+    Column("status"),
+])
+
+TRIP_DISPLAY = DisplaySpec("Trips", [
+    Column("id"),
+    Column("name"),
+    Column("passport_number"),
+    Column("from_place"),
+    Column("to_place"),
+    Column("booking_company"),
+    Column("amount", currency=True),
+    Column("agent", currency=True),
+    Column("net_amount", currency=True),
+    Column("trip_date"),
+    Column("office_name"),
+    Column("paid", money=True),
+    Column("remaining_amount", money=True),
+])
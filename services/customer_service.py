@@ -0,0 +1,98 @@
+from database.database_manager import create_database_manager
+from database.customers import customer_key
+from database.normalization import normalize_name
+
+
+class CustomerService:
+    def __init__(self, master=None):
+        self.db_manager = create_database_manager()
+        self.master = master
+
+    def get_by_id(self, customer_id):
+        result = self.db_manager.select("Customers", id=customer_id)
+        if result:
+            return result[0]
+        return None
+
+    def find_customer(self, name=None, passport_number=None, phone_number=None):
+        """
+        البحث عن عميل بالمفتاح الموحد (رقم الجواز أو الهاتف أو الاسم).
+        """
+        key = customer_key(name, passport_number, phone_number)
+        if key is None:
+            return None
+        result = self.db_manager.select("Customers", customer_key=key)
+        if result:
+            return result[0]
+        return None
+
+    def lookup(self, text, limit=20):
+        """
+        العملاء المطابقون لنص واحد: رقم الجواز أو الهاتف أو الاسم الكامل بالمفتاح الموحد،
+        وإلا العملاء الذين يبدأ اسمهم بالنص.
+        """
+        for fields in ({"passport_number": text}, {"phone_number": text}, {"name": text}):
+            customer = self.find_customer(**fields)
+            if customer:
+                return [customer]
+        return self.search_by_name(text, limit)
+
+    def search_by_name(self, name, limit=20):
+        """البحث عن العملاء بالاسم (مطابقة بداية الاسم بعد التوحيد)."""
+        name_key = normalize_name(name)
+        query = "SELECT * FROM Customers WHERE name_key >= ? AND name_key < ? ORDER BY name_key LIMIT ?"
+        return self.db_manager.execute_read_query(query, (name_key, name_key + "\uffff", limit))
+
+    def get_customer_id_for_debt(self, debt_type, debt_id):
+        result = self.db_manager.execute_read_query(
+            f"SELECT customer_id FROM {debt_type} WHERE id = ?", (debt_id,)
+        )
+        if result:
+            return result[0][0]
+        return None
+
+    def get_ledger(self, customer_id):
+        """
+        جميع خدمات العميل (جوازات، عمرة، رحلات) مرتبة بالتاريخ.
+        يعتمد الاستعلام على فهرس customer_id في كل جدول.
+        """
+        query = """
+            SELECT debt_type, debt_id, name, debt_date, total_amount, paid_amount, remaining_amount, currency
+            FROM Debts
+            WHERE customer_id = ?
+            ORDER BY debt_date
+        """
+        return self.db_manager.execute_read_query(query, (customer_id,))
+
+    def get_payments(self, customer_id):
+        """جميع المدفوعات المسجلة على خدمات العميل."""
+        # CROSS JOIN يثبت ترتيب الربط: خدمات العميل أولًا ثم فهرس المدفوعات لكل خدمة
+        query = """
+            SELECT p.id, p.debt_type, p.debt_id, p.amount, p.payment_date, p.payment_method
+            FROM Debts d
+            CROSS JOIN Payments p ON p.debt_type = d.debt_type AND p.debt_id = d.debt_id
+            WHERE d.customer_id = ?
+            ORDER BY p.payment_date
+        """
+        return self.db_manager.execute_read_query(query, (customer_id,))
+
+    def get_totals(self, customer_id):
+        """إجمالي المبالغ والمدفوع والمتبقي للعميل لكل عملة."""
+        query = """
+            SELECT currency, SUM(total_amount), SUM(paid_amount), SUM(remaining_amount)
+            FROM Debts
+            WHERE customer_id = ?
+            GROUP BY currency
+        """
+        return self.db_manager.execute_read_query(query, (customer_id,))
+
+    def get_statement(self, customer_id):
+        """
+        كشف حساب العميل: بياناته وخدماته ومدفوعاته والإجماليات لكل عملة.
+        """
+        return {
+            "customer": self.get_by_id(customer_id),
+            "ledger": self.get_ledger(customer_id),
+            "payments": self.get_payments(customer_id),
+            "totals": self.get_totals(customer_id),
+        }
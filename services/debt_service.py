@@ -1,80 +1,109 @@
-from database.database_manager import DatabaseManager
-from database.SearchManager import SearchManager
-from datetime import datetime
-from reports.debt_exporter import DebtExporter
-import tkinter as tk
+from database.database_manager import create_database_manager
+from database.SearchManager import SearchManager, DEBT_SEARCH_TABLES
+from database.money import to_minor, from_minor
+from database.records import RECORD_CLASSES, Payment, record_factory
+from database.currency import BASE_CURRENCY, DEFAULT_CURRENCY
+from database.events import INSERT, UPDATE
+from services.exchange_service import rate_sql
+from datetime import date
 
 class DebtService:
     def __init__(self, master):
-        self.db_manager = DatabaseManager()
-        self.search_manager = SearchManager()
+        self.db_manager = create_database_manager()
+        self.search_manager = SearchManager(db_manager=self.db_manager)
         self.master = master
     
     
     def get_all_data(self):
         """
-        استرجاع جميع الديون غير المسددة مع المدفوعات المرتبطة بكل دين.
+        استرجاع جميع الديون غير المسددة (من الذاكرة المؤقتة إذا لم تتغير جداول الديون).
         """
-        debts = []
-        tables = [
-            ("Passports", "booking_date"),
-            ("Umrah", "entry_date"),
-            ("Trips", "trip_date")
-        ]
+        return self.db_manager.cache.get(("debts",), ["Passports", "Umrah", "Trips"], self.load_all_data)
 
-        for table, date_column in tables:
-            records = self.db_manager.select_with_condition(table, "remaining_amount > 0")
+    def load_all_data(self):
+        """الديون غير المسددة من الجداول الثلاثة في استعلام واحد، الأحدث أولًا."""
+        selects = [self.debt_select(table, "remaining_amount > 0") for table in DEBT_SEARCH_TABLES]
+        rows = self.db_manager.execute_read_query(" UNION ALL ".join(selects) + " ORDER BY date DESC")
+        return [self.search_manager.format_debt_row(row) for row in rows]
 
-            for record in records:
-                debt_data = self.format_record_data(table, record)
-                debts.append(debt_data)
+    # كتابة الديون أو الدفعات فقط تغير قائمة الديون غير المسددة
+    DEBT_LIST_TABLES = ["Passports", "Umrah", "Trips", "Payments"]
 
-        debts.sort(
-            key=lambda x: datetime.strptime(x["date"], "%Y-%m-%d") if isinstance(x["date"], str) and x["date"] else datetime.min,
-            reverse=True
+    def get_page(self, page, per_page):
+        """
+        صفحة من الديون غير المسددة (الأحدث أولًا) مع عددها الكلي.
+        الصفحة والعدد من الذاكرة المؤقتة حتى تُكتب الديون أو الدفعات، فالتنقل بين الصفحات
+        لا يكلف إلا استعلام LIMIT/OFFSET صغيرًا عند أول زيارة للصفحة.
+        """
+        rows = self.db_manager.cache.get(
+            ("debts", "page", page, per_page), self.DEBT_LIST_TABLES,
+            lambda: self.load_page(page, per_page)
         )
+        return rows, self.count_debts()
+
+    def load_page(self, page, per_page):
+        selects = [self.debt_select(table, "remaining_amount > 0") for table in DEBT_SEARCH_TABLES]
+        # ترتيب ثابت للديون التي لها نفس التاريخ حتى لا يتكرر دين في صفحتين
+        query = " UNION ALL ".join(selects) + " ORDER BY date DESC, type, id DESC LIMIT ? OFFSET ?"
+        rows = self.db_manager.execute_read_query(query, (int(per_page), (int(page) - 1) * int(per_page)))
+        return [self.search_manager.format_debt_row(row) for row in rows]
+
+    def count_debts(self):
+        """عدد الديون غير المسددة (من الذاكرة المؤقتة حتى تُكتب الديون أو الدفعات)."""
+        return self.db_manager.cache.get(("debts", "count"), self.DEBT_LIST_TABLES, self.load_debt_count)
 
-        return debts
-
-    def format_record_data(self, table, record):
-        if table == "Passports":
-            return {
-                "id": record[0],
-                "name": record[1],
-                "type": "Passports",
-                "date": record[2] if isinstance(record[2], str) else "",
-                "ym_paid": f"{record[4]} ر.ي" if record[-1] == '1' else "0",
-                "sm_paid": f"{record[4]} ر.س" if record[-1] == '2' else "0",
-                "remaining": record[8],
-            }
-        elif table == "Umrah":
-            return {
-                "id": record[0],
-                "name": record[1],
-                "type": "Umrah",
-                "date": record[9] if isinstance(record[9], str) else "",
-                "ym_paid": f"{record[6]} ر.ي" if record[-1] == '1' else "0 ",
-                "sm_paid": f"{record[6]} ر.س" if record[-1] == '2' else "0 ",
-                "remaining": record[8],
-            }
-        elif table == "Trips":
-            return {
-                "id": record[0],
-                "name": record[1],
-                "type": "Trips",
-                "date": record[10] if isinstance(record[10], str) else "",
-                "ym_paid": f"{record[6]} ر.ي" if record[7] == '1' else "0",
-                "sm_paid": f"{record[6]}ر.س" if record[7] == '2' else "0",
-                "remaining": record[13],
-            }
+    def load_debt_count(self):
+        # كل عدد من الفهرس الجزئي للديون غير المسددة دون قراءة الصفوف
+        counts = " + ".join(f"(SELECT COUNT(*) FROM {table} WHERE remaining_amount > 0)" for table in DEBT_SEARCH_TABLES)
+        return self.db_manager.execute_read_query(f"SELECT {counts}")[0][0]
+
+    def get_debts_by_ids(self, table, ids):
+        """
+        الديون غير المسددة لمعرفات محددة من جدول واحد (لتحديث الصفوف المعدلة فقط).
+        المعرفات غير الموجودة في النتيجة تم سدادها أو حذفها.
+        """
+        ids = list(ids)
+        if table not in self.PAYMENT_COLUMNS or not ids:
+            return []
+        rows = self.db_manager.execute_read_query(
+            self.debt_select(table, f"remaining_amount > 0 AND id IN ({', '.join('?' * len(ids))})"), tuple(ids)
+        )
+        return [self.search_manager.format_debt_row(row) for row in rows]
+
+    def debt_select(self, table, condition):
+        """
+        استعلام الديون لجدول واحد بأعمدة format_debt_row بالاسم
+        (عمود التاريخ والمبلغ لكل جدول من DEBT_SEARCH_TABLES).
+        """
+        date_column, price_column, _ = DEBT_SEARCH_TABLES[table]
+        return (
+            f"SELECT '{table}' AS type, id, name, {date_column} AS date, {price_column} AS price, "
+            f"currency, remaining_amount FROM {table} WHERE {condition}"
+        )
+
+    def search_data(self, search_term):
+        """
+        البحث في الديون باستخدام مصطلح البحث.
+        """
+        if not search_term:
+            return self.get_all_data()
+        return self.search_manager.search_debts(search_term)
+
+    def search_with_keys(self, search_term):
+        """نتيجة search_data مع مفتاح البحث لكل صف: [(السجل، المفتاح)] (تستخدمها SearchSession)."""
+        return self.search_manager.search_debts(search_term, with_keys=True)
 
     def get_by_id(self, debt_id, debt_type):
-        if debt_type == "Passports":
-            return self.db_manager.select("Passports", id=debt_id)
-        elif debt_type == "Umrah":
-            return self.db_manager.select("Umrah", id=debt_id)
-        elif debt_type == "Trips":
-            return self.db_manager.select("Trips", id=debt_id)
+        """سجل الدين من جدوله الأصلي (من الذاكرة المؤقتة إذا لم يتغير السجل)."""
+        if debt_type in ("Passports", "Umrah", "Trips"):
+            return self.db_manager.cache.get(
+                ("record", debt_type, int(debt_id)), [debt_type],
+                lambda: self.load_by_id(debt_id, debt_type), record_id=debt_id
+            )
+
+    def load_by_id(self, debt_id, debt_type):
+        if debt_type in ("Passports", "Umrah", "Trips"):
+            return self.db_manager.select_records(RECORD_CLASSES[debt_type], "id = ?", (debt_id,))
 
 
     def mark_debt_as_paid(self, debt_id, service_type):
@@ -88,93 +117,223 @@ class DebtService:
                 self.db_manager.update("Umrah", debt_id, remaining_amount=0)
             elif service_type == "Trips":
                 self.db_manager.update("Trips", debt_id, remaining_amount=0)
+            self.db_manager.publish(service_type, [debt_id], UPDATE)
             return True, "تم تحديث حالة الدين إلى مدفوع."
         except Exception as e:
             return False, f"حدث خطأ أثناء تحديث حالة الدين: {str(e)}"
 
     def export_to_excel(self):
+        from reports.debt_exporter import DebtExporter  # تحميل مكتبات Excel عند الحاجة فقط
         export_screen = DebtExporter(self.master, self)
 
 
     def get_payments(self, debt_type, debt_id):
-        """استرجاع المدفوعات مع التنسيق الجديد"""
-        payments = self.db_manager.select("Payments",
-            debt_type=debt_type,
-            debt_id=debt_id
-        )
-        return [{
-            "id": p[0],
-            "amount": p[3],
-            "payment_date": p[4],
-            "payment_method": p[5]
-        } for p in payments]
-    
+        """مدفوعات الدين كسجلات Payment (المبالغ عشرية)."""
+        return self.db_manager.select_records(Payment, "debt_type = ? AND debt_id = ?", (debt_type, debt_id), order_by="id")
+
+    # عدد الدفعات في كل صفحة من سجل المدفوعات
+    PAYMENTS_PAGE_SIZE = 50
+
+    def get_payments_page(self, debt_type, debt_id, after=None, limit=PAYMENTS_PAGE_SIZE):
+        """
+        صفحة من مدفوعات الدين، الأحدث أولًا، من الفهرس (debt_type, debt_id, payment_date).
+        :param after: (تاريخ الدفع، المعرف) لآخر دفعة معروضة؛ الصفحة التالية تبدأ بعدها مباشرة دون OFFSET.
+        """
+        where, params = "debt_type = ? AND debt_id = ?", (debt_type, debt_id)
+        if after is not None:
+            where += " AND (payment_date, id) < (?, ?)"
+            params += tuple(after)
+        return self.db_manager.select_records(Payment, where, params, order_by="payment_date DESC, id DESC", limit=limit)
+
+    def get_debt_summary(self, debt_id, debt_type):
+        """
+        سجل الدين مع إجماليات مدفوعاته في استعلام واحد (لرأس شاشة التفاصيل).
+        :return: (السجل، عدد الدفعات، مجموع الدفعات، تاريخ آخر دفعة) أو None إذا لم يوجد الدين.
+        """
+        if debt_type not in ("Passports", "Umrah", "Trips"):
+            return None
+        record_class = RECORD_CLASSES[debt_type]
+        make_record = record_factory(record_class)
+        size = len(record_class._fields)
+
+        def factory(cursor, row):
+            return make_record(cursor, row[:size]), row[size], from_minor(row[size + 1]), row[size + 2]
+
+        query = f"""
+            SELECT {', '.join(f'd.{field}' for field in record_class._fields)},
+                   COUNT(p.id), COALESCE(SUM(p.amount), 0), MAX(p.payment_date)
+            FROM {debt_type} d
+            LEFT JOIN Payments p ON p.debt_type = ? AND p.debt_id = d.id
+            WHERE d.id = ?
+            GROUP BY d.id
+        """
+        rows = self.db_manager.query_records(query, (debt_type, debt_id), factory)
+        return rows[0] if rows else None
+
+    # أعمدة السعر والمدفوع لكل جدول
+    PAYMENT_COLUMNS = {
+        "Passports": ("booking_price", "paid_amount"),
+        "Umrah": ("cost", "paid"),
+        "Trips": ("amount", "paid"),
+    }
+
     def add_payment(self, debt_type, debt_id, amount, payment_date, payment_method):
         """إضافة عملية دفع جديدة وتحديث المبالغ"""
         try:
-            self.db_manager.connection.execute("BEGIN TRANSACTION")
-            
-            # 1. إضافة الدفعة الجديدة
-            self.db_manager.insert("Payments", **{
-                "debt_type": debt_type,
-                "debt_id": debt_id,
-                "amount": amount,
-                "payment_date": payment_date,
-                "payment_method": payment_method,
-            })
-
-            # 2. تحديث الجدول الرئيسي
-            table_indexes = {
-                "Passports": {
-                    "price_col": 4,  # booking_price
-                    "paid_col": 7,   # paid_amount
-                    "remaining_col": 8  # remaining_amount
-                },
-                "Umrah": {
-                    "price_col": 6,  # cost
-                    "paid_col": 7,   # paid
-                    "remaining_col": 8  # remaining_amount
-                },
-                "Trips": {
-                    "price_col": 6,  # amount
-                    "paid_col": 12,  # paid
-                    "remaining_col": 13  # remaining_amount
-                }
-            }
-
-            # الحصول على البيانات الحالية
-            current_data = self.db_manager.select(debt_type, id=debt_id)[0]
-            price_idx = table_indexes[debt_type]["price_col"]
-            paid_idx = table_indexes[debt_type]["paid_col"]
-
-            total_price = current_data[price_idx]
-            current_paid = current_data[paid_idx]
-
-            # حساب القيم الجديدة
-            new_paid = float(current_paid) + float(amount)
-            new_remaining = float(total_price) - float(new_paid)
-            print(f"new_paid {new_paid}")
-            print(f"new_remaining {new_remaining}")
-
-            # تحديث الأعمدة باستخدام الفهرس
-            success, message = self.db_manager.update_by_index(
-                table_name=debt_type,
-                identifier=debt_id,
-                column_indexes=[
-                    table_indexes[debt_type]["paid_col"],  # فهرس العمود المدفوع
-                    table_indexes[debt_type]["remaining_col"]  # فهرس العمود المتبقي
-                ],
-                new_values=[new_paid, new_remaining]
-            )
+            price_column, paid_column = self.PAYMENT_COLUMNS[debt_type]
+            amount_minor = to_minor(amount)
+            if amount_minor is None:
+                raise ValueError("يجب إدخال مبلغ الدفعة")
 
-            if not success:
-                raise Exception(message)
+            with self.db_manager.transaction():
+                # 1. إضافة الدفعة الجديدة بعملة الدين نفسه
+                self.db_manager.execute_query(
+                    f"""
+                    INSERT INTO Payments (debt_type, debt_id, amount, payment_date, payment_method, currency)
+                    SELECT ?, ?, ?, ?, ?, currency FROM {debt_type} WHERE id = ?
+                    """,
+                    (debt_type, debt_id, amount_minor, payment_date, payment_method, debt_id)
+                )
+                if self.db_manager.cursor.rowcount != 1:
+                    raise ValueError("لم يتم العثور على الدين")
+                self.db_manager.publish("Payments", [self.db_manager.cursor.lastrowid], INSERT)
+
+                # 2. تحديث الجدول الرئيسي بحساب صحيح بالوحدات الصغرى داخل قاعدة البيانات
+                self.db_manager.execute_query(
+                    f"""
+                    UPDATE {debt_type}
+                    SET {paid_column} = COALESCE({paid_column}, 0) + ?,
+                        remaining_amount = COALESCE({price_column}, 0) - (COALESCE({paid_column}, 0) + ?)
+                    WHERE id = ?
+                    """,
+                    (amount_minor, amount_minor, debt_id)
+                )
+                self.db_manager.publish(debt_type, [debt_id], UPDATE)
 
-            self.db_manager.connection.commit()
             return True, "تمت إضافة الدفعة وتحديث الحسابات بنجاح"
 
         except Exception as e:
-            self.db_manager.connection.rollback()
             return False, f"فشلت العملية: {str(e)}"
-        
+
+    def get_outstanding_totals(self):
+        """
+        إجمالي الديون غير المسددة لكل عملة، محسوب بـ SUM داخل قاعدة البيانات.
+        :return: قائمة من (العملة، الإجمالي، المدفوع، المتبقي) بالوحدات الصغرى.
+        """
+        query = """
+            SELECT currency, SUM(total_amount), SUM(paid_amount), SUM(remaining_amount)
+            FROM Debts
+            WHERE remaining_amount > 0
+            GROUP BY currency
+        """
+        return self.db_manager.execute_read_query(query)
+
+    def get_payment_totals(self, start_date=None, end_date=None):
+        """
+        إجمالي المدفوعات لكل عملة خلال فترة اختيارية.
+        :return: قائمة من (العملة، عدد الدفعات، الإجمالي بالوحدات الصغرى).
+        """
+        query = "SELECT currency, COUNT(*), SUM(amount) FROM Payments"
+        conditions, params = [], []
+        if start_date:
+            conditions.append("payment_date >= ?")
+            params.append(start_date)
+        if end_date:
+            conditions.append("payment_date <= ?")
+            params.append(end_date)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " GROUP BY currency"
+        return self.db_manager.execute_read_query(query, tuple(params))
+
+    def get_consolidated_totals(self, base_currency=BASE_CURRENCY, rate_date=None):
+        """
+        إجمالي الديون غير المسددة بعملة واحدة، بتحويل مجموع كل عملة بسعر الصرف في التاريخ المحدد.
+        يتم الجمع والتحويل داخل استعلام واحد (سعر واحد لكل عملة وليس لكل صف).
+
+        :return: قاموس بالإجماليات بالوحدات الصغرى وقائمة العملات التي لا يوجد لها سعر صرف.
+        """
+        params = {
+            "base": str(base_currency),
+            "rate_date": rate_date or date.today().isoformat(),
+            "default_currency": DEFAULT_CURRENCY,
+        }
+        query = f"""
+            SELECT CAST(ROUND(SUM(total * rate)) AS INTEGER),
+                   CAST(ROUND(SUM(paid * rate)) AS INTEGER),
+                   CAST(ROUND(SUM(remaining * rate)) AS INTEGER),
+                   GROUP_CONCAT(CASE WHEN rate IS NULL THEN currency END)
+            FROM (
+                SELECT t.currency, t.total, t.paid, t.remaining,
+                       {rate_sql("t.currency", ":rate_date")} / {rate_sql(":base", ":rate_date")} AS rate
+                FROM (
+                    SELECT COALESCE(currency, :default_currency) AS currency,
+                           SUM(total_amount) AS total, SUM(paid_amount) AS paid, SUM(remaining_amount) AS remaining
+                    FROM Debts
+                    WHERE remaining_amount > 0
+                    GROUP BY 1
+                ) t
+            )
+        """
+        total, paid, remaining, missing = self.db_manager.execute_read_query(query, params)[0]
+        return {
+            "currency": params["base"],
+            "total": total or 0,
+            "paid": paid or 0,
+            "remaining": remaining or 0,
+            "missing_rates": missing.split(",") if missing else [],
+        }
+
+    # فترات أعمار الديون: (اسم الفترة، الحد الأعلى بالأيام) والفترة الأخيرة مفتوحة
+    AGING_BUCKETS = [
+        ("0-30", 30),
+        ("31-60", 60),
+        ("61-90", 90),
+        ("90+", None),
+    ]
+
+    def get_aging_report(self, as_of=None):
+        """
+        أعمار الديون غير المسددة: المتبقي في كل فترة لكل خدمة وعملة.
+        يُحسب التقرير باستعلام واحد مجمّع على عرض Debts (يستخدم فهارس الديون غير المسددة).
+        الديون بدون تاريخ تُحسب ضمن الفترة الأخيرة.
+
+        :param as_of: تاريخ احتساب العمر (افتراضيًا اليوم).
+        :return: قائمة قواميس: type, currency, count, total, وقيمة كل فترة بالوحدات الصغرى.
+        """
+        bucket_columns = []
+        lower = None
+        for label, upper in self.AGING_BUCKETS:
+            if upper is None:
+                condition = f"age > {lower} OR age IS NULL"
+            elif lower is None:
+                condition = f"age <= {upper}"
+            else:
+                condition = f"age > {lower} AND age <= {upper}"
+            bucket_columns.append(f"SUM(CASE WHEN {condition} THEN remaining_amount ELSE 0 END)")
+            lower = upper
+
+        query = f"""
+            SELECT debt_type, currency, COUNT(*), SUM(remaining_amount), {", ".join(bucket_columns)}
+            FROM (
+                SELECT debt_type, COALESCE(currency, ?) AS currency, remaining_amount,
+                       CAST(julianday(?) - julianday(debt_date) AS INTEGER) AS age
+                FROM Debts
+                WHERE remaining_amount > 0
+            )
+            GROUP BY debt_type, currency
+            ORDER BY debt_type, currency
+        """
+        rows = self.db_manager.execute_read_query(query, (DEFAULT_CURRENCY, as_of or date.today().isoformat()))
+
+        report = []
+        for debt_type, currency, count, total, *buckets in rows:
+            row = {"type": debt_type, "currency": currency, "count": count, "total": total}
+            row.update({label: amount for (label, _), amount in zip(self.AGING_BUCKETS, buckets)})
+            report.append(row)
+        return report
+
+    def export_aging_report(self):
+        from reports.aging_exporter import AgingExporter
+        export_screen = AgingExporter(self.master, self)
 #
\ No newline at end of file
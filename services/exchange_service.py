@@ -0,0 +1,132 @@
+from collections import OrderedDict
+from datetime import date
+import threading
+from database.database_manager import create_database_manager
+from database.currency import BASE_CURRENCY, CURRENCY_CODES
+from database.events import DELETE
+from database.migrations import normalize_date
+
+
+def rate_sql(currency_sql, date_sql):
+    """
+    تعبير SQL يُرجع سعر العملة بالعملة الأساسية في تاريخ معين
+    (آخر سعر مسجل بتاريخ لا يتجاوز التاريخ المطلوب). يستخدم فهرس (currency, rate_date).
+    يجب أن يكون تعبير العملة مؤهلًا باسم الجدول حتى لا يُفسر كعمود من ExchangeRates.
+    """
+    return (
+        f"(CASE WHEN {currency_sql} = '{BASE_CURRENCY}' THEN 1.0 ELSE ("
+        f"SELECT r.rate FROM ExchangeRates r WHERE r.currency = {currency_sql} AND r.rate_date <= {date_sql} "
+        f"ORDER BY r.rate_date DESC LIMIT 1) END)"
+    )
+
+
+class ExchangeRateService:
+    """
+    إدارة أسعار الصرف المؤرخة وتحويل المبالغ بين العملات.
+    الأسعار محفوظة مقابل العملة الأساسية، ويتم تخزين نتائج البحث مؤقتًا بالمفتاح (العملة، التاريخ).
+    """
+
+    CACHE_SIZE = 256
+
+    # ذاكرة مؤقتة مشتركة بين جميع النسخ (LRU)، تُمسح عند تعديل أي سعر
+    _rate_cache = OrderedDict()
+    _cache_lock = threading.Lock()
+
+    def __init__(self, master=None):
+        self.db_manager = create_database_manager()
+        self.master = master
+
+    @classmethod
+    def clear_cache(cls):
+        with cls._cache_lock:
+            cls._rate_cache.clear()
+
+    def get_rate(self, currency, rate_date=None):
+        """
+        سعر الوحدة الواحدة من العملة بالعملة الأساسية في التاريخ المحدد (افتراضيًا اليوم).
+        :return: السعر أو None إذا لم يسجل سعر لهذه العملة قبل التاريخ.
+        """
+        currency = str(currency)
+        if currency == BASE_CURRENCY:
+            return 1.0
+        key = (currency, normalize_date(rate_date) if rate_date else date.today().isoformat())
+
+        with self._cache_lock:
+            if key in self._rate_cache:
+                self._rate_cache.move_to_end(key)
+                return self._rate_cache[key]
+
+        result = self.db_manager.execute_read_query(
+            "SELECT rate FROM ExchangeRates WHERE currency = ? AND rate_date <= ? ORDER BY rate_date DESC LIMIT 1",
+            key,
+        )
+        rate = result[0][0] if result else None
+
+        with self._cache_lock:
+            self._rate_cache[key] = rate
+            if len(self._rate_cache) > self.CACHE_SIZE:
+                self._rate_cache.popitem(last=False)
+        return rate
+
+    def convert(self, amount, from_currency, to_currency=BASE_CURRENCY, rate_date=None):
+        """
+        تحويل مبلغ (بالوحدات الصغرى) من عملة إلى أخرى بأسعار التاريخ المحدد.
+        :return: المبلغ المحول بالوحدات الصغرى أو None إذا لم يتوفر سعر.
+        """
+        if amount is None:
+            return None
+        if str(from_currency) == str(to_currency):
+            return amount
+        from_rate = self.get_rate(from_currency, rate_date)
+        to_rate = self.get_rate(to_currency, rate_date)
+        if from_rate is None or not to_rate:
+            return None
+        return int(round(amount * from_rate / to_rate))
+
+    def set_rate(self, currency, rate, rate_date=None):
+        """إضافة أو تعديل سعر العملة في تاريخ معين."""
+        currency = str(currency)
+        if currency not in CURRENCY_CODES:
+            return False, "رمز العملة غير معروف"
+        if currency == BASE_CURRENCY:
+            return False, "سعر العملة الأساسية ثابت ولا يمكن تعديله"
+        try:
+            rate = float(rate)
+        except (TypeError, ValueError):
+            return False, "سعر الصرف يجب أن يكون رقمًا"
+        if rate <= 0:
+            return False, "سعر الصرف يجب أن يكون أكبر من صفر"
+
+        rate_date = normalize_date(rate_date) if rate_date else date.today().isoformat()
+        self.db_manager.execute_query(
+            "INSERT INTO ExchangeRates (currency, rate_date, rate) VALUES (?, ?, ?) "
+            "ON CONFLICT (currency, rate_date) DO UPDATE SET rate = excluded.rate",
+            (currency, rate_date, rate),
+        )
+        self.clear_cache()
+        self.db_manager.publish("ExchangeRates")
+        return True, "تم حفظ سعر الصرف بنجاح"
+
+    def delete_rate(self, rate_id):
+        self.db_manager.delete("ExchangeRates", id=rate_id)
+        self.clear_cache()
+        self.db_manager.publish("ExchangeRates", [rate_id], DELETE)
+        return True, "تم حذف سعر الصرف"
+
+    def get_rates(self, currency=None):
+        """جميع الأسعار المسجلة (الأحدث أولًا)."""
+        query = "SELECT id, currency, rate_date, rate FROM ExchangeRates"
+        params = ()
+        if currency:
+            query += " WHERE currency = ?"
+            params = (str(currency),)
+        query += " ORDER BY rate_date DESC, currency"
+        return self.db_manager.execute_read_query(query, params)
+
+    def get_latest_rates(self, rate_date=None):
+        """آخر سعر لكل عملة (غير الأساسية) في التاريخ المحدد: {رمز العملة: السعر}."""
+        return {
+            currency: self.get_rate(currency, rate_date)
+            for currency in CURRENCY_CODES
+            if currency != BASE_CURRENCY
+        }
@@ -0,0 +1,162 @@
+import os
+import csv
+from datetime import date
+from database.currency import CURRENCY_CODES, CURRENCY_BY_LABEL
+from database.money import MONEY_COLUMNS, to_minor
+
+CURRENCY_BY_ISO = {iso: code for code, iso in CURRENCY_CODES.items()}
+
+
+class ImportService:
+    """
+    استيراد السجلات من ملفات CSV أو Excel إلى جداول الخدمات.
+    يتم التحقق من جميع الصفوف أولًا ثم الإدخال في معاملة واحدة عبر دوال الإضافة في كل خدمة.
+    """
+
+    def __init__(self, master=None):
+        self.master = master
+
+    def service_class(self, table):
+        """صنف الخدمة الخاص بالجدول؛ أعمدة الملف هي FIELDS في الخدمة."""
+        if table == "passports":
+            from services.passport_service import PassportService
+            return PassportService
+        if table == "umrah":
+            from services.umrah_service import UmrahService
+            return UmrahService
+        if table == "trips":
+            from services.ticket_service import TicketService
+            return TicketService
+        raise ValueError(f"Unknown table: {table}")
+
+    def read_rows(self, file_path):
+        """
+        قراءة الصفوف من ملف CSV أو Excel (الصف الأول يحتوي على أسماء الأعمدة).
+        :return: قائمة من القواميس.
+        """
+        extension = os.path.splitext(file_path)[1].lower()
+        if extension == ".csv":
+            with open(file_path, newline="", encoding="utf-8-sig") as csv_file:
+                return [dict(row) for row in csv.DictReader(csv_file)]
+
+        if extension in (".xlsx", ".xlsm"):
+            from openpyxl import load_workbook  # تحميل مكتبة Excel عند الحاجة فقط
+            workbook = load_workbook(file_path, read_only=True, data_only=True)
+            try:
+                rows = workbook.active.iter_rows(values_only=True)
+                header = [str(cell).strip() if cell is not None else "" for cell in next(rows, ())]
+                return [
+                    dict(zip(header, row)) for row in rows
+                    if any(cell is not None for cell in row)
+                ]
+            finally:
+                workbook.close()
+
+        raise ValueError(f"Unsupported file type: {extension}")
+
+    def cell_text(self, value):
+        """
+        قيمة خلية غير مالية كنص كما في حقول الإدخال: Excel يُرجع أرقام الجواز والهاتف
+        أعدادًا (وقد تكون float) والتواريخ كائنات تاريخ.
+        """
+        if value is None:
+            return ""  # الخلايا الفارغة نصوص فارغة
+        if isinstance(value, date):
+            return value.strftime("%Y-%m-%d")
+        if isinstance(value, float) and value.is_integer():
+            return str(int(value))
+        return str(value).strip()
+
+    def normalize_row(self, table, row):
+        """
+        تحويل قيم الملف إلى نفس الأنواع التي ترسلها شاشات الإضافة:
+        المبالغ أرقام وبقية الحقول نصوص، والعملة رمز مخزن حتى لو كُتبت بالاسم.
+        """
+        service_class = self.service_class(table)
+        money_columns = MONEY_COLUMNS[service_class.TABLE_NAME]
+        data = {}
+        for column in service_class.FIELDS:
+            value = row.get(column)
+            if column not in money_columns:
+                data[column] = self.cell_text(value)
+            elif isinstance(value, (int, float)):
+                data[column] = value
+            elif value is None or not str(value).strip():
+                data[column] = 0.0
+            else:
+                try:
+                    data[column] = float(value)
+                except ValueError:
+                    data[column] = str(value).strip()  # يبقى نصًا وترفضه money_errors
+
+        # العملة تُقبل بالرمز المخزن أو الرمز الدولي أو نص العرض، وغير المعروفة يرفضها التحقق
+        currency = str(data.get("currency", ""))
+        if currency in CURRENCY_CODES:
+            data["currency"] = currency
+        elif currency.upper() in CURRENCY_BY_ISO:
+            data["currency"] = CURRENCY_BY_ISO[currency.upper()]
+        else:
+            data["currency"] = CURRENCY_BY_LABEL.get(currency, "")
+        return data
+
+    def money_errors(self, table_name, row):
+        """أخطاء المبالغ التي لا يمكن تخزينها بالوحدات الصغرى (مثل "abc" أو "1,000" أو nan)."""
+        errors = {}
+        for column in MONEY_COLUMNS[table_name]:
+            try:
+                to_minor(row.get(column))
+            except ValueError as e:
+                errors[column] = [str(e)]
+        return errors
+
+    def validate_rows(self, service, rows):
+        """
+        التحقق من جميع الصفوف بقواعد الخدمة والمبالغ معًا.
+        :return: قائمة (رقم الصف في الملف، الأخطاء) للصفوف المرفوضة.
+        """
+        errors_by_row = dict(service.validator.validate_many(rows, service.schema))
+        for index, row in enumerate(rows):
+            row_errors = errors_by_row.get(index, {})
+            money_errors = {
+                column: errors for column, errors in self.money_errors(service.TABLE_NAME, row).items()
+                if column not in row_errors  # خطأ التحقق للحقل نفسه يكفي
+            }
+            if money_errors:
+                errors_by_row[index] = {**row_errors, **money_errors}
+        # أرقام الصفوف كما تظهر في الملف (بعد صف العناوين)
+        return [(index + 2, errors) for index, errors in sorted(errors_by_row.items())]
+
+    def import_file(self, table, file_path, skip_invalid=False):
+        """
+        استيراد ملف إلى الجدول المحدد.
+
+        :param table: passports أو umrah أو trips.
+        :param skip_invalid: تجاهل الصفوف غير الصحيحة بدلًا من إلغاء الاستيراد بالكامل.
+        :return: (نجاح العملية، رسالة، قائمة (رقم الصف، الأخطاء) للصفوف المرفوضة).
+        """
+        service = self.service_class(table)(self.master)
+        columns = service.FIELDS
+
+        try:
+            rows = [self.normalize_row(table, row) for row in self.read_rows(file_path)]
+            invalid_rows = self.validate_rows(service, rows)
+        except Exception as e:
+            return False, f"فشل الاستيراد: {str(e)}", []
+        if invalid_rows and not skip_invalid:
+            return False, f"يوجد {len(invalid_rows)} صف غير صحيح، لم يتم استيراد أي بيانات", invalid_rows
+
+        skipped = {index for index, _ in invalid_rows}
+        imported = 0
+        try:
+            with service.db_manager.transaction():
+                for index, row in enumerate(rows, start=2):
+                    if index in skipped:
+                        continue
+                    success, message = service.add_record((None, *(row[column] for column in columns)))
+                    if not success:
+                        raise ValueError(f"الصف {index}: {message}")
+                    imported += 1
+        except Exception as e:
+            return False, f"فشل الاستيراد: {str(e)}", invalid_rows
+
+        return True, f"تم استيراد {imported} سجل", invalid_rows
@@ -0,0 +1,205 @@
+from database.database_manager import create_database_manager
+from database.SearchManager import SearchManager, FUZZY
+from database.suggestions import get_value_suggestions
+from database.customers import customer_key, resolve_customer_id
+from database.currency import currency_label
+from database.events import INSERT, UPDATE, DELETE
+from database.migrations import normalize_date
+from database.money import convert_fields_to_minor
+from services.validator import Validator
+from services.columns import UNKNOWN_LABEL
+
+
+class RecordService:
+    """
+    الخدمة العامة لجداول السجلات (الجوازات والعمرة والرحلات).
+
+    كل خدمة تصرّح بوصف جدولها فقط، والإضافة والتعديل والحذف والعرض والصفحات والبحث
+    والذاكرة المؤقتة مكتوبة هنا مرة واحدة:
+
+    - TABLE_NAME: اسم الجدول.
+    - RECORD: صنف السجل (database/records.py) الذي يُرجعه get_by_id.
+    - FIELDS: حقول النموذج بترتيب البيانات المرسلة من الشاشات (بعد المعرف في أول الصف).
+    - RULES: قواعد التحقق (Validator).
+    - DISPLAY: وصف العرض (DisplaySpec في services/columns.py).
+    - SEARCH_COLUMNS: أعمدة البحث.
+    - CUSTOMER_FIELDS: الحقول الممررة إلى resolve_customer_id بالترتيب.
+    - DATE_FIELDS: حقول التاريخ التي تُوحد قبل الحفظ.
+    - LABELS: قواميس تحويل الرموز المخزنة إلى نصوص لكل عمود.
+    - EXPORTER: (الوحدة، اسم الصنف) لشاشة التصدير إلى Excel.
+    """
+
+    TABLE_NAME = None
+    RECORD = None
+    FIELDS = ()
+    RULES = {}
+    DISPLAY = None
+    SEARCH_COLUMNS = []
+    CUSTOMER_FIELDS = ("name",)
+    DATE_FIELDS = ()
+    LABELS = {}
+    EXPORTER = None
+
+    def __init__(self, master):
+        self.db_manager = create_database_manager()
+        self.search_manager = SearchManager(db_manager=self.db_manager)
+        self.validator = Validator()
+        self.master = master
+        self.schema = self.validator.compile(self.RULES)  # ترجمة القواعد مرة واحدة
+
+    # ----- الكتابة -----
+
+    def record_from_form(self, data):
+        """تحويل صف النموذج (المعرف ثم FIELDS بالترتيب) إلى (المعرف، قاموس القيم)."""
+        record = dict(zip(self.FIELDS, data[1:]))
+        for field in self.DATE_FIELDS:
+            if field in record:
+                record[field] = normalize_date(record[field])
+        return data[0], record
+
+    def resolve_customer(self, record):
+        return resolve_customer_id(self.db_manager.cursor, *(record.get(field) for field in self.CUSTOMER_FIELDS))
+
+    def customer_for_update(self, record_id, record):
+        """
+        العميل المرتبط بالسجل بعد التعديل: يبقى العميل المخزن ما لم يتغير رقم الجواز أو الهاتف
+        (حقول CUSTOMER_FIELDS بعد الاسم)، حتى لا ينقسم كشف حساب العميل عند تصحيح الاسم.
+        """
+        identifiers = self.CUSTOMER_FIELDS[1:]
+        columns = ", ".join(("customer_id",) + identifiers)
+        self.db_manager.cursor.execute(f"SELECT {columns} FROM {self.TABLE_NAME} WHERE id = ?", (record_id,))
+        row = self.db_manager.cursor.fetchone()
+        if row and row[0] is not None and all(field in record for field in identifiers):
+            if customer_key(None, *row[1:]) == customer_key(None, *(record[field] for field in identifiers)):
+                return row[0]
+        return self.resolve_customer(record)
+
+    def add_record(self, data):
+        """إضافة سجل جديد بعد التحقق من البيانات."""
+        _, record = self.record_from_form(data)
+        if not self.validator.validate(record, self.schema):
+            errors = self.validator.get_errors()
+            return False, "\n".join([f"{field}: {', '.join(errs)}" for field, errs in errors.items()])
+
+        try:
+            convert_fields_to_minor(record, self.TABLE_NAME)  # المبالغ تُخزن بالوحدات الصغرى
+        except ValueError as e:
+            return False, str(e)
+        with self.db_manager.lock:
+            record["customer_id"] = self.resolve_customer(record)
+            record_id = self.db_manager.insert(self.TABLE_NAME, **record)
+        self.db_manager.publish(self.TABLE_NAME, [record_id], INSERT)
+        return True, "تمت إضافة البيانات بنجاح."
+
+    def save_data(self, data, master=None):
+        # الشاشة تتحدث عبر ناقل الأحداث بعد الإضافة
+        return self.add_record(data)
+
+    def update_data(self, data, master=None):
+        """تحديث سجل موجود (المعرف في أول صف النموذج)."""
+        try:
+            record_id, record = self.record_from_form(data)
+            convert_fields_to_minor(record, self.TABLE_NAME)
+        except ValueError as e:
+            return False, str(e)
+        try:
+            with self.db_manager.lock:
+                record["customer_id"] = self.customer_for_update(record_id, record)
+                self.db_manager.update(self.TABLE_NAME, record_id, **record)
+            self.db_manager.publish(self.TABLE_NAME, [record_id], UPDATE)
+            return True, "تم تحديث البيانات بنجاح!"
+        except Exception as e:
+            return False, f"حدث خطأ أثناء تحديث البيانات: {str(e)}"
+
+    def delete_data(self, record_id):
+        """حذف سجل باستخدام id."""
+        try:
+            self.db_manager.delete(self.TABLE_NAME, id=record_id)
+            self.db_manager.publish(self.TABLE_NAME, [record_id], DELETE)
+            return True, "تم حذف البيانات بنجاح!"
+        except Exception as e:
+            return False, f"حدث خطأ أثناء حذف البيانات: {str(e)}"
+
+    # ----- القراءة -----
+
+    def get_all_data(self):
+        """جميع السجلات جاهزة للعرض بترتيب أعمدة DISPLAY."""
+        return self.DISPLAY.fetch(self.db_manager)
+
+    def get_rows_by_ids(self, ids):
+        """صفوف العرض للسجلات المعدلة فقط."""
+        return self.DISPLAY.fetch_ids(self.db_manager, ids)
+
+    def get_page(self, page, per_page):
+        """صفحة من بيانات العرض مع العدد الكلي (من الذاكرة المؤقتة إذا لم تتغير البيانات)."""
+        return self.db_manager.cache.get(
+            ("page", self.TABLE_NAME, page, per_page), [self.TABLE_NAME],
+            lambda: self.DISPLAY.fetch_page(self.db_manager, page, per_page)
+        )
+
+    def get_by_id(self, record_id):
+        """السجل كاملًا كـ RECORD بالمبالغ العشرية (من الذاكرة المؤقتة إذا لم يتغير السجل)."""
+        return self.db_manager.cache.get(
+            ("record", self.TABLE_NAME, int(record_id)), [self.TABLE_NAME],
+            lambda: self.load_by_id(record_id), record_id=record_id
+        )
+
+    def load_by_id(self, record_id):
+        records = self.db_manager.select_records(self.RECORD, "id = ?", (record_id,))
+        return records[0] if records else None
+
+    # ----- البحث -----
+
+    def search_data(self, search_term: str, mode: str = None):
+        """
+        البحث في قاعدة البيانات باستخدام مصطلح البحث.
+        رقم الجواز أو الهاتف يُبحث عنه بالبادئة عبر الفهرس تلقائيًا؛ mode يفرض نمطًا محددًا.
+        إذا لم توجد نتائج لاسم يُبحث عنه تقريبيًا (أخطاء الإملاء)، وFUZZY يفرض ذلك مباشرة.
+        """
+        if not search_term:
+            return self.get_all_data()
+        if mode == FUZZY:
+            return self.search_fuzzy(search_term)
+
+        condition, params = self.search_manager.search_condition(self.SEARCH_COLUMNS, search_term, mode)
+        rows = self.DISPLAY.fetch(self.db_manager, condition, params)
+        if not rows and self.search_manager.fuzzy_fallback(search_term, mode):
+            return self.search_fuzzy(search_term)
+        return rows
+
+    def search_with_keys(self, search_term: str, mode: str = None):
+        """نتيجة search_data مع مفتاح البحث لكل صف: [(الصف، المفتاح)] (تستخدمها SearchSession)."""
+        condition, params = self.search_manager.search_condition(self.SEARCH_COLUMNS, search_term, mode)
+        key = self.search_manager.search_key(self.SEARCH_COLUMNS, search_term, mode)
+        rows = self.DISPLAY.fetch(self.db_manager, condition, params, extra_columns=[key])
+        if not rows and self.search_manager.fuzzy_fallback(search_term, mode):
+            # نتائج البحث التقريبي ليس لها مفتاح بحث فلا تُصفّى في الذاكرة
+            return [(row, None) for row in self.search_fuzzy(search_term)]
+        return [(row[:-1], row[-1]) for row in rows]
+
+    def search_fuzzy(self, search_term: str):
+        """أقرب الأسماء إلى النص من الفهرس التقريبي، بترتيب القرب."""
+        ids = self.search_manager.fuzzy_ids(self.TABLE_NAME, search_term)
+        rows = {row[0]: row for row in self.DISPLAY.fetch_ids(self.db_manager, ids)}
+        return [rows[record_id] for record_id in ids if record_id in rows]
+
+    def suggest(self, column, prefix):
+        """القيم المستخدمة سابقًا في العمود التي تبدأ بالنص، الأكثر استخدامًا أولًا (من الذاكرة)."""
+        return get_value_suggestions().suggest(self.TABLE_NAME, column, prefix)
+
+    # ----- التنسيق والتصدير -----
+
+    def format_currency(self, currency_code):
+        """تحويل رمز العملة المخزن في قاعدة البيانات إلى نص."""
+        return currency_label(currency_code)
+
+    def format_label(self, column, code):
+        """تحويل رمز مخزن في عمود له قاموس في LABELS إلى نص."""
+        return self.LABELS[column].get(code, UNKNOWN_LABEL)
+
+    def export_to_excel(self):
+        """فتح نافذة تصدير البيانات إلى Excel (تحميل مكتبات Excel عند الحاجة فقط)."""
+        import importlib
+        module_name, class_name = self.EXPORTER
+        exporter = getattr(importlib.import_module(module_name), class_name)
+        return exporter(self.master)
@@ -1,26 +1,12 @@
-class Validator:
-    def __init__(self):
-        self.errors = {}  # لتخزين الأخطاء لكل حقل
-
-    def validate(self, data, rules):
-        """
-        يقوم بالتحقق من البيانات بناءً على القواعد المحددة.
-        :param data: البيانات المراد التحقق منها (قاموس).
-        :param rules: القواعد لكل حقل (قاموس).
-        :return: True إذا كانت البيانات صحيحة، False إذا كانت هناك أخطاء.
-        """
-        self.errors = {}  # إعادة تهيئة قائمة الأخطاء
-        is_valid = True
+class Schema:
+    """
+    مجموعة قواعد مترجمة: يتم تحليل نص كل قاعدة والبحث عن دالتها مرة واحدة فقط.
+    """
 
+    def __init__(self, validator, rules):
+        self.fields = []
         for field, field_rules in rules.items():
-            if field not in data:
-                self.errors[field] = ["الحقل غير موجود."]
-                is_valid = False
-                continue
-
-            value = data[field]
-            field_errors = []
-
+            checks = []
             for rule in field_rules:
                 if ":" in rule:
                     rule_name, rule_value = rule.split(":")
@@ -29,19 +15,77 @@ class Validator:
                     rule_name = rule
                     rule_value = None
 
-                # استدعاء الدالة المناسبة بناءً على اسم القاعدة
-                if hasattr(self, f"rule_{rule_name}"):
-                    error = getattr(self, f"rule_{rule_name}")(value, rule_value)
-                    if error:
-                        field_errors.append(error)
-                else:
+                rule_method = getattr(validator, f"rule_{rule_name}", None)
+                if rule_method is None:
                     raise ValueError(f"Unknown validation rule: {rule_name}")
+                checks.append((rule_method, rule_value))
+            self.fields.append((field, tuple(checks)))
+
+    def check(self, data):
+        """
+        التحقق من صف واحد.
+        :return: قاموس الأخطاء لكل حقل (فارغ إذا كانت البيانات صحيحة).
+        """
+        errors = {}
+        for field, checks in self.fields:
+            if field not in data:
+                errors[field] = ["الحقل غير موجود."]
+                continue
+
+            value = data[field]
+            field_errors = []
+            for rule_method, rule_value in checks:
+                error = rule_method(value, rule_value)
+                if error:
+                    field_errors.append(error)
 
             if field_errors:
-                self.errors[field] = field_errors
-                is_valid = False
+                errors[field] = field_errors
+        return errors
+
+
+class Validator:
+    def __init__(self):
+        self.errors = {}  # لتخزين الأخطاء لكل حقل
+
+    def compile(self, rules):
+        """
+        تحويل القواعد النصية (مثل "min:3") إلى مخطط جاهز للتنفيذ مرة واحدة.
+        :param rules: القواعد لكل حقل (قاموس).
+        :return: كائن Schema يمكن إعادة استخدامه في كل عملية تحقق.
+        """
+        return Schema(self, rules)
 
-        return is_valid
+    def validate(self, data, rules):
+        """
+        يقوم بالتحقق من البيانات بناءً على القواعد المحددة.
+        :param data: البيانات المراد التحقق منها (قاموس).
+        :param rules: القواعد لكل حقل (قاموس) أو مخطط مترجم مسبقًا (Schema).
+        :return: True إذا كانت البيانات صحيحة، False إذا كانت هناك أخطاء.
+        """
+        schema = rules if isinstance(rules, Schema) else self.compile(rules)
+        self.errors = schema.check(data)
+        return not self.errors
+
+    def validate_many(self, rows, rules):
+        """
+        التحقق من مجموعة كبيرة من الصفوف مع جمع الأخطاء لكل صف.
+        :param rows: قائمة من القواميس.
+        :param rules: القواعد لكل حقل (قاموس) أو مخطط مترجم مسبقًا (Schema).
+        :return: قائمة من (رقم الصف، الأخطاء) للصفوف غير الصحيحة فقط.
+        """
+        schema = rules if isinstance(rules, Schema) else self.compile(rules)
+        check = schema.check
+        invalid_rows = []
+        for index, row in enumerate(rows):
+            try:
+                errors = check(row)
+            except Exception as e:
+                # قيمة من نوع غير متوقع لا توقف التحقق من بقية الصفوف
+                errors = {"row": [f"تعذر التحقق من الصف: {e}"]}
+            if errors:
+                invalid_rows.append((index, errors))
+        return invalid_rows
 
     def get_errors(self):
         """إرجاع الأخطاء."""
@@ -87,12 +131,14 @@ class Validator:
 
     def rule_email(self, value, _):
         """التحقق من أن القيمة بريد إلكتروني صحيح."""
+        value = str(value)
         if "@" not in value or "." not in value:
             return "يجب أن تكون القيمة بريدًا إلكترونيًا صحيحًا."
         return None
 
     def rule_phone(self, value, _):
         """التحقق من أن القيمة رقم هاتف صحيح."""
+        value = str(value)
         if not value.isdigit() or len(value) != 9:
             return "يجب أن تكون القيمة رقم هاتف صحيح"
         return None
\ No newline at end of file
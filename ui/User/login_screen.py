@@ -2,7 +2,7 @@
 import tkinter as tk
 from tkinter import messagebox
 import sqlite3
-from database.database_manager import DatabaseManager
+from database.database_manager import create_database_manager
 
 # إعدادات التنسيق العامة
 BG_COLOR = "#f0f0f0"
@@ -146,7 +146,7 @@ class LoginScreen(tk.Toplevel):
         if not self.validate_fields({"اسم المستخدم": username, "كلمة المرور": password}):
             return
             
-        db = DatabaseManager()
+        db = create_database_manager()
         user_exists = db.exists("Users", username=username, password=password)
         db.close()
         
@@ -173,7 +173,7 @@ class LoginScreen(tk.Toplevel):
             messagebox.showerror("خطأ", "كلمات المرور غير متطابقة!")
             return
             
-        db = DatabaseManager()
+        db = create_database_manager()
         try:
             db.insert("Users", username=username, password=password)
             messagebox.showinfo("نجاح", "تم إنشاء الحساب بنجاح!")
@@ -2,6 +2,7 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 from tkcalendar import DateEntry
 from services.passport_service import PassportService
+from database.currency import CURRENCY_LABELS, currency_code
 
 class AddPassportScreen(tk.Frame):
     def __init__(self, master, return_callback, service):
@@ -66,7 +67,7 @@ class AddPassportScreen(tk.Frame):
 
         self.remaining_amount_label = self.create_field(outer_frame, "المبلغ المتبقي", row=5, column=0, label_var=self.remaining_amount)
 
-        self.currency_combobox = self.create_field(outer_frame, "العملة", row=5, column=2, combobox_values=["ر.ي", "ر.س", "دولار"])
+        self.currency_combobox = self.create_field(outer_frame, "العملة", row=5, column=2, combobox_values=list(CURRENCY_LABELS.values()))
 
         # حالة الجواز
         self.status_combobox = self.create_field(outer_frame, "حالة الجواز", row=6, column=0, combobox_values=["في الطابعة", "في المكتب", "تم الاستلام", "مرفوض"])
@@ -136,11 +137,10 @@ class AddPassportScreen(tk.Frame):
             self.remaining_amount.set("0.00")
 
     def save(self):
-        currency_map = {"ر.ي": "1", "ر.س": "2", "دولار": "3"}
         status_map = {"في الطابعة": "1", "في المكتب": "2", "تم الاستلام": "3", "مرفوض": "4"}
         type_map = {"عادي": "1", "مستعجل عدن": "2", "مستعجل بيومه": "3", "غير ذلك": "4"}
 
-        currency = currency_map.get(self.currency_combobox.get(), "1")
+        currency = currency_code(self.currency_combobox.get())
         status = status_map.get(self.status_combobox.get(), "1")
         type_ = type_map.get(self.type_combobox.get(), "1")
 
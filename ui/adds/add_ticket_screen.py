@@ -1,7 +1,9 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 from tkcalendar import DateEntry
+from ui.autocomplete import make_entry
 from services.ticket_service import TicketService
+from database.currency import CURRENCY_LABELS, currency_code
 
 class AddTicketScreen(tk.Frame):
     def __init__(self, master, return_callback, service):
@@ -43,19 +45,19 @@ class AddTicketScreen(tk.Frame):
         self.name_entry = self.create_field(outer_frame, "الاسم", row=1, column=0)
         self.passport_number_entry = self.create_field(outer_frame, "رقم الجواز", row=1, column=2)
 
-        self.from_place_entry = self.create_field(outer_frame, "من مدينه ", row=2, column=0)
-        self.to_place_entry = self.create_field(outer_frame, "إلى مدينه", row=2, column=2)
+        self.from_place_entry = self.create_field(outer_frame, "من مدينه ", row=2, column=0, suggest_column="from_place")
+        self.to_place_entry = self.create_field(outer_frame, "إلى مدينه", row=2, column=2, suggest_column="to_place")
 
-        self.company_entry = self.create_field(outer_frame, "الشركة الناقلة", row=3, column=0)
+        self.company_entry = self.create_field(outer_frame, "الشركة الناقلة", row=3, column=0, suggest_column="booking_company")
         self.amount_entry = self.create_field(outer_frame, "المبلغ", row=3, column=2)
-        self.currency_combobox = self.create_field(outer_frame, "العملة", row=4, column=0, combobox_values=["ر.ي", "ر.س", "دولار"])
+        self.currency_combobox = self.create_field(outer_frame, "العملة", row=4, column=0, combobox_values=list(CURRENCY_LABELS.values()))
         self.agent_entry = self.create_field(outer_frame, "للوكيل", row=4, column=2)
         self.agent_entry.bind("<KeyRelease>", self.calculate_net)
 
         self.net_amount_label = self.create_field(outer_frame, "الصافي", row=5, column=0, label_var=self.net_amount)
 
         self.trip_date_entry = self.create_date_field(outer_frame, "تاريخ الرحلة", row=5, column=2)
-        self.office_combobox = self.create_field(outer_frame, "المكتب", row=6, column=0, combobox_values=["مكتبنا", "الوادي", "طايف"])
+        self.office_combobox = self.create_field(outer_frame, "المكتب", row=6, column=0, combobox_values=["مكتبنا", "الوادي", "طايف"], suggest_column="office_name")
 
         self.paid_entry = self.create_field(outer_frame, "المدفوع", row=6, column=2, entry_var=self.paid_amount)
         self.remaining_amount_label = self.create_field(outer_frame, "المتبقي", row=7, column=0, label_var=self.remaining_amount)
@@ -68,8 +70,11 @@ class AddTicketScreen(tk.Frame):
         for i in range(4):
             outer_frame.grid_columnconfigure(i, weight=1, uniform="col")
 
-    def create_field(self, parent, label_text, row, column, entry_var=None, label_var=None, combobox_values=None):
-        if combobox_values is None:
+    def create_field(self, parent, label_text, row, column, entry_var=None, label_var=None, combobox_values=None, suggest_column=None):
+        if suggest_column is not None:
+            widget = make_entry(parent, self.service, suggest_column, defaults=combobox_values)
+            widget.grid(row=row, column=column, padx=(5, 5), pady=10, sticky="ew")
+        elif combobox_values is None:
             if label_var is not None:
                 widget = ttk.Label(parent, textvariable=label_var, style="Bold.TLabel", justify="center")
                 widget.grid(row=row, column=column, padx=(5, 5), pady=10, sticky="ew")
@@ -135,8 +140,7 @@ class AddTicketScreen(tk.Frame):
             messagebox.showerror("خطأ", "يرجى إدخال قيم رقمية صحيحة.")
             return
 
-        currency_map = {"ر.ي": "1", "ر.س": "2", "دولار": "3"}
-        currency = currency_map.get(self.currency_combobox.get(), "1")
+        currency = currency_code(self.currency_combobox.get())
 
         data = (
             len(self.master.table.get_children()) + 1,
@@ -1,7 +1,9 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 from tkcalendar import DateEntry  # استيراد DateEntry
+from ui.autocomplete import make_entry
 from services.umrah_service import UmrahService
+from database.currency import CURRENCY_LABELS, currency_code
 
 class AddUmrahScreen(tk.Frame):
     def __init__(self, master, return_callback, service):
@@ -49,7 +51,7 @@ class AddUmrahScreen(tk.Frame):
 
         # Row 2
         self.phone_number_entry = self.create_field(outer_frame, "رقم الهاتف", row=2, column=0)
-        self.sponsor_name_entry = self.create_field(outer_frame, "اسم الضمين", row=2, column=2)
+        self.sponsor_name_entry = self.create_field(outer_frame, "اسم الضمين", row=2, column=2, suggest_column="sponsor_name")
 
         # Row 3
         self.sponsor_number_entry = self.create_field(outer_frame, "رقم الضمين", row=3, column=0)
@@ -69,7 +71,7 @@ class AddUmrahScreen(tk.Frame):
         self.status_combobox = self.create_field(outer_frame, "الحالة", row=6, column=0, combobox_values=["مهم", "غير مهم"])
 
         # Row 7: إضافة Combobox لاختيار العملة
-        self.currency_combobox = self.create_field(outer_frame, "العملة", row=6, column=2, combobox_values=["ر.ي", "ر.س", "دولار"])
+        self.currency_combobox = self.create_field(outer_frame, "العملة", row=6, column=2, combobox_values=list(CURRENCY_LABELS.values()))
 
         # Save Button
         save_button = ttk.Button(outer_frame, text="حفظ", style="Blue.TButton", width=50, command=self.save)
@@ -79,9 +81,12 @@ class AddUmrahScreen(tk.Frame):
         for i in range(4):  # 4 columns
             outer_frame.grid_columnconfigure(i, weight=1, uniform="col")
 
-    def create_field(self, parent, label_text, row, column, entry_var=None, label_var=None, combobox_values=None):
+    def create_field(self, parent, label_text, row, column, entry_var=None, label_var=None, combobox_values=None, suggest_column=None):
         """Helper function to create a label and its corresponding widget."""
-        if combobox_values is None:
+        if suggest_column is not None:
+            widget = make_entry(parent, self.service, suggest_column, defaults=combobox_values)
+            widget.grid(row=row, column=column, padx=(5, 5), pady=10, sticky="ew")
+        elif combobox_values is None:
             if label_var is not None:
                 widget = ttk.Label(parent, textvariable=label_var, style="Bold.TLabel", justify="center")
                 widget.grid(row=row, column=column, padx=(5, 5), pady=10, sticky="ew")
@@ -155,8 +160,7 @@ class AddUmrahScreen(tk.Frame):
     def save(self):
         """Handle saving the new umrah data."""
         # خريطة لتحويل نص العملة إلى رمز
-        currency_map = {"ر.ي": "1", "ر.س": "2", "دولار": "3"}
-        currency = currency_map.get(self.currency_combobox.get(), "1")  # افتراضيًا "ر.ي" إذا لم يتم العثور على النص
+        currency = currency_code(self.currency_combobox.get())  # افتراضيًا "ر.ي" إذا لم يتم العثور على النص
         
         # التحقق من أن القيم المدخلة ليست فارغة أو غير صالحة
         try:
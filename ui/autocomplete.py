@@ -0,0 +1,87 @@
+import logging
+import tkinter as tk
+from tkinter import ttk
+from database.suggestions import get_value_suggestions
+from ui.background import run_in_background
+
+# مفاتيح لا تغير النص المكتوب (أو تحذف منه) فلا يُكمل بعدها
+IGNORED_KEYS = {
+    "BackSpace", "Delete", "Left", "Right", "Up", "Down", "Home", "End", "Tab", "Return", "Escape",
+    "Shift_L", "Shift_R", "Control_L", "Control_R", "Alt_L", "Alt_R", "Caps_Lock",
+}
+
+logger = logging.getLogger(__name__)
+
+
+class AutocompleteEntry(ttk.Combobox):
+    """
+    حقل نصي حر مع إكمال تلقائي من القيم المستخدمة سابقًا (database/suggestions.py).
+
+    أثناء الكتابة يُكمل الحقل بأكثر قيمة استخدامًا تبدأ بالنص المكتوب (الجزء المكمل محدد،
+    فيستمر المستخدم في الكتابة أو يقبله بـ Enter)، والقائمة المنسدلة تعرض بقية الاقتراحات.
+    الاقتراحات من الذاكرة فلا يوجد استعلام لكل حرف (ولا انتظار للتحميل في خيط Tk).
+    """
+
+    def __init__(self, master, suggest, defaults=(), **kwargs):
+        """
+        :param suggest: دالة (النص المكتوب) -> قائمة القيم المقترحة.
+        :param defaults: قيم ثابتة تظهر في القائمة عندما لا توجد اقتراحات.
+        """
+        super().__init__(master, values=list(defaults), postcommand=self.update_values, **kwargs)
+        self.suggest = suggest
+        self.defaults = list(defaults)
+        self.bind("<KeyRelease>", self.on_key_release, add="+")
+        self.bind("<Return>", self.accept_completion, add="+")
+        # تحميل القيم في الخلفية حتى لا ينتظر أول حرف تحميلها
+        run_in_background(self, get_value_suggestions().preload, key="suggestions")
+
+    def typed_text(self):
+        """النص الذي كتبه المستخدم (بدون الجزء المكمل المحدد)."""
+        return self.get()[:self.index(tk.INSERT)]
+
+    def suggestions(self, text):
+        try:
+            return self.suggest(text) or self.defaults
+        except Exception:
+            logger.exception("Failed to load suggestions")
+            return self.defaults
+
+    def update_values(self):
+        self.configure(values=self.suggestions(self.typed_text()))
+
+    def on_key_release(self, event):
+        if event.keysym in IGNORED_KEYS:
+            return
+        typed = self.typed_text()
+        if not typed.strip():
+            return
+        values = self.suggestions(typed)
+        self.configure(values=values)
+
+        # الإكمال داخل الحقل فقط إذا بدأت القيمة بالنص كما كُتب تمامًا
+        completion = next((value for value in values if value.startswith(typed) and value != typed), None)
+        if completion is not None:
+            position = len(typed)
+            self.delete(0, tk.END)
+            self.insert(0, completion)
+            self.icursor(position)
+            self.selection_range(position, tk.END)
+
+    def accept_completion(self, event=None):
+        if self.selection_present():
+            self.selection_clear()
+            self.icursor(tk.END)
+
+
+def make_entry(parent, service, column, defaults=None):
+    """
+    حقل نص حر للنماذج مع إكمال من القيم المستخدمة سابقًا في عمود جدول الخدمة
+    (القيم الثابتة تظهر إذا لم توجد اقتراحات، وأولها هو القيمة الابتدائية).
+    """
+    entry = AutocompleteEntry(
+        parent, lambda prefix: service.suggest(column, prefix), defaults=defaults or (),
+        font=("Arial", 12), width=23, style="Rounded.TCombobox", justify="center"
+    )
+    if defaults:
+        entry.current(0)
+    return entry
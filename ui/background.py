@@ -0,0 +1,60 @@
+import logging
+from database.executor import get_executor
+
+POLL_INTERVAL_MS = 15
+
+logger = logging.getLogger(__name__)
+
+
+def run_in_background(widget, func, *args, on_success=None, on_error=None, key=None, executor=None):
+    """
+    تنفيذ دالة الوصول للبيانات في خيط قاعدة البيانات وإعادة النتيجة إلى خيط Tk عبر after().
+
+    :param widget: عنصر Tk الذي يملك العملية (يتم تجاهل النتيجة إذا أُغلق).
+    :param func: الدالة المراد تنفيذها في الخلفية.
+    :param on_success: دالة تُستدعى بالنتيجة في خيط Tk.
+    :param on_error: دالة تُستدعى بالاستثناء في خيط Tk (بدونها يُسجل الخطأ في السجل).
+    :param key: مفتاح اختياري؛ عند تكرار الطلب بنفس المفتاح يتم تجاهل نتائج الطلبات الأقدم.
+    :param executor: منفذ بديل (مثل منفذ الصيانة) بدلًا من خيط قاعدة البيانات المشترك.
+    :return: كائن Future.
+    """
+    future = (executor or get_executor()).submit(func, *args)
+
+    if key is not None:
+        if not hasattr(widget, "_background_calls"):
+            widget._background_calls = {}
+        widget._background_calls[key] = future
+
+    def poll():
+        try:
+            if not widget.winfo_exists():
+                return
+        except Exception:
+            return
+
+        if not future.done():
+            widget.after(POLL_INTERVAL_MS, poll)
+            return
+
+        # نتيجة قديمة تم استبدالها بطلب أحدث
+        if key is not None and widget._background_calls.get(key) is not future:
+            return
+
+        error = future.exception()
+        if error is not None:
+            if on_error:
+                on_error(error)
+            else:
+                logger.error("Background task failed", exc_info=error)
+        elif on_success:
+            on_success(future.result())
+
+    widget.after(POLL_INTERVAL_MS, poll)
+    return future
+
+
+def cancel_background(widget, key):
+    """تجاهل نتيجة الطلب الجاري بهذا المفتاح (عندما تُعرض نتيجة أحدث دون طلب جديد)."""
+    calls = getattr(widget, "_background_calls", None)
+    if calls:
+        calls.pop(key, None)
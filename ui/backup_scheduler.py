@@ -0,0 +1,80 @@
+import time
+from datetime import datetime, timedelta
+from database.executor import DataExecutor
+from services.backup_service import BackupService
+from ui.background import run_in_background
+
+# أحداث تدل على أن المستخدم يعمل على البرنامج
+ACTIVITY_EVENTS = ("<KeyPress>", "<ButtonPress>", "<MouseWheel>")
+
+
+class BackupScheduler:
+    """
+    جدولة النسخ الاحتياطي والضغط في أوقات الخمول باستخدام after() في Tk.
+    العمل يتم في خيط صيانة مستقل حتى لا يتأخر تحميل الشاشات.
+    """
+
+    def __init__(self, root, service=None, interval_hours=24, idle_seconds=120,
+                 compact_every=7, check_interval_ms=60000):
+        self.root = root
+        self.service = service or BackupService(root)
+        self.interval = timedelta(hours=interval_hours)
+        self.idle_seconds = idle_seconds
+        self.compact_every = compact_every
+        self.check_interval_ms = check_interval_ms
+        self.executor = DataExecutor(thread_name_prefix="taif-maintenance")
+        self.last_activity = time.monotonic()
+        self.backups_since_compact = 0
+        self.running = False
+        self.last_result = None
+
+    def start(self):
+        for event in ACTIVITY_EVENTS:
+            self.root.bind_all(event, self.on_activity, add="+")
+        self.root.after(self.check_interval_ms, self.check)
+
+    def stop(self):
+        self.executor.shutdown(wait=False)
+
+    def on_activity(self, event=None):
+        self.last_activity = time.monotonic()
+
+    def is_due(self):
+        last_backup = self.service.last_backup_time()
+        return last_backup is None or datetime.now() - last_backup >= self.interval
+
+    def check(self):
+        """فحص دوري: يبدأ النسخ فقط إذا كان البرنامج خاملًا وحان موعد النسخة التالية."""
+        try:
+            idle = time.monotonic() - self.last_activity >= self.idle_seconds
+            if not self.running and idle and self.is_due():
+                self.running = True
+                run_in_background(
+                    self.root,
+                    self.run_maintenance,
+                    on_success=self.on_maintenance_done,
+                    on_error=self.on_maintenance_error,
+                    executor=self.executor,
+                )
+        finally:
+            self.root.after(self.check_interval_ms, self.check)
+
+    def run_maintenance(self):
+        """نسخة احتياطية متحقق منها، ثم ضغط قاعدة البيانات كل (compact_every) نسخة."""
+        results = {"backup": self.service.backup()}
+        self.backups_since_compact += 1
+        if self.compact_every and self.backups_since_compact >= self.compact_every:
+            results["compact"] = self.service.compact()
+            self.backups_since_compact = 0
+        return results
+
+    def on_maintenance_done(self, results):
+        self.running = False
+        self.last_result = results
+        success, message, _ = results["backup"]
+        if not success:
+            print(message)
+
+    def on_maintenance_error(self, error):
+        self.running = False
+        print(f"Backup failed: {error}")
@@ -1,6 +1,11 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 import math
+from ui.background import run_in_background, cancel_background
+from ui.events import listen
+from database.events import UPDATE
+from database.search_session import SearchSession
+from ui.table_renderer import TableRenderer
 
 class BaseScreen(tk.Frame):
     def __init__(self, master, service, add_screen_class, edit_screen_class, columns):
@@ -13,6 +18,7 @@ class BaseScreen(tk.Frame):
 
         self.current_page = 1
         self.rows_per_page = 10
+        self.total_rows = 0
 
         self.grid_rowconfigure(2, weight=1)
         self.grid_columnconfigure(0, weight=1)
@@ -38,6 +44,15 @@ class BaseScreen(tk.Frame):
         self.buttons_visible = False
         self.previous_selected_item = None
 
+        # نتائج البحث أثناء الكتابة تُصفّى في الذاكرة عند إطالة النص
+        self.search_session = SearchSession(
+            self.service.search_with_keys, self.service.search_manager,
+            self.service.SEARCH_COLUMNS, [self.service.TABLE_NAME]
+        )
+
+        # تحديث الجدول عند تغير بياناته من أي شاشة أو خدمة
+        listen(self, [self.service.TABLE_NAME], self.on_data_changed)
+
     def create_pagination_controls(self):
         self.grid_rowconfigure(1, weight=1)
 
@@ -94,8 +109,7 @@ class BaseScreen(tk.Frame):
             self.refresh_table()
 
     def go_to_next_page(self):
-        total_rows = len(self.service.get_all_data())
-        total_pages = math.ceil(total_rows / self.rows_per_page)
+        total_pages = math.ceil(self.total_rows / self.rows_per_page)
 
         if self.current_page < total_pages:
             self.current_page += 1
@@ -103,8 +117,7 @@ class BaseScreen(tk.Frame):
             self.refresh_table()
     
     def update_pagination_controls(self):
-        total_rows = len(self.service.get_all_data())
-        total_pages = math.ceil(total_rows / self.rows_per_page)
+        total_pages = math.ceil(self.total_rows / self.rows_per_page)
 
         self.page_label.config(text=f"الصفحة: {self.current_page}")
 
@@ -113,16 +126,51 @@ class BaseScreen(tk.Frame):
         else:
             self.previous_button.config(state=tk.NORMAL)
 
-        if self.current_page == total_pages:
+        if self.current_page >= total_pages:
             self.next_button.config(state=tk.DISABLED)
         else:
             self.next_button.config(state=tk.NORMAL)
         
     def refresh_table(self):
-        all_data = self.service.get_all_data()
-        start_index = (self.current_page - 1) * self.rows_per_page
-        end_index = start_index + self.rows_per_page
-        self.populate_table(all_data[start_index:end_index])
+        # الصفحة الحالية فقط (LIMIT/OFFSET) ومن الذاكرة المؤقتة إذا لم تتغير البيانات
+        run_in_background(self, self.service.get_page, self.current_page, self.rows_per_page, on_success=self.on_page_loaded, on_error=self.on_load_error, key="table")
+
+    def on_page_loaded(self, result):
+        rows, self.total_rows = result
+        if not rows and self.current_page > 1:
+            # الصفحة الحالية لم تعد موجودة بعد الحذف
+            self.current_page = max(math.ceil(self.total_rows / self.rows_per_page), 1)
+            self.refresh_table()
+            return
+        self.populate_table(rows)
+        if hasattr(self, "page_label"):
+            self.update_pagination_controls()
+
+    def on_load_error(self, error):
+        messagebox.showerror("خطأ", f"تعذر تحميل البيانات: {error}")
+
+    def on_data_changed(self, event):
+        """
+        عند التعديل تُجلب الصفوف المعروضة التي تغيرت فقط وتُحدّث في مكانها؛
+        الإضافة والحذف يغيران الترقيم، لذلك تُعاد الصفحة الحالية (أو نتيجة البحث).
+        """
+        if event.operation == UPDATE and event.ids is not None:
+            changed = [record_id for record_id in self.visible_items() if record_id in event.ids]
+            if changed:
+                run_in_background(self, self.service.get_rows_by_ids, changed, on_success=self.update_rows, on_error=self.on_load_error)
+            return
+        self.on_search()
+
+    def visible_items(self):
+        """المعرفات المعروضة حاليًا وعناصرها في الجدول."""
+        return {int(record_id): item for item, (record_id,) in self.renderer.item_values(0)}
+
+    def update_rows(self, rows):
+        items = self.visible_items()
+        for row in rows:
+            item = items.get(row[0])
+            if item is not None:
+                self.renderer.update_row(item, row)
     
 
     def create_buttons(self):
@@ -193,6 +241,7 @@ class BaseScreen(tk.Frame):
 
         self.table.tag_configure("oddrow", background="#f0f0f0")
         self.table.tag_configure("evenrow", background="#ffffff")
+        self.renderer = TableRenderer(self.table, len(self.columns))
 
         style = ttk.Style()
         style.theme_use("default")
@@ -213,26 +262,24 @@ class BaseScreen(tk.Frame):
             self.delete_button.grid_remove()
 
             item_id = self.table.item(selected_item, "values")[-1]
-            data = self.service.get_by_id(item_id)
-
-            if data:
-                self.hide_pagination_controls()  # إخفاء الترقيم
-                self.edit_screen = self.edit_screen_class(self, self.show_main_screen, self.service, data)
-                self.edit_screen.grid(row=1, column=0, sticky="nsew")
-                self.table.master.grid_remove()
-                self.hide_buttons_and_search()
-            else:
-                messagebox.showerror("خطأ", "لم يتم العثور على البيانات!")
-
-    def populate_table(self, data=None):
-        self.table.delete(*self.table.get_children())
-        data = data if data is not None else self.service.get_all_data()
-        for index, item in enumerate(data):
-            reversed_item = list(reversed(item))
-            if index % 2 == 0:
-                self.table.insert("", tk.END, values=reversed_item, tags=("evenrow",))
-            else:
-                self.table.insert("", tk.END, values=reversed_item, tags=("oddrow",))
+            self.open_edit_screen(item_id)
+
+    def open_edit_screen(self, item_id):
+        run_in_background(self, self.service.get_by_id, item_id, on_success=self.show_edit_screen, on_error=self.on_load_error, key="record")
+
+    def show_edit_screen(self, data):
+        if data:
+            self.hide_pagination_controls()  # إخفاء الترقيم
+            self.edit_screen = self.edit_screen_class(self, self.show_main_screen, self.service, data)
+            self.edit_screen.grid(row=1, column=0, sticky="nsew")
+            self.table.master.grid_remove()
+            self.hide_buttons_and_search()
+        else:
+            messagebox.showerror("خطأ", "لم يتم العثور على البيانات!")
+
+    def populate_table(self, data):
+        # العناصر الحالية يُعاد استخدامها، والتعبئة كلها في استدعاء Tcl واحد
+        self.renderer.render(data)
 
     def show_buttons(self, event=None):
         selected_item = self.table.selection()
@@ -263,16 +310,7 @@ class BaseScreen(tk.Frame):
         selected_item = self.table.selection()
         if selected_item:
             item_id = self.table.item(selected_item, "values")[-1]
-            data = self.service.get_by_id(item_id)
-
-            if data:
-                self.hide_pagination_controls()  # إخفاء الترقيم
-                self.edit_screen = self.edit_screen_class(self, self.show_main_screen, self.service, data)
-                self.edit_screen.grid(row=1, column=0, sticky="nsew")
-                self.table.master.grid_remove()
-                self.hide_buttons_and_search()
-            else:
-                messagebox.showerror("خطأ", "لم يتم العثور على البيانات!")
+            self.open_edit_screen(item_id)
 
     def delete_row(self):
         selected_item = self.table.selection()
@@ -293,10 +331,14 @@ class BaseScreen(tk.Frame):
     def on_search(self, event=None):
         search_term = self.search_entry.get().strip()
         if search_term:
-            results = self.service.search_data(search_term)
+            rows = self.search_session.refine(search_term)
+            if rows is not None:
+                cancel_background(self, "table")
+                self.populate_table(rows)
+                return
+            run_in_background(self, self.search_session.search, search_term, on_success=self.populate_table, on_error=self.on_load_error, key="table")
         else:
-            results = self.service.get_all_data()
-        self.populate_table(results)
+            self.refresh_table()
 
     def show_add_screen(self):
         self.hide_pagination_controls()  # إخفاء الترقيم
@@ -312,7 +354,6 @@ class BaseScreen(tk.Frame):
             self.edit_screen.grid_remove()
         self.table.master.grid()
         self.show_buttons_and_search()
-        self.populate_table()
 
     def hide_buttons_and_search(self):
         self.export_excel_button.grid_remove()
@@ -2,7 +2,21 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 from services.debt_service import DebtService
 from ui.shows.show_debt import ShowDebt
+from ui.shows.ExchangeRatesDialog import ExchangeRatesDialog
+from ui.shows.aging_report import AgingReportScreen
+from services.exchange_service import ExchangeRateService
+from database.currency import currency_label
+from database.money import format_minor
 import math
+from ui.background import run_in_background, cancel_background
+from ui.events import listen
+from database.events import UPDATE
+from database.search_session import SearchSession
+from database.SearchManager import DEBT_SEARCH_TABLES, SEARCH_LIMIT
+from ui.table_renderer import TableRenderer
+
+# الجداول التي تتكون منها قائمة الديون
+DEBT_TABLES = ("Passports", "Umrah", "Trips")
 
 
 class DebtScreen(tk.Frame):
@@ -14,6 +28,7 @@ class DebtScreen(tk.Frame):
         
         self.current_page = 1
         self.rows_per_page = 10
+        self.total_rows = 0
         self.buttons_visible = False
         self.previous_selected_item = None
 
@@ -21,6 +36,18 @@ class DebtScreen(tk.Frame):
         self.create_top_section()
         self.create_table_section()
         self.create_pagination_controls()
+
+        # نتائج البحث مرتبة بالصلة ثم الأحدث (نفس ترتيب search_debts) ومحدودة بعدد النتائج
+        search_columns = list(dict.fromkeys(
+            column for _, _, columns in DEBT_SEARCH_TABLES.values() for column in columns
+        ))
+        self.search_session = SearchSession(
+            self.service.search_with_keys, self.service.search_manager, search_columns, DEBT_TABLES,
+            limit=SEARCH_LIMIT, order=lambda debt, score: (score, debt["date"], debt["id"])
+        )
+
+        # الدفعات تصل كتحديث لجدول الدين نفسه، وأسعار الصرف تغير الإجمالي فقط
+        listen(self, DEBT_TABLES + ("ExchangeRates",), self.on_data_changed)
         
     def configure_grid(self):
         self.grid_rowconfigure(1, weight=1)
@@ -70,6 +97,30 @@ class DebtScreen(tk.Frame):
         )
         self.export_button.grid(row=0, column=3, padx=(10, 20), sticky="e")
 
+        # Exchange Rates Button
+        self.rates_button = tk.Button(
+            self.top_frame,
+            text="أسعار الصرف",
+            bg="#295686",
+            fg="white",
+            font=("Arial", 12),
+            width=15,
+            command=self.show_exchange_rates
+        )
+        self.rates_button.grid(row=0, column=4, padx=(0, 20), sticky="e")
+
+        # Aging Report Button
+        self.aging_button = tk.Button(
+            self.top_frame,
+            text="أعمار الديون",
+            bg="#295686",
+            fg="white",
+            font=("Arial", 12),
+            width=15,
+            command=self.show_aging_report
+        )
+        self.aging_button.grid(row=0, column=5, padx=(0, 20), sticky="e")
+
     def create_table_section(self):
         table_frame = tk.Frame(self, bg="white")
         table_frame.grid(row=1, column=0, sticky="nsew")
@@ -111,6 +162,8 @@ class DebtScreen(tk.Frame):
         self.style.map("Custom.Treeview.Heading", 
                 background=[("active", "#295686")])
 
+        self.renderer = TableRenderer(self.table, len(self.columns), stripes=())
+
         self.table.pack(fill=tk.BOTH, expand=True)
         self.table.bind("<ButtonRelease-1>", self.show_buttons)
         self.table.bind("<Double-Button-1>", self.on_double_click)
@@ -150,30 +203,108 @@ class DebtScreen(tk.Frame):
         )
         self.next_button.grid(row=0, column=2, padx=10, sticky="w")
 
+        # إجمالي الديون بالعملة الأساسية
+        self.totals_label = tk.Label(
+            self.bottom_frame,
+            text="",
+            font=("Arial", 12, "bold"),
+            bg="white"
+        )
+        self.totals_label.grid(row=0, column=3, padx=20)
+
         self.update_pagination_controls()
 
     def refresh_table(self, data=None):
-        # حذف البيانات القديمة من الجدول
-        self.table.delete(*self.table.get_children())
-        all_data = data if data else self.service.get_all_data()
-
-        # تعبئة الجدول بالبيانات الأساسية
-        for debt in all_data:
-            row_data = [
-                debt.get("id", ""),
-                debt.get("name", ""),
-                debt.get("type", ""),
-                debt.get("date", ""),
-                debt.get("ym_paid", 0),
-                debt.get("sm_paid", 0),
-                debt.get("remaining", 0),
-            ]
-            
-            self.table.insert("", tk.END, values=list(reversed(row_data)))
+        if data is None:
+            # الصفحة الحالية فقط، والعدد الكلي من الذاكرة المؤقتة حتى تتغير الديون أو الدفعات
+            run_in_background(self, self.service.get_page, self.current_page, self.rows_per_page, on_success=self.on_page_loaded, on_error=self.on_load_error, key="table")
+            self.refresh_totals()
+            return
+        self.populate_table(data)
+
+    def refresh_totals(self):
+        run_in_background(self, self.service.get_consolidated_totals, on_success=self.show_totals, on_error=self.on_load_error, key="totals")
+
+    def show_totals(self, totals):
+        if not hasattr(self, "totals_label"):
+            return
+        text = f"إجمالي المتبقي: {format_minor(totals['remaining'])} {currency_label(totals['currency'])}"
+        if totals["missing_rates"]:
+            missing = "، ".join(currency_label(code) for code in totals["missing_rates"])
+            text += f" (بدون سعر صرف: {missing})"
+        self.totals_label.config(text=text)
+
+    def on_page_loaded(self, result):
+        debts, self.total_rows = result
+        if not debts and self.current_page > 1:
+            # الصفحة الحالية لم تعد موجودة بعد سداد ديون
+            self.current_page = max(math.ceil(self.total_rows / self.rows_per_page), 1)
+            self.refresh_table()
+            return
+        self.populate_table(debts)
+        if hasattr(self, "page_label"):
+            self.update_pagination_controls()
+
+    def on_load_error(self, error):
+        messagebox.showerror("خطأ", f"تعذر تحميل البيانات: {error}")
+
+    def on_data_changed(self, event):
+        """تحديث الصفوف المعدلة والإجمالي فقط بدلًا من إعادة تحميل جميع الديون."""
+        self.refresh_totals()
+        if event.table == "ExchangeRates":
+            return
+        if event.operation == UPDATE and event.ids is not None:
+            run_in_background(
+                self, self.service.get_debts_by_ids, event.table, event.ids,
+                on_success=lambda debts: self.update_debt_rows(event, debts),
+                on_error=self.on_load_error
+            )
+            return
+        self.on_search()
+
+    def visible_debts(self, table):
+        """عناصر الجدول المعروضة لنوع دين معين حسب المعرف."""
+        return {
+            int(debt_id): item
+            for item, (debt_id, debt_type) in self.renderer.item_values(0, 2)
+            if str(debt_type) == table
+        }
+
+    def update_debt_rows(self, event, debts):
+        items = self.visible_debts(event.table)
+        found = {debt["id"]: debt for debt in debts}
+        for debt_id in event.ids:
+            item = items.get(debt_id)
+            if debt_id in found and item is None:
+                # دين جديد أو عاد غير مسدد: موضعه في الترتيب غير معروف
+                self.on_search()
+                return
+            if item is None:
+                continue
+            if debt_id in found:
+                self.renderer.update_row(item, self.debt_values(found[debt_id]))
+            else:
+                # تم سداد الدين بالكامل: تُعاد الصفحة لتكتمل بالدين التالي
+                self.on_search()
+                return
+
+    def debt_values(self, debt):
+        return (
+            debt.get("id", ""),
+            debt.get("name", ""),
+            debt.get("type", ""),
+            debt.get("date", ""),
+            debt.get("ym_paid", 0),
+            debt.get("sm_paid", 0),
+            debt.get("remaining", 0),
+        )
+
+    def populate_table(self, all_data):
+        # العناصر الحالية يُعاد استخدامها، والتعبئة كلها في استدعاء Tcl واحد
+        self.renderer.render([self.debt_values(debt) for debt in all_data])
 
     def update_pagination_controls(self):
-        total_rows = len(self.service.get_all_data())
-        total_pages = math.ceil(total_rows / self.rows_per_page)
+        total_pages = math.ceil(self.total_rows / self.rows_per_page)
         
         self.previous_button.config(state=tk.NORMAL if self.current_page > 1 else tk.DISABLED)
         self.next_button.config(state=tk.NORMAL if self.current_page < total_pages else tk.DISABLED)
@@ -201,20 +332,24 @@ class DebtScreen(tk.Frame):
         if self.current_page > 1:
             self.current_page -= 1
             self.refresh_table()
-            self.update_pagination_controls()
 
     def go_to_next_page(self):
-        total_rows = len(self.service.get_all_data())
-        total_pages = math.ceil(total_rows / self.rows_per_page)
+        total_pages = math.ceil(self.total_rows / self.rows_per_page)
         if self.current_page < total_pages:
             self.current_page += 1
             self.refresh_table()
-            self.update_pagination_controls()
 
     def on_search(self, event=None):
         search_term = self.search_entry.get().strip()
-        results = self.service.search_data(search_term) if search_term else self.service.get_all_data()
-        self.refresh_table(results)
+        if search_term:
+            debts = self.search_session.refine(search_term)
+            if debts is not None:
+                cancel_background(self, "table")
+                self.populate_table(debts)
+                return
+            run_in_background(self, self.search_session.search, search_term, on_success=self.populate_table, on_error=self.on_load_error, key="table")
+        else:
+            self.refresh_table()
 
     def show_debt_details(self, debt_id=None, debt_type=None):
         if not debt_id or not debt_type:
@@ -239,16 +374,35 @@ class DebtScreen(tk.Frame):
         )
         self.show_debt_screen.pack(fill=tk.BOTH, expand=True)
 
+    def show_exchange_rates(self):
+        self.pack_forget()
+        self.exchange_rates_screen = ExchangeRatesDialog(
+            self.master,
+            ExchangeRateService(self.master),
+            self.return_to_main_screen
+        )
+
+    def show_aging_report(self):
+        self.pack_forget()
+        self.aging_report_screen = AgingReportScreen(
+            self.master,
+            self.service,
+            self.return_to_main_screen
+        )
+
     def return_to_main_screen(self):
         # إخفاء شاشة التفاصيل وإظهار الشاشة الرئيسية
         if hasattr(self, 'show_debt_screen'):
             self.show_debt_screen.destroy()
+        if hasattr(self, 'exchange_rates_screen') and self.exchange_rates_screen.winfo_exists():
+            self.exchange_rates_screen.destroy()
+        if hasattr(self, 'aging_report_screen') and self.aging_report_screen.winfo_exists():
+            self.aging_report_screen.destroy()
+        # الجدول محدث بالفعل عبر ناقل الأحداث
         self.pack(fill=tk.BOTH, expand=True)
-        self.refresh_table()
 
     def return_to_debt_screen(self):
         self.pack(fill=tk.BOTH, expand=True)  # إعادة عرض الشاشة الرئيسية
-        self.refresh_table()  # تحديث الجدول لعرض التغييرات
 
 
     
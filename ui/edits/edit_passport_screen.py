@@ -2,6 +2,7 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 from tkcalendar import DateEntry
 from services.passport_service import PassportService
+from database.currency import CURRENCY_LABELS, currency_code, currency_label
 
 class EditPassportScreen(tk.Frame):
     def __init__(self, master, return_callback, service, data):
@@ -68,7 +69,7 @@ class EditPassportScreen(tk.Frame):
 
         self.remaining_amount_label = self.create_field(outer_frame, "المبلغ المتبقي", row=5, column=0, label_var=self.remaining_amount)
 
-        self.currency_combobox = self.create_field(outer_frame, "العملة", row=5, column=2, combobox_values=["ر.ي", "ر.س", "دولار"])
+        self.currency_combobox = self.create_field(outer_frame, "العملة", row=5, column=2, combobox_values=list(CURRENCY_LABELS.values()))
 
         # حالة الجواز
         self.status_combobox = self.create_field(outer_frame, "حالة الجواز", row=6, column=0, combobox_values=["في الطابعة", "في المكتب", "تم الاستلام", "مرفوض"])
@@ -143,48 +144,46 @@ class EditPassportScreen(tk.Frame):
         """
         type_map_reverse = {"1": "عادي", "2": "مستعجل عدن", "3": "مستعجل بيومه", "4": "غير ذلك"}
         status_map_reverse = {"1": "في الطابعة", "2": "في المكتب", "3": "تم الاستلام", "4": "مرفوض"}
-        currency_map_reverse = {"1": "ر.ي", "2": "ر.س", "3": "دولار"}
 
         if self.data:
             self.name_entry.delete(0, tk.END)
-            self.name_entry.insert(0, self.data[1])  # الاسم
+            self.name_entry.insert(0, self.data.name)
             
-            self.booking_date_entry.set_date(self.data[2])  # تاريخ الحجز
-            self.receipt_date_entry.set_date(self.data[10])  # تاريخ الاستلام
+            self.booking_date_entry.set_date(self.data.booking_date)
+            self.receipt_date_entry.set_date(self.data.receipt_date)
             
             # تحويل نوع الجواز من رقم إلى نص
-            passport_type = str(self.data[3])
+            passport_type = str(self.data.type)
             self.type_combobox.set(type_map_reverse.get(passport_type, "عادي"))
             
-            self.booking_price.set(str(self.data[4]))  # سعر الحجز
-            self.purchase_price.set(str(self.data[5]))  # سعر الشراء
-            self.paid_amount.set(str(self.data[7]))  # المبلغ المدفوع
+            self.booking_price.set(str(self.data.booking_price))
+            self.purchase_price.set(str(self.data.purchase_price))
+            self.paid_amount.set(str(self.data.paid_amount))
             
             # تحويل العملة من رقم إلى نص
-            currency = str(self.data[12])
-            self.currency_combobox.set(currency_map_reverse.get(currency, "ر.ي"))
+            currency = str(self.data.currency)
+            self.currency_combobox.set(currency_label(currency))
             
             # تحويل حالة الجواز من رقم إلى نص
-            status = str(self.data[9])
+            status = str(self.data.status)
             self.status_combobox.set(status_map_reverse.get(status, "في الطابعة"))
             
             self.receiver_name_entry.delete(0, tk.END)
-            self.receiver_name_entry.insert(0, self.data[11])  # اسم المستلم
+            self.receiver_name_entry.insert(0, self.data.receiver_name)
             
             # حساب القيم تلقائيًا بعد التحميل
             self.calculate_amounts()
 
     def save(self):
-        currency_map = {"ر.ي": "1", "ر.س": "2", "دولار": "3"}
         status_map = {"في الطابعة": "1", "في المكتب": "2", "تم الاستلام": "3", "مرفوض": "4"}
         type_map = {"عادي": "1", "مستعجل عدن": "2", "مستعجل بيومه": "3", "غير ذلك": "4"}
 
-        currency = currency_map.get(self.currency_combobox.get(), "1")
+        currency = currency_code(self.currency_combobox.get())
         status = status_map.get(self.status_combobox.get(), "1")
         type_ = type_map.get(self.type_combobox.get(), "1")
 
         data = (
-            self.data[0],  # ID من self.data
+            self.data.id,
             self.name_entry.get(),
             self.booking_date_entry.get_date().strftime("%Y-%m-%d"),
             type_,
@@ -1,7 +1,9 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 from tkcalendar import DateEntry
+from ui.autocomplete import make_entry
 from services.ticket_service import TicketService
+from database.currency import CURRENCY_LABELS, currency_code, currency_label
 
 class EditTicketScreen(tk.Frame):
     def __init__(self, master, return_callback, service, data):
@@ -49,19 +51,19 @@ class EditTicketScreen(tk.Frame):
         self.passport_number_entry = self.create_field(outer_frame, "رقم الجواز", row=1, column=2)
 
         # من مدينة
-        self.from_place_entry = self.create_field(outer_frame, "من مدينة", row=2, column=0)
+        self.from_place_entry = self.create_field(outer_frame, "من مدينة", row=2, column=0, suggest_column="from_place")
 
         # إلى مدينة
-        self.to_place_entry = self.create_field(outer_frame, "إلى مدينة", row=2, column=2)
+        self.to_place_entry = self.create_field(outer_frame, "إلى مدينة", row=2, column=2, suggest_column="to_place")
 
         # الشركة
-        self.company_entry = self.create_field(outer_frame, "الشركة", row=3, column=0)
+        self.company_entry = self.create_field(outer_frame, "الشركة", row=3, column=0, suggest_column="booking_company")
 
         # المبلغ
         self.amount_entry = self.create_field(outer_frame, "المبلغ", row=3, column=2)
 
         # العملة
-        self.currency_combobox = self.create_field(outer_frame, "العملة", row=4, column=0, combobox_values=["ر.ي", "ر.س", "دولار"])
+        self.currency_combobox = self.create_field(outer_frame, "العملة", row=4, column=0, combobox_values=list(CURRENCY_LABELS.values()))
 
         # للوكيل
         self.agent_entry = self.create_field(outer_frame, "للوكيل", row=4, column=2)
@@ -74,7 +76,7 @@ class EditTicketScreen(tk.Frame):
         self.trip_date_entry = self.create_date_field(outer_frame, "تاريخ الرحلة", row=5, column=2)
 
         # المكتب
-        self.office_combobox = self.create_field(outer_frame, "المكتب", row=6, column=0, combobox_values=["مكتبنا", "الوادي", "طايف"])
+        self.office_combobox = self.create_field(outer_frame, "المكتب", row=6, column=0, combobox_values=["مكتبنا", "الوادي", "طايف"], suggest_column="office_name")
 
         # الحقول الجديدة
         self.paid_entry = self.create_field(outer_frame, "المدفوع", row=6, column=2, entry_var=self.paid_amount)
@@ -88,8 +90,11 @@ class EditTicketScreen(tk.Frame):
         for i in range(4):
             outer_frame.grid_columnconfigure(i, weight=1, uniform="col")
 
-    def create_field(self, parent, label_text, row, column, entry_var=None, label_var=None, combobox_values=None):
-        if combobox_values is None:
+    def create_field(self, parent, label_text, row, column, entry_var=None, label_var=None, combobox_values=None, suggest_column=None):
+        if suggest_column is not None:
+            widget = make_entry(parent, self.service, suggest_column, defaults=combobox_values)
+            widget.grid(row=row, column=column, padx=(5, 5), pady=10, sticky="ew")
+        elif combobox_values is None:
             if label_var is not None:
                 widget = ttk.Label(parent, textvariable=label_var, style="Bold.TLabel", justify="center")
                 widget.grid(row=row, column=column, padx=(5, 5), pady=10, sticky="ew")
@@ -142,35 +147,34 @@ class EditTicketScreen(tk.Frame):
 
     def populate_fields(self):
         if self.data:
-            self.name_entry.insert(0, self.data[1])
-            self.passport_number_entry.insert(0, self.data[2])
-            self.from_place_entry.insert(0, self.data[3])
-            self.to_place_entry.insert(0, self.data[4])
-            self.company_entry.insert(0, self.data[5])
-            self.amount_entry.insert(0, self.data[6])
-            self.currency_combobox.set(self.data[7])
-            self.agent_entry.insert(0, self.data[8])
-            self.net_amount.set(self.data[9])
-            self.trip_date_entry.set_date(self.data[10])
-            self.office_combobox.set(self.data[11])
-            self.paid_amount.set(self.data[12])
-            self.remaining_amount.set(self.data[13])
+            self.name_entry.insert(0, self.data.name)
+            self.passport_number_entry.insert(0, self.data.passport_number)
+            self.from_place_entry.insert(0, self.data.from_place)
+            self.to_place_entry.insert(0, self.data.to_place)
+            self.company_entry.insert(0, self.data.booking_company)
+            self.amount_entry.insert(0, self.data.amount)
+            self.currency_combobox.set(currency_label(self.data.currency))
+            self.agent_entry.insert(0, self.data.agent)
+            self.net_amount.set(self.data.net_amount)
+            self.trip_date_entry.set_date(self.data.trip_date)
+            self.office_combobox.set(self.data.office_name)
+            self.paid_amount.set(self.data.paid)
+            self.remaining_amount.set(self.data.remaining_amount)
 
     def save(self):
         if not self.validate_fields():
             return
 
         try:
-            currency_map = {"ر.ي": "1", "ر.س": "2", "دولار": "3"}
             data = (
-                self.data[0],  # ID
+                self.data.id,
                 self.name_entry.get(),
                 self.passport_number_entry.get(),
                 self.from_place_entry.get(),
                 self.to_place_entry.get(),
                 self.company_entry.get(),
                 float(self.amount_entry.get()),
-                currency_map.get(self.currency_combobox.get(), "1"),
+                currency_code(self.currency_combobox.get()),
                 float(self.agent_entry.get()),
                 float(self.net_amount.get()),
                 self.trip_date_entry.get_date().strftime("%Y-%m-%d"),
@@ -1,7 +1,9 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 from tkcalendar import DateEntry
+from ui.autocomplete import make_entry
 from services.umrah_service import UmrahService
+from database.currency import CURRENCY_LABELS, currency_code, currency_label
 
 class EditUmrahScreen(tk.Frame):
     def __init__(self, master, return_callback, service, data):
@@ -50,7 +52,7 @@ class EditUmrahScreen(tk.Frame):
 
         # Row 2
         self.phone_number_entry = self.create_field(outer_frame, "رقم الهاتف", row=2, column=0)
-        self.sponsor_name_entry = self.create_field(outer_frame, "اسم الضمين", row=2, column=2)
+        self.sponsor_name_entry = self.create_field(outer_frame, "اسم الضمين", row=2, column=2, suggest_column="sponsor_name")
 
         # Row 3
         self.sponsor_number_entry = self.create_field(outer_frame, "رقم الضمين", row=3, column=0)
@@ -70,7 +72,7 @@ class EditUmrahScreen(tk.Frame):
         self.status_combobox = self.create_field(outer_frame, "الحالة", row=6, column=0, combobox_values=["مهم", "غير مهم"])
 
         # Row 7: Combobox لاختيار العملة
-        self.currency_combobox = self.create_field(outer_frame, "العملة", row=6, column=2, combobox_values=["ر.ي", "ر.س", "دولار"])
+        self.currency_combobox = self.create_field(outer_frame, "العملة", row=6, column=2, combobox_values=list(CURRENCY_LABELS.values()))
 
         # Save Button
         save_button = ttk.Button(outer_frame, text="حفظ التعديلات", style="Blue.TButton", width=50, command=self.save)
@@ -80,9 +82,12 @@ class EditUmrahScreen(tk.Frame):
         for i in range(4):  # 4 columns
             outer_frame.grid_columnconfigure(i, weight=1, uniform="col")
 
-    def create_field(self, parent, label_text, row, column, entry_var=None, label_var=None, combobox_values=None):
+    def create_field(self, parent, label_text, row, column, entry_var=None, label_var=None, combobox_values=None, suggest_column=None):
         """Helper function to create a label and its corresponding widget."""
-        if combobox_values is None:
+        if suggest_column is not None:
+            widget = make_entry(parent, self.service, suggest_column, defaults=combobox_values)
+            widget.grid(row=row, column=column, padx=(5, 5), pady=10, sticky="ew")
+        elif combobox_values is None:
             if label_var is not None:
                 widget = ttk.Label(parent, textvariable=label_var, style="Bold.TLabel", justify="center")
                 widget.grid(row=row, column=column, padx=(5, 5), pady=10, sticky="ew")
@@ -132,28 +137,25 @@ class EditUmrahScreen(tk.Frame):
 
     def populate_fields(self):
         """تعبئة الحقول بالبيانات المستردة من قاعدة البيانات."""
-        currency_map_reverse = {"1": "ر.ي", "2": "ر.س", "3": "دولار"}
-
         if self.data:
-            self.name_entry.insert(0, self.data[1])  # الاسم
-            self.passport_number_entry.insert(0, self.data[2])  # رقم الجواز
-            self.phone_number_entry.insert(0, self.data[3])  # رقم الهاتف
-            self.sponsor_name_entry.insert(0, self.data[4])  # اسم الضمين
-            self.sponsor_number_entry.insert(0, self.data[5])  # رقم الضمين
-            self.cost_entry.insert(0, self.data[6])  # التكلفة
-            self.paid_entry.insert(0, self.data[7])  # الواصل
-            self.remaining_amount.set(self.data[8])  # الباقي
-            self.entry_date_entry.set_date(self.data[9])  # تاريخ الدخول
-            self.exit_date_entry.set_date(self.data[10])  # تاريخ الخروج
-            self.status_combobox.set(self.data[11])  # الحالة
-            currency = str(self.data[12])
-            self.currency_combobox.set(currency_map_reverse.get(currency, "ر.ي"))
+            self.name_entry.insert(0, self.data.name)
+            self.passport_number_entry.insert(0, self.data.passport_number)
+            self.phone_number_entry.insert(0, self.data.phone_number)
+            self.sponsor_name_entry.insert(0, self.data.sponsor_name)
+            self.sponsor_number_entry.insert(0, self.data.sponsor_number)
+            self.cost_entry.insert(0, self.data.cost)
+            self.paid_entry.insert(0, self.data.paid)
+            self.remaining_amount.set(self.data.remaining_amount)
+            self.entry_date_entry.set_date(self.data.entry_date)
+            self.exit_date_entry.set_date(self.data.exit_date)
+            self.status_combobox.set(self.data.status)
+            currency = str(self.data.currency)
+            self.currency_combobox.set(currency_label(currency))
         
 
     def save(self):
         """Handle saving the updated umrah data."""
-        currency_map = {"ر.ي": "1", "ر.س": "2", "دولار": "3"}
-        currency = currency_map.get(self.currency_combobox.get(), "1")  # افتراضيًا "ر.ي"
+        currency = currency_code(self.currency_combobox.get())  # افتراضيًا "ر.ي"
 
         # التحقق من أن القيم المدخلة ليست فارغة أو غير صالحة
         try:
@@ -166,7 +168,7 @@ class EditUmrahScreen(tk.Frame):
 
         # Collect data from the form
         data = (
-            self.data[0],  # ID من self.data
+            self.data.id,
             self.name_entry.get(),  # الاسم
             self.passport_number_entry.get(),  # رقم الجواز
             self.phone_number_entry.get(),  # رقم الهاتف
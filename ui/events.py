@@ -0,0 +1,54 @@
+import queue
+import logging
+from database.events import get_event_bus, merge_events
+
+POLL_INTERVAL_MS = 100
+
+logger = logging.getLogger(__name__)
+
+
+def listen(widget, tables, callback):
+    """
+    اشتراك شاشة Tk في أحداث التغيير.
+    الأحداث قد تُنشر من خيط قاعدة البيانات، لذلك تُوضع في طابور ويُستدعى callback
+    في خيط Tk عبر after() مع دمج الأحداث المتراكمة بين كل دورة وأخرى.
+    يُلغى الاشتراك تلقائيًا عند إغلاق العنصر.
+
+    :param widget: عنصر Tk المالك للاشتراك.
+    :param tables: أسماء الجداول المطلوبة.
+    :param callback: دالة تستقبل ChangeEvent.
+    :return: كائن الاشتراك.
+    """
+    events = queue.SimpleQueue()
+    bus = get_event_bus()
+    subscription = bus.subscribe(events.put, tables)
+
+    def on_destroy(event):
+        if event.widget is widget:
+            bus.unsubscribe(subscription)
+
+    def poll():
+        try:
+            if not widget.winfo_exists():
+                bus.unsubscribe(subscription)
+                return
+        except Exception:
+            bus.unsubscribe(subscription)
+            return
+
+        pending = []
+        while True:
+            try:
+                pending.append(events.get_nowait())
+            except queue.Empty:
+                break
+        for event in merge_events(pending):
+            try:
+                callback(event)
+            except Exception:
+                logger.exception("Event handler failed for %s", event.table)
+        widget.after(POLL_INTERVAL_MS, poll)
+
+    widget.bind("<Destroy>", on_destroy, add="+")
+    widget.after(POLL_INTERVAL_MS, poll)
+    return subscription
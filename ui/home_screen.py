@@ -1,11 +1,49 @@
 import tkinter as tk
+from services.debt_service import DebtService
+from database.currency import CURRENCY_LABELS, currency_label
+from database.money import format_minor
+from ui.background import run_in_background
+from ui.events import listen
 
 class HomeScreen(tk.Frame):
     def __init__(self, master):
         super().__init__(master, bg="white")
+        self.service = DebtService(master)
 
         label = tk.Label(self, text="Welcome to Taif Al-Salmi", font=("Arial", 16), bg="white")
         label.pack(pady=20)
 
         description = tk.Label(self, text="Select a service from the navigation bar.", bg="white")
         description.pack(pady=10)
+
+        # ملخص الديون غير المسددة لكل عملة وبالعملة الأساسية
+        self.summary_frame = tk.Frame(self, bg="white")
+        self.summary_frame.pack(pady=20)
+
+        tk.Label(self.summary_frame, text="الديون غير المسددة", font=("Arial", 14, "bold"), bg="white").pack(pady=5)
+        self.currency_labels = {}
+        for code in CURRENCY_LABELS:
+            self.currency_labels[code] = tk.Label(self.summary_frame, text="", font=("Arial", 12), bg="white")
+            self.currency_labels[code].pack()
+        self.consolidated_label = tk.Label(self.summary_frame, text="", font=("Arial", 12, "bold"), bg="white")
+        self.consolidated_label.pack(pady=5)
+
+        self.refresh_summary()
+        listen(self, ["Passports", "Umrah", "Trips", "ExchangeRates"], lambda event: self.refresh_summary())
+
+    def refresh_summary(self):
+        run_in_background(self, self.load_summary, on_success=self.show_summary, key="summary")
+
+    def load_summary(self):
+        return self.service.get_outstanding_totals(), self.service.get_consolidated_totals()
+
+    def show_summary(self, result):
+        outstanding, consolidated = result
+        remaining_by_currency = {str(currency): remaining for currency, _, _, remaining in outstanding}
+        for code, label in self.currency_labels.items():
+            label.config(text=f"{format_minor(remaining_by_currency.get(code, 0))} {currency_label(code)}")
+
+        text = f"الإجمالي: {format_minor(consolidated['remaining'])} {currency_label(consolidated['currency'])}"
+        if consolidated["missing_rates"]:
+            text += " (بعض العملات بدون سعر صرف)"
+        self.consolidated_label.config(text=text)
@@ -0,0 +1,110 @@
+import tkinter as tk
+from tkinter import ttk, messagebox
+from tkcalendar import DateEntry
+from database.currency import CURRENCY_LABELS, BASE_CURRENCY, currency_code, currency_label
+from ui.background import run_in_background
+
+
+class ExchangeRatesDialog(tk.Frame):
+    """شاشة تسجيل أسعار الصرف المؤرخة مقابل العملة الأساسية."""
+
+    def __init__(self, master, service, return_callback):
+        super().__init__(master, bg="#f0f4f7")
+        self.master = master
+        self.service = service
+        self.return_callback = return_callback
+
+        self.pack(fill=tk.BOTH, expand=True)
+        self.create_widgets()
+        self.load_rates()
+
+    def create_widgets(self):
+        # Header Section
+        header_frame = tk.Frame(self, bg="#2980b9", height=80)
+        header_frame.pack(fill=tk.X)
+
+        tk.Label(header_frame,
+                text=f"أسعار الصرف (بالـ {currency_label(BASE_CURRENCY)})",
+                font=("Arial", 20, "bold"),
+                bg="#2980b9",
+                fg="white").pack(pady=15)
+
+        # Back Button
+        self.back_btn = tk.Button(header_frame,
+                                text="← رجوع",
+                                bg="#e74c3c",
+                                fg="white",
+                                font=("Arial", 14),
+                                command=self.on_back_clicked)
+        self.back_btn.place(x=20, y=15)
+
+        # Form Section
+        form_frame = tk.Frame(self, bg="#f0f4f7")
+        form_frame.pack(pady=20, padx=50)
+
+        foreign_currencies = [label for code, label in CURRENCY_LABELS.items() if code != BASE_CURRENCY]
+
+        tk.Label(form_frame, text="العملة:", font=("Arial", 14), bg="#f0f4f7").grid(row=0, column=0, pady=10, sticky="e")
+        self.currency_combobox = ttk.Combobox(form_frame, values=foreign_currencies, font=("Arial", 14), width=23, state="readonly")
+        self.currency_combobox.current(0)
+        self.currency_combobox.grid(row=0, column=1, padx=20, pady=10)
+
+        tk.Label(form_frame, text="السعر:", font=("Arial", 14), bg="#f0f4f7").grid(row=1, column=0, pady=10, sticky="e")
+        self.rate_entry = tk.Entry(form_frame, font=("Arial", 14), width=25, bg="white", relief=tk.GROOVE)
+        self.rate_entry.grid(row=1, column=1, padx=20, pady=10)
+
+        tk.Label(form_frame, text="التاريخ:", font=("Arial", 14), bg="#f0f4f7").grid(row=2, column=0, pady=10, sticky="e")
+        self.date_entry = DateEntry(form_frame, font=("Arial", 14), width=25, bg="white", date_pattern='yyyy-mm-dd')
+        self.date_entry.grid(row=2, column=1, padx=20, pady=10)
+
+        save_btn = tk.Button(self,
+                           text="حفظ السعر",
+                           bg="#27ae60",
+                           fg="white",
+                           font=("Arial", 16, "bold"),
+                           command=self.save_rate)
+        save_btn.pack(pady=10)
+
+        # جدول الأسعار المسجلة
+        columns = ("التاريخ", "العملة", "السعر")
+        self.table = ttk.Treeview(self, columns=list(reversed(columns)), show="headings", height=10)
+        for col in columns:
+            self.table.heading(col, text=col)
+            self.table.column(col, anchor="center", width=150)
+        self.table.pack(fill=tk.BOTH, expand=True, padx=50, pady=10)
+
+    def load_rates(self):
+        run_in_background(self, self.service.get_rates, on_success=self.populate_table, on_error=self.on_load_error)
+
+    def populate_table(self, rates):
+        self.table.delete(*self.table.get_children())
+        for rate_id, currency, rate_date, rate in rates:
+            row_data = [rate_date, currency_label(currency), rate]
+            self.table.insert("", tk.END, iid=rate_id, values=list(reversed(row_data)))
+
+    def on_load_error(self, error):
+        messagebox.showerror("خطأ", f"تعذر تحميل أسعار الصرف: {error}")
+
+    def save_rate(self):
+        rate = self.rate_entry.get().strip()
+        if not rate:
+            messagebox.showwarning("خطأ", "يرجى إدخال سعر الصرف")
+            return
+
+        success, message = self.service.set_rate(
+            currency_code(self.currency_combobox.get()),
+            rate,
+            self.date_entry.get()
+        )
+        if not success:
+            messagebox.showerror("خطأ", message)
+            return
+
+        self.rate_entry.delete(0, tk.END)
+        self.load_rates()
+
+    def on_back_clicked(self):
+        """الدالة التي تُستدعى عند النقر على زر الرجوع"""
+        if self.winfo_exists():
+            self.destroy()
+        self.return_callback()
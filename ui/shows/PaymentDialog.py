@@ -116,13 +116,16 @@ class PaymentDialog(tk.Frame):
                 return
 
             # استدعاء خدمة الإضافة مع تمرير البارامترات بشكل صحيح
-            self.service.add_payment(
+            success, message = self.service.add_payment(
                 debt_type=self.debt_type,
                 debt_id=self.debt_id,
                 amount=amount,
                 payment_date=payment_date,
                 payment_method=payment_method
             )
+            if not success:
+                messagebox.showerror("خطأ", message)
+                return
             
             messagebox.showinfo("نجاح", "تمت إضافة العملية بنجاح")
             self.on_back_clicked()
@@ -0,0 +1,77 @@
+import tkinter as tk
+from tkinter import ttk, messagebox
+from database.currency import currency_label
+from database.money import format_minor
+from services.columns import DEBT_TYPE_LABELS
+from ui.background import run_in_background
+
+class AgingReportScreen(tk.Frame):
+    """عرض أعمار الديون غير المسددة لكل خدمة وعملة."""
+
+    def __init__(self, master, service, return_callback):
+        super().__init__(master, bg="#f0f4f7")
+        self.master = master
+        self.service = service
+        self.return_callback = return_callback
+        self.buckets = [label for label, _ in service.AGING_BUCKETS]
+
+        self.pack(fill=tk.BOTH, expand=True)
+        self.create_widgets()
+        self.load_data()
+
+    def create_widgets(self):
+        # Header Section
+        header_frame = tk.Frame(self, bg="#295686", height=80)
+        header_frame.pack(fill=tk.X, padx=10, pady=5)
+
+        self.back_btn = tk.Button(header_frame,
+                                text="← رجوع للقائمة",
+                                bg="#e74c3c",
+                                fg="white",
+                                font=("Arial", 14),
+                                width=12,
+                                command=self.return_callback)
+        self.back_btn.pack(side=tk.LEFT, padx=10, anchor="w")
+
+        title_lbl = tk.Label(header_frame,
+                            text="أعمار الديون",
+                            font=("Arial", 20, "bold"),
+                            bg="#295686",
+                            fg="white")
+        title_lbl.pack(side=tk.LEFT, expand=True, padx=10, anchor="center")
+
+        self.export_btn = tk.Button(header_frame,
+                                    text="تصدير إلى Excel",
+                                    bg="#4CAF50",
+                                    fg="white",
+                                    font=("Arial", 14),
+                                    width=15,
+                                    command=self.service.export_aging_report)
+        self.export_btn.pack(side=tk.RIGHT, padx=10, anchor="e")
+
+        # Report Table
+        self.columns = ["نوع الخدمة", "العملة", "عدد الديون"] + [f"{label} يوم" for label in self.buckets] + ["الإجمالي"]
+        reversed_columns = list(reversed(self.columns))
+        self.table = ttk.Treeview(self, columns=reversed_columns, show="headings", style="Custom.Treeview")
+        for col in reversed_columns:
+            self.table.heading(col, text=col)
+            self.table.column(col, anchor="center", width=120)
+        self.table.pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
+
+    def load_data(self):
+        run_in_background(self, self.service.get_aging_report, on_success=self.populate_table, on_error=self.on_load_error)
+
+    def on_load_error(self, error):
+        messagebox.showerror("خطأ", f"تعذر تحميل التقرير: {error}")
+
+    def populate_table(self, report):
+        self.table.delete(*self.table.get_children())
+        for row in report:
+            row_data = [
+                DEBT_TYPE_LABELS.get(row["type"], row["type"]),
+                currency_label(row["currency"]),
+                row["count"],
+            ]
+            row_data += [format_minor(row[label]) for label in self.buckets]
+            row_data.append(format_minor(row["total"]))
+            self.table.insert("", tk.END, values=list(reversed(row_data)))
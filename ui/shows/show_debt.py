@@ -1,6 +1,8 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 from ui.shows.PaymentDialog import PaymentDialog
+from ui.background import run_in_background, cancel_background
+from ui.events import listen
 
 class ShowDebt(tk.Frame):
     def __init__(self, master, debt_id, debt_type, service, return_callback):
@@ -12,10 +14,18 @@ class ShowDebt(tk.Frame):
         self.return_callback = return_callback
         self.additional_labels = {}  # لتخزين الحقول الإضافية
 
+        # سجل المدفوعات يُحمّل صفحة بعد صفحة
+        self.payment_count = 0
+        self.loaded_payments = 0
+        self.last_payment_key = None
+
         self.pack(fill=tk.BOTH, expand=True)
         self.create_widgets()
         self.load_data()
 
+        # الدفعات الجديدة تُنشر كتحديث لسجل الدين نفسه
+        listen(self, [self.debt_type], self.on_debt_changed)
+
         if hasattr(master, 'register_child_frame'):
             master.register_child_frame(self)
 
@@ -67,7 +77,10 @@ class ShowDebt(tk.Frame):
             ("الاسم:", "name"),
             ("النوع:", "type"),
             ("التاريخ:", "date"),
-            ("المتبقي:", "remaining")
+            ("المتبقي:", "remaining"),
+            ("عدد الدفعات:", "payment_count"),
+            ("مجموع الدفعات:", "payments_total"),
+            ("آخر دفعة:", "last_payment")
         ]
         
         # الحقول الإضافية
@@ -129,6 +142,19 @@ class ShowDebt(tk.Frame):
                             command=self.tree.yview)
         self.tree.configure(yscrollcommand=scroll.set)
         
+        # الصفحات التالية من سجل المدفوعات عند الطلب فقط
+        more_frame = tk.Frame(payments_frame, bg="white")
+        more_frame.pack(side=tk.BOTTOM, fill=tk.X)
+        self.payments_label = tk.Label(more_frame, font=("Arial", 11), bg="white")
+        self.payments_label.pack(side=tk.RIGHT, padx=10)
+        self.more_btn = tk.Button(more_frame,
+                                text="عرض المزيد",
+                                bg="#568CC6",
+                                fg="white",
+                                font=("Arial", 12),
+                                command=self.load_more_payments)
+        self.more_btn.pack(side=tk.LEFT, padx=10, pady=5)
+
         # Layout
         self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scroll.pack(side=tk.RIGHT, fill=tk.Y)
@@ -146,7 +172,10 @@ class ShowDebt(tk.Frame):
 
     def return_to_show_debt(self):
         self.pack(fill=tk.BOTH, expand=True)
-        self.load_data()
+
+    def on_debt_changed(self, event):
+        if event.ids is None or int(self.debt_id) in event.ids:
+            self.load_data()
 
     def on_payment_dialog_closed(self):
         """الدالة التي تُستدعى عند الرجوع من PaymentDialog"""
@@ -154,68 +183,70 @@ class ShowDebt(tk.Frame):
         self.return_callback()
     
     def load_data(self):
-        # جلب البيانات الخام
-        raw_data = self.service.get_by_id(self.debt_id, self.debt_type)
-        if raw_data and len(raw_data) > 0:
-            record = raw_data[0]
-            
-            # تعبئة الحقول الأساسية
-            self.details_labels["id"].config(text=record[0])
-            self.details_labels["name"].config(text=record[1])
+        """جلب بيانات الدين والصفحة الأولى من المدفوعات في الخلفية ثم عرضها."""
+        cancel_background(self, "payments")  # صفحة قديمة لم تصل بعد
+        run_in_background(self, self.fetch_data, on_success=self.render_data, on_error=self.on_load_error, key="details")
+
+    def fetch_data(self):
+        """تُنفذ في خيط قاعدة البيانات."""
+        summary = self.service.get_debt_summary(self.debt_id, self.debt_type)
+        payments = self.service.get_payments_page(self.debt_type, self.debt_id)
+        return summary, payments
+
+    def load_more_payments(self):
+        self.more_btn.config(state=tk.DISABLED)
+        run_in_background(
+            self, self.service.get_payments_page, self.debt_type, self.debt_id, self.last_payment_key,
+            on_success=self.append_payments, on_error=self.on_load_error, key="payments"
+        )
+
+    def on_load_error(self, error):
+        messagebox.showerror("خطأ", f"تعذر تحميل بيانات الدين: {error}")
+
+    def render_data(self, result):
+        summary, payments = result
+        if summary:
+            record, self.payment_count, payments_total, last_payment = summary
+
+            # تعبئة الحقول الأساسية بأسماء موحدة لجميع الجداول (database/records.py)
+            self.details_labels["id"].config(text=record.id)
+            self.details_labels["name"].config(text=record.name)
             self.details_labels["type"].config(text=self.debt_type)
-            
-            # تحديد الفهرس الصحيح لكل جدول
-            date_index = {
-                "Passports": 2,  # booking_date
-                "Umrah": 9,      # entry_date
-                "Trips": 10      # trip_date
-            }
-            
-            remaining_index = {
-                "Passports": 8,  # remaining_amount
-                "Umrah": 8,      # remaining_amount
-                "Trips": 13      # remaining_amount
-            }
-            
-            # تعبئة التاريخ والمبلغ المتبقي
-            self.details_labels["date"].config(text=record[date_index[self.debt_type]])
-            self.details_labels["remaining"].config(text=record[remaining_index[self.debt_type]])
-            
-            # تعبئة الحقول الإضافية
-            additional_fields = self.get_additional_fields()
-            for _, key in additional_fields:
-                if self.debt_type == "Passports":
-                    field_index = {
-                        "total_amount": 4,  # booking_price
-                        "paid_amount": 7    # paid_amount
-                    }
-                    self.details_labels[key].config(text=record[field_index[key]])
-                
-                elif self.debt_type == "Umrah":
-                    field_index = {
-                        "total_amount": 6,  # cost
-                        "paid_amount": 7    # paid
-                    }
-                    self.details_labels[key].config(text=record[field_index[key]])
-                
-                elif self.debt_type == "Trips":
-                    field_index = {
-                        "amount": 6,         # paid
-                        "paid": 12  # remaining_amount
-                    }
-                    self.details_labels[key].config(text=record[field_index[key]])
-
-        # تحميل المدفوعات
+            self.details_labels["date"].config(text=record.debt_date)
+            self.details_labels["remaining"].config(text=record.remaining_amount)
+
+            # الحقول الإضافية: المبلغ الإجمالي والمدفوع
+            total_key, paid_key = (key for _, key in self.get_additional_fields())
+            self.details_labels[total_key].config(text=record.total_amount)
+            self.details_labels[paid_key].config(text=record.paid_total)
+
+            # إجماليات المدفوعات من نفس الاستعلام بدل جمع الدفعات المعروضة
+            self.details_labels["payment_count"].config(text=self.payment_count)
+            self.details_labels["payments_total"].config(text=payments_total)
+            self.details_labels["last_payment"].config(text=last_payment or "-")
+
+        # الصفحة الأولى من المدفوعات (الأحدث أولًا)
         self.tree.delete(*self.tree.get_children())
-        payments = self.service.get_payments(self.debt_type, self.debt_id)
+        self.loaded_payments = 0
+        self.last_payment_key = None
+        self.append_payments(payments)
+
+    def append_payments(self, payments):
         for payment in payments:
             self.tree.insert("", "end", values=(
-                payment["id"],
-                f"{payment['amount']} ريال",
-                payment["payment_date"],
-                payment["payment_method"] or "غير محدد"
+                payment.id,
+                f"{payment.amount} ريال",
+                payment.payment_date,
+                payment.payment_method or "غير محدد"
             ))
-        
+        if payments:
+            self.loaded_payments += len(payments)
+            self.last_payment_key = (payments[-1].payment_date, payments[-1].id)
+
+        has_more = len(payments) == self.service.PAYMENTS_PAGE_SIZE and self.loaded_payments < self.payment_count
+        self.more_btn.config(state=tk.NORMAL if has_more else tk.DISABLED)
+        self.payments_label.config(text=f"عرض {self.loaded_payments} من {self.payment_count} دفعة")
+
 
     def get_additional_fields(self):
         """إرجاع الحقول الإضافية حسب نوع الدين"""
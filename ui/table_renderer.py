@@ -0,0 +1,87 @@
+import operator
+
+# تعبئة الجدول كاملة في استدعاء Tcl واحد بدلًا من استدعاء لكل صف:
+# العناصر الموجودة يُعاد استخدامها بتغيير قيمها، والناقصة تُضاف والزائدة تُحذف مرة واحدة.
+# لون التخطيط يتبع موضع الصف، ويُعاد ضبطه مع القيم فيبقى صحيحًا بعد حذف صف من المنتصف.
+RENDER_SCRIPT = """
+namespace eval ::taif {}
+
+proc ::taif::render {tree rows tags} {
+    set items [$tree children {}]
+    set existing [llength $items]
+    set tag_count [llength $tags]
+    $tree selection remove [$tree selection]
+    set index 0
+    foreach row $rows {
+        set options [list -values $row]
+        if {$tag_count} {
+            lappend options -tags [list [lindex $tags [expr {$index % $tag_count}]]]
+        }
+        if {$index < $existing} {
+            $tree item [lindex $items $index] {*}$options
+        } else {
+            $tree insert {} end {*}$options
+        }
+        incr index
+    }
+    if {$index < $existing} {
+        $tree delete [lrange $items $index end]
+    }
+}
+
+proc ::taif::item_values {tree positions} {
+    set result {}
+    foreach item [$tree children {}] {
+        set values [$tree item $item -values]
+        set picked {}
+        foreach position $positions {
+            lappend picked [lindex $values $position]
+        }
+        lappend result $item $picked
+    }
+    return $result
+}
+"""
+
+STRIPE_TAGS = ("evenrow", "oddrow")
+
+
+class TableRenderer:
+    """
+    تعبئة Treeview بأعمدة معكوسة (من اليمين لليسار) بأقل عدد من استدعاءات Tcl.
+
+    الصفوف تُمرر بترتيب أعمدة الخدمة (المعرف أولًا) ويُعكس ترتيبها هنا مرة واحدة لكل صف
+    بدالة itemgetter محسوبة مسبقًا.
+    :param stripes: أسماء الوسوم التي تتناوب على الصفوف حسب موضعها (فارغة بدون تخطيط).
+    """
+
+    def __init__(self, table, column_count, stripes=STRIPE_TAGS):
+        self.table = table
+        self.tk = table.tk
+        self.column_count = column_count
+        self.stripes = tuple(stripes)
+        if column_count == 1:
+            # itemgetter بفهرس واحد يُرجع القيمة نفسها وليس صفًا
+            self.reverse = lambda row: (row[0],)
+        else:
+            self.reverse = operator.itemgetter(*range(column_count - 1, -1, -1))
+        if not self.tk.call("info", "commands", "::taif::render"):
+            self.tk.eval(RENDER_SCRIPT)
+
+    def render(self, rows):
+        """استبدال محتوى الجدول بالصفوف (استدعاء Tcl واحد مهما كان عددها)."""
+        reverse = self.reverse
+        self.tk.call("::taif::render", self.table, tuple(reverse(row) for row in rows), self.stripes)
+
+    def update_row(self, item, row):
+        """تحديث قيم عنصر موجود دون تغيير موضعه أو وسمه."""
+        self.table.item(item, values=self.reverse(row))
+
+    def item_values(self, *columns):
+        """
+        [(العنصر، (قيم الأعمدة المطلوبة))] لكل الصفوف المعروضة في استدعاء واحد.
+        columns أرقام الأعمدة بترتيب الخدمة، والقيم نصوص كما في الجدول.
+        """
+        positions = tuple(self.column_count - 1 - column for column in columns)
+        flat = self.tk.splitlist(self.tk.call("::taif::item_values", self.table, positions))
+        return [(flat[i], tuple(self.tk.splitlist(flat[i + 1]))) for i in range(0, len(flat), 2)]